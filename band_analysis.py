@@ -1,4 +1,11 @@
-import math, cmath, random
+import os, sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools'))
+import numpy as np
+
+from band_algebra import BandAlgebra
+from explicit_formula import ExplicitFormula, log_grid
+from null_model import cancellation
 
 ZEROS = [14.134725, 21.022039, 25.010857, 30.424876, 32.935061, 37.586178,
          40.918719, 43.327073, 48.005150, 49.773832, 52.970321, 56.446247,
@@ -18,25 +25,24 @@ ZEROS = [14.134725, 21.022039, 25.010857, 30.424876, 32.935061, 37.586178,
          220.71491, 221.43070, 224.00700, 224.98332, 227.42144, 229.33741,
          231.25018, 231.98723, 233.69340, 236.52422]
 
-def E(x, zeros):
-    s = math.sqrt(x); L = math.log(x); t = 0j
-    for g in zeros: t += s * cmath.exp(1j*g*L) / complex(0.5,g)
-    return -2*t.real
-
-def En(x, zeros, rp):
-    s = math.sqrt(x); L = math.log(x); t = 0j
-    for i,g in enumerate(zeros): t += s * cmath.exp(1j*(g*L+rp[i])) / complex(0.5,g)
-    return -2*t.real
+EF = ExplicitFormula(ZEROS)
+_algebras = {}
 
-def v(vals):
-    m = sum(vals)/len(vals); return sum((x-m)**2 for x in vals)/len(vals)
+def algebra(N, samples=200):
+    # Per-zero contribution vectors on the sample grid, built once per (N, samples)
+    if (N, samples) not in _algebras:
+        _algebras[N, samples] = BandAlgebra(ZEROS, log_grid(N, samples), per_point=True)
+    return _algebras[N, samples]
 
-def C(N, z, samples=200, trials=15):
+def C(N, z, samples=200, trials=15, exact=False):
+    # Sampled per-point phase null; exact=True uses the closed form (trials -> inf) from the algebra
     if not z: return float('nan'), 0, 0
-    xs = [10**(math.log10(2)+i*(math.log10(N)-math.log10(2))/(samples-1)) for i in range(samples)]
-    va = v([E(x,z) for x in xs])
-    vn = sum(v([En(x,z,[random.uniform(0,6.28) for _ in z]) for x in xs]) for _ in range(trials))/trials
-    return va/vn if vn>0 else 0, va, vn
+    if exact:
+        ba = algebra(N, samples)
+        sel = ba.mask(z)
+        return ba.C(sel), ba.var(sel), ba.null(sel)
+    r = cancellation(EF, log_grid(N, samples), trials, per_point=True, select=np.isin(EF.gammas, z))
+    return r['C'], r['var_actual'], r['var_null']
 
 b1=[g for g in ZEROS if g<50]
 b2=[g for g in ZEROS if 50<=g<100]
@@ -79,6 +85,13 @@ for name, zeros in [('B1+B3',b1+b3),('B1+B5',b1+b5),('B2+B4',b2+b4),('B3+B5',b3+
     c,_,_ = C(N, sorted(zeros))
     print(f'  {name}: C = {c:.4f}')
 
+print()
+print('All band unions (2^5 - 1, closed-form null), best and worst:')
+ba = algebra(N)
+subsets = sorted(ba.subsets([ba.mask(b) for b in (b1, b2, b3, b4, b5)]).items(), key=lambda kv: kv[1])
+for S, c in subsets[:3] + subsets[-3:]:
+    print(f"  {'+'.join(f'B{i+1}' for i in S):<16} C = {c:.4f}")
+
 print()
 print('='*60)
 print('INTERPRETATION')
@@ -7,6 +7,11 @@ Check if t=1/4 (primes) and t=1/3 (composites) are N-independent
 """
 
 import math
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools'))
+from peak_finder import cached_extremum, set_hash
 
 PHI = (1 + math.sqrt(5)) / 2
 GOLDEN_ANGLE = 2 * math.pi / (PHI * PHI)
@@ -36,18 +41,10 @@ def compute_spread(numbers, N, t, R=0.5):
     return variance
 
 def find_optimal_t(numbers, N, t_min=0.0, t_max=0.5, steps=100):
-    """Find t that minimizes spread"""
-    best_t = 0
-    best_spread = float('inf')
-    
-    for i in range(steps + 1):
-        t = t_min + (t_max - t_min) * i / steps
-        spread = compute_spread(numbers, N, t)
-        if spread < best_spread:
-            best_spread = spread
-            best_t = t
-    
-    return best_t, best_spread
+    """Find t that minimizes spread (coarse scan of <= 24 points + Brent refinement, cached)"""
+    return cached_extremum(('stability-spread', set_hash(numbers), N),
+                           lambda t: compute_spread(numbers, N, t), t_min, t_max,
+                           n_coarse=min(steps + 1, 24), sense='min')
 
 def main():
     print("=" * 60)
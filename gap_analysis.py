@@ -1,37 +1,31 @@
 #!/usr/bin/env python3
 """Compare prime gaps at prime indices vs composite indices."""
 
-def sieve(n):
-    """Sieve of Eratosthenes."""
-    is_prime = [True] * (n + 1)
-    is_prime[0] = is_prime[1] = False
-    for i in range(2, int(n**0.5) + 1):
-        if is_prime[i]:
-            for j in range(i*i, n + 1, i):
-                is_prime[j] = False
-    return is_prime
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools'))
+from prime_store import open_store
 
 def main():
     # Generate primes up to a limit that gives us 100k primes
     # p_100000 ≈ 1.3 million
     limit = 1500000
-    print(f"Sieving up to {limit}...")
-    is_prime = sieve(limit)
+    store = open_store(limit)       # shared memory-mapped table, sieved once
+    print(f"Opened prime store {store.path}")
 
-    primes = [i for i in range(2, limit + 1) if is_prime[i]]
+    primes = store.primes_in(2, limit + 1).tolist()
     print(f"Found {len(primes)} primes")
 
     # Compute gaps
     gaps = [primes[i+1] - primes[i] for i in range(len(primes) - 1)]
 
     # Separate by whether the INDEX is prime
-    prime_set = set(primes)
-
     prime_idx_gaps = []  # gaps where the index n is prime
     comp_idx_gaps = []   # gaps where the index n is composite
 
     for n in range(2, min(100001, len(gaps))):
-        if n in prime_set:
+        if store.is_prime(n):
             prime_idx_gaps.append(gaps[n-1])  # gap at position n (0-indexed: n-1)
         else:
             comp_idx_gaps.append(gaps[n-1])
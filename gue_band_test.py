@@ -4,9 +4,17 @@ Rigorous GUE vs Zeta Band-Covariance Test
 Tests whether the band structure (B1↔B3 negative, B1↔B2 positive)
 is a GUE property or zeta-specific.
 """
-import math
-import cmath
+import os
 import random
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools'))
+from band_algebra import BandAlgebra
+from explicit_formula import log_grid
+from null_model import cancellation
+from random_matrix import sequence
 
 # Zeta zeros (first 100 for clean comparison)
 ZETA = [
@@ -29,91 +37,15 @@ ZETA = [
     231.25018, 231.98723, 233.69340, 236.52422,
 ]
 
-def sample_gue_spacing():
-    """Sample from GUE spacing distribution using rejection sampling.
-    GUE: p(s) = (32/π²) s² exp(-4s²/π)
-    """
-    while True:
-        # Proposal: exponential with rate 0.8
-        s = random.expovariate(0.8)
-        # GUE density (unnormalized)
-        p_gue = s * s * math.exp(-4 * s * s / math.pi)
-        # Proposal density
-        p_prop = 0.8 * math.exp(-0.8 * s)
-        # Acceptance ratio (with safety factor)
-        if random.random() < p_gue / (2.5 * p_prop):
-            return s
-
 def generate_gue_eigenvalues(n, start=14.0, mean_spacing=2.2):
-    """Generate n eigenvalues with GUE spacing distribution."""
-    eigs = [start]
-    for _ in range(n - 1):
-        spacing = sample_gue_spacing() * mean_spacing
-        eigs.append(eigs[-1] + spacing)
-    return eigs
-
-def E_contribution(x, gamma):
-    """Single zero's contribution to E(x)."""
-    sqrt_x = math.sqrt(x)
-    log_x = math.log(x)
-    phase = cmath.exp(1j * gamma * log_x)
-    denom = complex(0.5, gamma)
-    return -2 * (sqrt_x * phase / denom).real
-
-def E_with_phase(x, gamma, extra_phase):
-    """Single zero's contribution with extra phase."""
-    sqrt_x = math.sqrt(x)
-    log_x = math.log(x)
-    phase = cmath.exp(1j * (gamma * log_x + extra_phase))
-    denom = complex(0.5, gamma)
-    return -2 * (sqrt_x * phase / denom).real
-
-def compute_covariance(zeros_i, zeros_j, N, samples=60):
-    """Compute covariance between contributions from two sets of zeros."""
-    xs = [10**(math.log10(2) + k * (math.log10(N) - math.log10(2)) / (samples-1))
-          for k in range(samples)]
-
-    # Contributions from each set
-    E_i = [sum(E_contribution(x, g) for g in zeros_i) for x in xs]
-    E_j = [sum(E_contribution(x, g) for g in zeros_j) for x in xs]
-
-    # Means
-    mean_i = sum(E_i) / len(E_i)
-    mean_j = sum(E_j) / len(E_j)
-
-    # Covariance
-    cov = sum((E_i[k] - mean_i) * (E_j[k] - mean_j) for k in range(len(xs))) / len(xs)
-
-    return cov
+    """Generate n eigenvalues with GUE statistics (bulk of a GUE matrix)."""
+    return list(start + sequence(n, 2, seed=random.randrange(2**32)) * mean_spacing)
 
 def compute_C(zeros, N, samples=80, trials=15):
     """Compute cancellation functional C(N)."""
-    xs = [10**(math.log10(2) + k * (math.log10(N) - math.log10(2)) / (samples-1))
-          for k in range(samples)]
-
-    def E_actual(x):
-        return sum(E_contribution(x, g) for g in zeros)
-
-    def E_null(x, phases):
-        return sum(E_with_phase(x, zeros[i], phases[i]) for i in range(len(zeros)))
-
-    def var(vals):
-        m = sum(vals) / len(vals)
-        return sum((v - m)**2 for v in vals) / len(vals)
-
-    # Actual variance
-    E_vals = [E_actual(x) for x in xs]
-    var_actual = var(E_vals)
-
-    # Null variance (average over trials)
-    null_vars = []
-    for _ in range(trials):
-        phases = [random.uniform(0, 2*math.pi) for _ in zeros]
-        E_null_vals = [E_null(x, phases) for x in xs]
-        null_vars.append(var(E_null_vals))
-    var_null = sum(null_vars) / len(null_vars)
-
-    return var_actual / var_null if var_null > 0 else 0
+    # Per-trial phase null, all trials drawn as one matrix (seeded from random)
+    rng = np.random.default_rng(random.randrange(2**32))
+    return cancellation(zeros, log_grid(N, samples), trials, rng=rng)['C']
 
 def analyze_band_structure(zeros, label, N=10000):
     """Analyze band structure for a set of zeros."""
@@ -151,16 +83,18 @@ def analyze_band_structure(zeros, label, N=10000):
     c_all = compute_C(zeros, N)
     print(f"  C(ALL) = {c_all:.4f}")
 
-    # Cross-band covariances
+    # Cross-band covariances (one set of per-zero contribution vectors)
     print(f"\nCross-band covariances:")
+    ba = BandAlgebra(zeros, log_grid(N, 60))
+    m1, m2, m3 = ba.bands([-np.inf, cut1, cut2, np.inf])
     if len(B1) > 1 and len(B2) > 1:
-        cov_12 = compute_covariance(B1, B2, N)
+        cov_12 = ba.cov(m1, m2)
         print(f"  Cov(B1,B2) = {cov_12:+.4f} {'[positive=bad]' if cov_12 > 0 else '[negative=good]'}")
     if len(B1) > 1 and len(B3) > 1:
-        cov_13 = compute_covariance(B1, B3, N)
+        cov_13 = ba.cov(m1, m3)
         print(f"  Cov(B1,B3) = {cov_13:+.4f} {'[positive=bad]' if cov_13 > 0 else '[negative=good]'}")
     if len(B2) > 1 and len(B3) > 1:
-        cov_23 = compute_covariance(B2, B3, N)
+        cov_23 = ba.cov(m2, m3)
         print(f"  Cov(B2,B3) = {cov_23:+.4f} {'[positive=bad]' if cov_23 > 0 else '[negative=good]'}")
 
     return {
@@ -3,31 +3,19 @@
 Q = F(gamma^a) / F(gamma^a +/- delta)
 Sweep alpha and beta, measure Q for gamma_1
 """
-import math
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools'))
+from dirichlet_poly import mangoldt_terms, power
 N=800
-def mg(n):
-    if n<2:return 0
-    t=n
-    for p in [2,3,5,7,11,13,17,19,23,29,31,37,41,43,47]:
-        if t==1:break
-        k=0
-        while t%p==0:t//=p;k+=1
-        if k>0 and t==1:return math.log(p)
-    if t>1:return math.log(n)
-    return 0
-L={};LN={}
-for n in range(2,N+1):
-    l=mg(n)
-    if l>0:L[n]=l;LN[n]=math.log(n)
+NS,W=mangoldt_terms(N)     # exact Λ(n)/√n
 
 g1=14.1347
 
 def F(t,beta):
-    ar=ai=0.0
-    for n,l in L.items():
-        pos=LN[n]**beta; w=l/math.sqrt(n)
-        ar+=w*math.cos(-t*pos); ai+=w*math.sin(-t*pos)
-    return ar*ar+ai*ai
+    """|Σ Λ(n)/√n exp(-i t log(n)^beta)|² for a scalar or array of t (and of beta)"""
+    return power(t,NS,W,beta)
 
 # For each (alpha, beta), compute the probe frequency
 # t_probe = gamma_1^alpha
@@ -38,18 +26,16 @@ print()
 print("%5s %5s %8s %8s %8s" % ("alpha","beta","F_peak","F_wing","Q"))
 print("-"*40)
 best_Q=0;ba=1;bb=1
+betas=[bi*0.1 for bi in range(3,16)]
 for ai in range(5,22):
     a=ai*0.1
-    for bi in range(3,16):
-        b=bi*0.1
-        t0=g1**a
-        fp=F(t0,b)
-        # Wings: +/- 10%
-        delta=t0*0.1
-        fw=0
-        for d in [-2*delta,-delta,delta,2*delta]:
-            fw+=F(t0+d,b)
-        fw/=4
+    t0=g1**a
+    # Wings: +/- 10%
+    delta=t0*0.1
+    Fs=F([t0]+[t0+d for d in [-2*delta,-delta,delta,2*delta]],betas)
+    for b,row in zip(betas,Fs):
+        fp=row[0]
+        fw=row[1:].sum()/4
         Q=fp/fw if fw>0.1 else 0
         if Q>best_Q: best_Q=Q;ba=a;bb=b
         if Q>2.0 or (abs(a-1)<0.05 and abs(b-1)<0.05):
@@ -1,42 +1,32 @@
 #!/usr/bin/env python3
 """Fine scan around alpha~1.9 beta~0.7 and convergence check"""
 import math
-def mg(n):
-    if n<2:return 0
-    t=n
-    for p in [2,3,5,7,11,13,17,19,23,29,31,37,41,43,47]:
-        if t==1:break
-        k=0
-        while t%p==0:t//=p;k+=1
-        if k>0 and t==1:return math.log(p)
-    if t>1:return math.log(n)
-    return 0
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools'))
+from dirichlet_poly import mangoldt_terms, power
+TERMS={}   # N -> exact Λ(n)/√n terms
 ZZ=[14.1347,21.022,25.0109,30.4249,32.9351]
 g1=ZZ[0]
 
 def get_Q(N, alpha, beta):
-    L={};LN={}
-    for n in range(2,N+1):
-        l=mg(n)
-        if l>0:L[n]=l;LN[n]=math.log(n)
-    def F(t):
-        ar=ai=0.0
-        for n,l in L.items():
-            pos=LN[n]**beta; w=l/math.sqrt(n)
-            ar+=w*math.cos(-t*pos); ai+=w*math.sin(-t*pos)
-        return ar*ar+ai*ai
-    t0=g1**alpha; fp=F(t0)
-    fw=sum(F(t0+d) for d in [-t0*0.15,-t0*0.08,t0*0.08,t0*0.15])/4
-    return fp/fw if fw>0.1 else 0, fp
+    """Q = F(gamma_1^alpha)/mean(F at 4 wings); beta may be an array (one Q per beta)"""
+    if N not in TERMS: TERMS[N]=mangoldt_terms(N)
+    t0=g1**alpha
+    Fs=power([t0]+[t0+d for d in [-t0*0.15,-t0*0.08,t0*0.08,t0*0.15]],*TERMS[N],beta)
+    fp=Fs[...,0]; fw=Fs[...,1:].sum(axis=-1)/4
+    return np.where(fw>0.1,fp/np.maximum(fw,0.1),0), fp
 
 # Fine scan around peak
 print("=== Fine scan: alpha 1.5-2.1, beta 0.4-1.0, N=800 ===")
 N=800; best_Q=0; ba=0;bb=0
 for ai in range(30,43):
     a=ai*0.05
-    for bi in range(8,21):
-        b=bi*0.05
-        Q,_=get_Q(N,a,b)
+    bs=[bi*0.05 for bi in range(8,21)]
+    for b,Q in zip(bs,get_Q(N,a,bs)[0]):
         if Q>best_Q: best_Q=Q;ba=a;bb=b
         if Q>5: print("  a=%.2f b=%.2f Q=%.1f" % (a,b,Q))
 print("BEST: a=%.2f b=%.2f Q=%.1f" % (ba,bb,best_Q))
@@ -52,9 +42,8 @@ for N in [300,500,800,1200]:
     bQ=0;ba2=1.9;bb2=0.7
     for ai in range(35,42):
         a=ai*0.05
-        for bi in range(10,18):
-            b=bi*0.05
-            Q,_=get_Q(N,a,b)
+        bs=[bi*0.05 for bi in range(10,18)]
+        for b,Q in zip(bs,get_Q(N,a,bs)[0]):
             if Q>bQ: bQ=Q;ba2=a;bb2=b
     print("%5d %6.2f %6.2f %6.2f       (%.2f,%.2f)" % (N,Q11,Q19,bQ,ba2,bb2))
 
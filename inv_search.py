@@ -6,39 +6,20 @@ Two knobs:
 Signal: F(alpha,beta) = sum_k |A(gamma_k^alpha, beta)|^2
 where A(t, beta) = sum Lambda(n)/sqrt(n) * exp(-i*t*log(n)^beta)
 """
-import math
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools'))
+from dirichlet_poly import mangoldt_terms, power
 N=1500
-def mangoldt(n):
-    if n<2: return 0
-    t=n
-    for p in [2,3,5,7,11,13,17,19,23,29,31,37,41,43,47,53,59,61,67,71,73,79,83,89,97]:
-        if t==1: break
-        k=0
-        while t%p==0: t//=p; k+=1
-        if k>0 and t==1: return math.log(p)
-    if t>1: return math.log(n)
-    return 0
-LAM={}; LN={}
-for n in range(2,N+1):
-    l=mangoldt(n)
-    if l>0: LAM[n]=l; LN[n]=math.log(n)
+NS,W=mangoldt_terms(N)     # exact Λ(n)/√n
 
 zeros=[14.1347,21.022,25.0109,30.4249,32.9351,37.5862,40.9187,43.3271,48.0052,49.7738]
 
 def F_ab(alpha, beta):
     """Total signal: sum over first 5 zeros of |A(gamma^alpha)|^2
-    with geometry log(n)^beta"""
-    total=0.0
-    for g in zeros[:5]:
-        t = g**alpha if alpha != 0 else 1.0
-        ar=ai=0.0
-        for n,lam in LAM.items():
-            pos = LN[n]**beta if beta != 0 else 1.0
-            phase = -t * pos
-            w = lam/math.sqrt(n)
-            ar+=w*math.cos(phase); ai+=w*math.sin(phase)
-        total += ar**2 + ai**2
-    return total
+    with geometry log(n)^beta (beta may be an array)"""
+    return power([g**alpha for g in zeros[:5]], NS, W, beta).sum(axis=-1)
 
 # Strike 1: Sweep alpha with beta=1 (standard geometry)
 print("=== STRIKE 1: Sweep alpha (zero power) with beta=1 ===")
@@ -3,52 +3,30 @@
 Signal = F(at_zero) / F(off_zero)
 This normalizes out the DC divergence at small frequencies.
 """
-import math, random
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools'))
+from dirichlet_poly import mangoldt_terms, power
 random.seed(42)
 N=1200
-def mangoldt(n):
-    if n<2: return 0
-    t=n
-    for p in [2,3,5,7,11,13,17,19,23,29,31,37,41,43,47,53,59,61,67,71,73,79,83,89,97]:
-        if t==1: break
-        k=0
-        while t%p==0: t//=p; k+=1
-        if k>0 and t==1: return math.log(p)
-    if t>1: return math.log(n)
-    return 0
-LAM={}; LN={}
-for n in range(2,N+1):
-    l=mangoldt(n)
-    if l>0: LAM[n]=l; LN[n]=math.log(n)
+NS,W=mangoldt_terms(N)     # exact Λ(n)/√n
 
 zeros=[14.1347,21.022,25.0109,30.4249,32.9351]
 
 def A_ab(t, beta):
-    """Amplitude with geometry log(n)^beta"""
-    ar=ai=0.0
-    for n,lam in LAM.items():
-        pos = LN[n]**beta if beta > 0.01 else 1.0
-        phase = -t * pos
-        w = lam/math.sqrt(n)
-        ar+=w*math.cos(phase); ai+=w*math.sin(phase)
-    return ar**2+ai**2
+    """|A|^2 with geometry log(n)^beta, for a scalar or array of t"""
+    return power(t, NS, W, beta if beta > 0.01 else 0.0)
 
 def contrast(alpha, beta):
     """Signal at zeros / background"""
-    sig = 0.0
-    for g in zeros:
-        t = g**alpha if abs(alpha)>0.01 else 1.0
-        sig += A_ab(t, beta)
-    sig /= len(zeros)
+    ts = [g**alpha if abs(alpha)>0.01 else 1.0 for g in zeros]
+    sig = A_ab(ts, beta).sum() / len(zeros)
     # Background: random frequencies in same range
-    bg = 0.0
-    t_range = [g**alpha if abs(alpha)>0.01 else 1.0 for g in zeros]
-    t_lo = min(t_range)*0.8; t_hi = max(t_range)*1.2
+    t_lo = min(ts)*0.8; t_hi = max(ts)*1.2
     if t_hi <= t_lo: t_hi = t_lo + 1
-    for _ in range(10):
-        t_rnd = t_lo + random.random()*(t_hi-t_lo)
-        bg += A_ab(t_rnd, beta)
-    bg /= 10
+    bg = A_ab([t_lo + random.random()*(t_hi-t_lo) for _ in range(10)], beta).sum() / 10
     return sig / bg if bg > 1 else sig
 
 # STRIKE 1: alpha sweep, beta=1
@@ -61,17 +39,11 @@ best_c=0; best_a=0
 for ai in range(-15, 25):
     alpha = ai * 0.1
     if abs(alpha) < 0.05: continue
-    sig=0
-    for g in zeros:
-        t=g**alpha; sig+=A_ab(t,1.0)
-    sig/=len(zeros)
     t_range=[g**alpha for g in zeros]
+    sig=A_ab(t_range,1.0).sum()/len(zeros)
     t_lo=min(t_range)*0.8; t_hi=max(t_range)*1.2
     if t_hi<=t_lo: t_hi=t_lo+1
-    bg=0
-    for _ in range(10):
-        bg+=A_ab(t_lo+random.random()*(t_hi-t_lo),1.0)
-    bg/=10
+    bg=A_ab([t_lo+random.random()*(t_hi-t_lo) for _ in range(10)],1.0).sum()/10
     c=sig/bg if bg>1 else 0
     if c>best_c: best_c=c; best_a=alpha
     if c>0.5 or abs(alpha-1.0)<0.05:
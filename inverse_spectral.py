@@ -8,12 +8,19 @@ The null model uses phase-randomized zeros to break correlations
 while preserving density.
 """
 
+import os
+import sys
+
 import numpy as np
-from mpmath import mp, zetazero, log, exp, pi
+from mpmath import mp, log, exp, pi
 import matplotlib.pyplot as plt
 from typing import List, Tuple
 import time
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools'))
+from explicit_formula import ExplicitFormula
+from zero_catalog import zeta_first
+
 # Set precision
 mp.dps = 30
 
@@ -27,77 +34,50 @@ class InverseSpectral:
         self.load_zeros()
 
     def load_zeros(self):
-        """Load/compute the first num_zeros non-trivial zeros of zeta."""
-        print(f"Computing {self.num_zeros} zeta zeros...")
+        """Load the first num_zeros non-trivial zeros of zeta (zero catalog; mpmath fills gaps once)."""
+        print(f"Loading {self.num_zeros} zeta zeros...")
         start = time.time()
 
-        # Get imaginary parts of zeros (ρ = 1/2 + iγ)
-        self.zeros = []
-        for n in range(1, self.num_zeros + 1):
-            zero = zetazero(n)
-            gamma = float(zero.imag)
-            self.zeros.append(gamma)
-            if n % 100 == 0:
-                print(f"  Computed {n} zeros...")
-
-        self.zeros = np.array(self.zeros)
+        # Imaginary parts γ of the zeros ρ = 1/2 + iγ
+        self.zeros = np.array(zeta_first(self.num_zeros))
+        self.ef = ExplicitFormula(self.zeros)
         elapsed = time.time() - start
-        print(f"Done. Computed {len(self.zeros)} zeros in {elapsed:.1f}s")
+        print(f"Done. Loaded {len(self.zeros)} zeros in {elapsed:.1f}s")
         print(f"First few γ values: {self.zeros[:5]}")
         print(f"Last few γ values: {self.zeros[-5:]}")
 
-    def E_actual(self, x: float) -> float:
+    def E_actual(self, x):
         """
         Compute E(x) = -Σ_ρ (x^ρ / ρ) using actual zeros.
 
         Each term: x^(1/2 + iγ) / (1/2 + iγ)
                  = x^(1/2) * e^(iγ log x) / (1/2 + iγ)
 
-        We take the real part since E(x) is real.
+        We take the real part since E(x) is real, doubled for the
+        conjugate pairs ρ, ρ̄. x may be a scalar or an array.
         """
-        sqrt_x = np.sqrt(x)
-        log_x = np.log(x)
-
-        total = 0.0
-        for gamma in self.zeros:
-            # Phase: e^(iγ log x)
-            phase = np.exp(1j * gamma * log_x)
-            # Denominator: 1/2 + iγ
-            denom = 0.5 + 1j * gamma
-            # Term contribution
-            term = sqrt_x * phase / denom
-            total += term
-
-        # E(x) = -Σ (real part, doubled for conjugate pairs)
-        # Since zeros come in conjugate pairs ρ, ρ̄, we double the real part
-        return -2.0 * total.real
-
-    def E_null(self, x: float, random_phases: np.ndarray) -> float:
+        if np.ndim(x) == 0:
+            return float(self.ef.E([x])[0])
+        return self.ef.E(x)
+
+    def E_null(self, x, random_phases: np.ndarray):
         """
         Compute E(x) with randomized phases (null model).
 
         Same amplitude structure, but phases are randomized to break correlations.
+        random_phases may be (num_zeros,) or (trials, num_zeros).
         """
-        sqrt_x = np.sqrt(x)
-        log_x = np.log(x)
-
-        total = 0.0
-        for i, gamma in enumerate(self.zeros):
-            # Randomized phase
-            phase = np.exp(1j * (gamma * log_x + random_phases[i]))
-            denom = 0.5 + 1j * gamma
-            term = sqrt_x * phase / denom
-            total += term
-
-        return -2.0 * total.real
+        if np.ndim(x) == 0:
+            return self.ef.E([x], random_phases)[..., 0]
+        return self.ef.E(x, random_phases)
 
     def compute_variance(self, x_values: np.ndarray, null: bool = False,
                          random_phases: np.ndarray = None) -> float:
         """Compute variance of E(x) over given x values."""
         if null:
-            E_values = np.array([self.E_null(x, random_phases) for x in x_values])
+            E_values = self.E_null(x_values, random_phases)
         else:
-            E_values = np.array([self.E_actual(x) for x in x_values])
+            E_values = self.E_actual(x_values)
 
         return np.var(E_values)
 
@@ -116,16 +96,13 @@ class InverseSpectral:
 
         # Compute actual variance
         print(f"Computing actual E(x) for {num_samples} points in [2, {N}]...")
-        E_actual_values = np.array([self.E_actual(x) for x in x_values])
+        E_actual_values = self.E_actual(x_values)
         var_actual = np.var(E_actual_values)
 
-        # Compute null variance (average over multiple realizations)
+        # Compute null variance (average over multiple realizations, one trig table)
         print(f"Computing null variance ({num_null_trials} trials)...")
-        null_variances = []
-        for trial in range(num_null_trials):
-            random_phases = np.random.uniform(0, 2*np.pi, len(self.zeros))
-            E_null_values = np.array([self.E_null(x, random_phases) for x in x_values])
-            null_variances.append(np.var(E_null_values))
+        random_phases = np.random.uniform(0, 2*np.pi, (num_null_trials, len(self.zeros)))
+        null_variances = np.var(self.E_null(x_values, random_phases), axis=1)
 
         var_null = np.mean(null_variances)
         var_null_std = np.std(null_variances)
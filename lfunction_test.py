@@ -8,7 +8,12 @@ Verifying the phase-mixing hypothesis prediction:
 
 import math
 import cmath
+import os
 import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools'))
+from random_matrix import sequence
 
 # Import zeros
 from zeros_500 import ZEROS as ZETA_ZEROS
@@ -43,21 +48,8 @@ def cross_band_covariance(zeros1, zeros2, N=10000, n_points=100):
     return cov
 
 def generate_gue_zeros(n, density):
-    """Generate n zeros with GUE spacing statistics"""
-    # Wigner surmise for GUE: p(s) = (32/pi^2) * s^2 * exp(-4s^2/pi)
-    zeros = []
-    pos = 0
-    for _ in range(n):
-        # Sample from Wigner distribution using rejection sampling
-        while True:
-            s = random.expovariate(1) * 0.8  # proposal
-            p_s = (32 / math.pi**2) * s**2 * math.exp(-4 * s**2 / math.pi)
-            q_s = 1.25 * math.exp(-s / 0.8) / 0.8  # proposal density
-            if random.random() < p_s / q_s:
-                break
-        pos += s / density
-        zeros.append(pos)
-    return zeros
+    """Generate n zeros with GUE statistics (bulk of a GUE matrix, unit spacing / density)"""
+    return list((sequence(n, 2, seed=random.randrange(2**32)) + 1) / density)
 
 def main():
     print("=" * 70)
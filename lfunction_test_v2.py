@@ -7,7 +7,12 @@ to ensure comparable populations across L-functions.
 
 import math
 import cmath
+import os
 import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools'))
+from random_matrix import sequence
 
 from zeros_500 import ZEROS as ZETA_ZEROS
 from beta_zeros import BETA_ZEROS
@@ -36,20 +41,9 @@ def cross_band_covariance(zeros1, zeros2, N=10000, n_points=100):
     return cov
 
 def generate_gue_zeros(n, first_zero, last_zero):
-    """Generate n zeros with GUE spacing, matching range"""
+    """Generate n zeros with GUE statistics, matching range"""
     density = n / (last_zero - first_zero)
-    zeros = []
-    pos = first_zero
-    for _ in range(n):
-        while True:
-            s = random.expovariate(1) * 0.8
-            p_s = (32 / math.pi**2) * s**2 * math.exp(-4 * s**2 / math.pi)
-            q_s = 1.25 * math.exp(-s / 0.8) / 0.8
-            if random.random() < p_s / q_s:
-                break
-        pos += s / density
-        zeros.append(pos)
-    return zeros
+    return list(first_zero + (sequence(n, 2, seed=random.randrange(2**32)) + 1) / density)
 
 def analyze_lfunction(name, zeros, n_total=50, n_band1=15, n_gue=100):
     """Analyze a single L-function's cross-band covariance"""
@@ -1,35 +1,27 @@
-import math,cmath,random
-from zeros_500 import ZEROS
-
-def C(N, Z, samples=100, trials=15):
-    xs = [10**(0.3 + i*(math.log10(N)-0.3)/(samples-1)) for i in range(samples)]
+import math, os, sys
 
-    def E(x, rp=None):
-        t = 0j
-        for i, g in enumerate(Z):
-            ph = g * math.log(x) + (rp[i] if rp else 0)
-            t += math.sqrt(x) * cmath.exp(1j * ph) / complex(0.5, g)
-        return -2 * t.real
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools'))
+from explicit_formula import ExplicitFormula, log_grid
+from null_model import cancellation
+from zeros_500 import ZEROS
 
-    def v(a):
-        m = sum(a) / len(a)
-        return sum((y - m)**2 for y in a) / len(a)
+EF = ExplicitFormula(ZEROS)
 
-    va = v([E(x) for x in xs])
-    vn = sum(v([E(x, [random.uniform(0, 6.28) for _ in Z]) for x in xs]) for _ in range(trials)) / trials
-    return va / vn if vn else 0
+def C(N, Z, samples=100, trials=15):
+    r = cancellation(EF if Z is ZEROS else Z, log_grid(N, samples, lo=0.3), trials, per_point=True)
+    return r['C'], r['ci']
 
 print(f"SCALING ANALYSIS WITH {len(ZEROS)} ZEROS")
-print("=" * 40)
-print(f"{'N':>8}  {'C(N)':>8}  {'log(N)':>7}")
+print("=" * 60)
+print(f"{'N':>8}  {'C(N)':>8}  {'95% CI':>17}  {'log(N)':>7}")
 
 Ns = [500, 1000, 2000, 5000, 10000, 20000, 50000, 100000]
 Cs = []
 
 for n in Ns:
-    c = C(n, ZEROS)
+    c, (lo, hi) = C(n, ZEROS)
     Cs.append(c)
-    print(f"{n:>8}  {c:>8.4f}  {math.log(n):>7.2f}")
+    print(f"{n:>8}  {c:>8.4f}  [{lo:.4f}, {hi:.4f}]  {math.log(n):>7.2f}")
 
 # Fit C(N) = a + b/log(N)
 x = [1/math.log(n) for n in Ns]
@@ -6,7 +6,10 @@ Strike 2: Cross-SFF between pairs of L-functions
 Strike 3: Does cross-SFF depend on chi_1 * chi_2_bar?
 Strike 4: Nearest-neighbor spacing between DIFFERENT L-functions
 """
-import math
+import os, sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools'))
+import sff as sff_engine
 
 # Parse zeros from GP output
 def parse_file(fname):
@@ -52,17 +55,7 @@ print()
 
 def sff(zeros, tau_values):
     """Spectral Form Factor"""
-    N = len(zeros)
-    result = []
-    for tau in tau_values:
-        sr = si = 0.0
-        for g in zeros:
-            phase = 2 * math.pi * g * tau
-            sr += math.cos(phase)
-            si += math.sin(phase)
-        K = (sr*sr + si*si) / N
-        result.append(K)
-    return result
+    return sff_engine.sff(zeros, tau_values).tolist()
 
 # Unfold: for zeta zeros, mean spacing at height T ~ 2*pi/ln(T/(2*pi))
 # For L(s,chi) mod q, mean spacing ~ 2*pi/ln(qT/(2*pi))
@@ -98,25 +91,6 @@ for label in sorted(all_zeros.keys()):
 print("=== STRIKE 2: Cross-SFF between L-functions ===")
 print()
 
-def cross_sff(zeros1, zeros2, tau_values):
-    """Cross spectral form factor"""
-    N = math.sqrt(len(zeros1) * len(zeros2))
-    result = []
-    for tau in tau_values:
-        r1 = i1 = r2 = i2 = 0.0
-        for g in zeros1:
-            phase = 2 * math.pi * g * tau
-            r1 += math.cos(phase); i1 += math.sin(phase)
-        for g in zeros2:
-            phase = 2 * math.pi * g * tau
-            r2 += math.cos(phase); i2 += math.sin(phase)
-        # cross = A1 * conj(A2) = (r1+i*i1)(r2-i*i2) = (r1*r2+i1*i2) + i(i1*r2-r1*i2)
-        cross_re = r1*r2 + i1*i2
-        cross_im = i1*r2 - r1*i2
-        cross_abs = math.sqrt(cross_re**2 + cross_im**2) / N
-        result.append((cross_abs, cross_re/N, cross_im/N))
-    return result
-
 # Compare self vs cross for q=5
 labels_q5 = [k for k in sorted(all_zeros.keys()) if k.startswith('Q5')]
 print("Q5 characters:", labels_q5)
@@ -125,23 +99,20 @@ print()
 # Use a range of tau values
 tau_test = [0.01, 0.02, 0.05, 0.1, 0.2, 0.5]
 
+# Every self and cross SFF of the family in one call: C[i, j] = A_i conj(A_j) / sqrt(N_i N_j)
+q5_used = [l for l in labels_q5 if len(all_zeros[l]) >= 5]
+C = sff_engine.family_sff([all_zeros[l] for l in q5_used], tau_test)
+
 print("Self-SFF (diagonal):")
-for label in labels_q5:
-    z = all_zeros[label]
-    if len(z) < 5: continue
-    vals = sff(z, tau_test)
-    print("  %s: " % label + " ".join("%.2f" % v for v in vals))
+for i, label in enumerate(q5_used):
+    print("  %s: " % label + " ".join("%.2f" % v for v in C[i, i].real))
 
 print()
 print("Cross-SFF (off-diagonal):")
-for i, l1 in enumerate(labels_q5):
-    for j, l2 in enumerate(labels_q5):
+for i, l1 in enumerate(q5_used):
+    for j, l2 in enumerate(q5_used):
         if j <= i: continue
-        z1, z2 = all_zeros[l1], all_zeros[l2]
-        if len(z1) < 5 or len(z2) < 5: continue
-        vals = cross_sff(z1, z2, tau_test)
-        abs_vals = [v[0] for v in vals]
-        print("  %s x %s: " % (l1, l2) + " ".join("%.2f" % v for v in abs_vals))
+        print("  %s x %s: " % (l1, l2) + " ".join("%.2f" % v for v in abs(C[i, j])))
 
 print()
 print("If cross ~ self: zeros are correlated.")
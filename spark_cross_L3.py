@@ -7,7 +7,13 @@ Strike 5: Nearest-neighbor spacing: inter vs intra L-function
 Strike 6: GUE vs Poisson for cross-statistics
 Strike 7: Does chi_1 * bar(chi_2) matter?
 """
-import math
+import math, os, sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools'))
+
+import gue_reference
+from pair_corr import cross_hist, pair_hist
+from spacing_stats import spacings
 
 def parse_file(fname):
     data = {}
@@ -49,25 +55,18 @@ q5 = {k: v for k, v in all_zeros.items() if k.startswith('Q5')}
 print("=== STRIKE 3: Pair correlation — same vs different L-function ===")
 print()
 
+def _normalized(counts, bins, bin_width):
+    # Normalize: density should be 1 for Poisson
+    npairs = int(counts.sum())
+    norm = npairs * bin_width if npairs > 0 else 1
+    return [c / (norm / bins) for c in counts.tolist()], bin_width
+
 def pair_correlation(zeros, bins, max_s):
     """Pair correlation histogram in unfolded units"""
     N = len(zeros)
     # Simple unfolding: normalize spacings by mean spacing
     ms = (zeros[-1] - zeros[0]) / (N - 1)
-    counts = [0] * bins
-    bin_width = max_s / bins
-    npairs = 0
-    for i in range(N):
-        for j in range(i+1, N):
-            s = abs(zeros[i] - zeros[j]) / ms
-            if s < max_s:
-                b = int(s / bin_width)
-                if b < bins:
-                    counts[b] += 1
-                    npairs += 1
-    # Normalize: density should be 1 for Poisson
-    norm = npairs * bin_width if npairs > 0 else 1
-    return [c / (norm / bins) for c in counts], bin_width
+    return _normalized(pair_hist(zeros, max_s, bins, scale=ms), bins, max_s / bins)
 
 def cross_pair_correlation(z1, z2, bins, max_s):
     """Pair correlation between zeros of DIFFERENT L-functions"""
@@ -75,19 +74,7 @@ def cross_pair_correlation(z1, z2, bins, max_s):
     ms1 = (z1[-1] - z1[0]) / (len(z1) - 1) if len(z1) > 1 else 1
     ms2 = (z2[-1] - z2[0]) / (len(z2) - 1) if len(z2) > 1 else 1
     ms = (ms1 + ms2) / 2
-    counts = [0] * bins
-    bin_width = max_s / bins
-    npairs = 0
-    for g1 in z1:
-        for g2 in z2:
-            s = abs(g1 - g2) / ms
-            if s < max_s:
-                b = int(s / bin_width)
-                if b < bins:
-                    counts[b] += 1
-                    npairs += 1
-    norm = npairs * bin_width if npairs > 0 else 1
-    return [c / (norm / bins) for c in counts], bin_width
+    return _normalized(cross_hist(z1, z2, max_s, bins, scale=ms), bins, max_s / bins)
 
 BINS = 20; MAX_S = 4.0
 
@@ -105,8 +92,7 @@ cross_pc2, _ = cross_pair_correlation(z1, z3, BINS, MAX_S)
 
 # GUE prediction: 1 - (sin(pi*s)/(pi*s))^2
 def gue_r2(s):
-    if s < 0.001: return 0
-    return 1 - (math.sin(math.pi * s) / (math.pi * s))**2
+    return float(gue_reference.r2(s))
 
 print("Pair correlation R2(s):")
 print("%6s %7s %7s %7s %7s" % ("s", "GUE", "self", "cross12", "cross13"))
@@ -131,9 +117,7 @@ print()
 
 def nn_spacings(zeros):
     """Nearest-neighbor spacings, normalized by mean"""
-    spacings = [zeros[i+1]-zeros[i] for i in range(len(zeros)-1)]
-    ms = sum(spacings)/len(spacings)
-    return [s/ms for s in spacings]
+    return spacings(zeros).tolist()
 
 def cross_nn_spacings(z1, z2):
     """For each zero in z1, find nearest zero in z2"""
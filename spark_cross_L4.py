@@ -19,7 +19,10 @@ Strike 8: The "superposition" SFF
 Strike 9: Connected cross-SFF (the real test)
 Strike 10: Compare q=3, q=5, q=7
 """
-import math
+import os, sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools'))
+from sff import mixture_sff, sff
 
 def parse_file(fname):
     data = {}
@@ -97,16 +100,7 @@ print("Mix zeros of independent L-functions, measure SFF")
 print()
 
 def sff_values(zeros, taus):
-    N = len(zeros)
-    result = []
-    for tau in taus:
-        sr = si = 0.0
-        for g in zeros:
-            phase = 2 * math.pi * g * tau
-            sr += math.cos(phase); si += math.sin(phase)
-        K = (sr*sr + si*si) / N
-        result.append(K)
-    return result
+    return sff(zeros, taus).tolist()
 
 # For q=5: independent characters are Q5_0, Q5_1, Q5_2, Q5_3
 # (since Q5_1 and Q5_3 are NOT identical, they're all independent)
@@ -149,17 +143,7 @@ print("Should be ~0 if zeros are independent.")
 print()
 
 N_total = len(all_mixed)
-connected = []
-for idx, tau in enumerate(taus):
-    k_mix = mixed_vals[idx]
-    k_sum = 0.0
-    for k in indep_q5:
-        z = indep_q5[k]
-        if len(z) < 2: continue
-        n_chi = len(z)
-        k_ind = sff_values(z, [tau])[0]
-        k_sum += (n_chi / N_total) * k_ind
-    connected.append(k_mix - k_sum)
+_, _, connected = mixture_sff([z for z in indep_q5.values() if len(z) >= 2], taus)
 
 # Print connected SFF at selected tau values
 print("%8s %8s %8s %8s" % ("tau", "K_mix", "K_ind", "K_conn"))
@@ -204,13 +188,7 @@ for q, prefix, T_cut in [(3, 'Q3', 70), (5, 'Q5', 50), (7, 'Q7', 40)]:
 
     # Compute connected SFF
     test_taus = [0.01 * i for i in range(1, 31)]
-    mix_sff = sff_values(all_mix, test_taus)
-    conn = []
-    for idx, tau in enumerate(test_taus):
-        k_sum = 0
-        for k, z in chars.items():
-            k_sum += (len(z)/N_tot) * sff_values(z, [tau])[0]
-        conn.append(mix_sff[idx] - k_sum)
+    mix_sff, _, conn = mixture_sff(list(chars.values()), test_taus)
 
     mean_c = sum(conn) / len(conn)
     mean_i = sum(mix_sff[i] - conn[i] for i in range(len(conn))) / len(conn)
@@ -9,7 +9,13 @@ Strike 12: Number variance — the cleanest cross-statistic
 Strike 13: Level spacing ratio for mixed zeros
 Strike 14: The repulsion test — do close zeros from different L avoid each other?
 """
-import math
+import math, os, sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools'))
+
+import numpy as np
+from spacing_stats import dirichlet_law, ratios
+from spacing_stats import unfold as unfold_law
 
 def parse_file(fname):
     data = {}
@@ -45,7 +51,7 @@ def weyl_count(T, q):
 
 def unfold(zeros, q):
     """Unfold zeros using Weyl law"""
-    return [weyl_count(g, q) for g in zeros]
+    return unfold_law(zeros, dirichlet_law(q)).tolist()
 
 # ============================================
 # STRIKE 12: r-statistic (spacing ratio)
@@ -59,13 +65,7 @@ print()
 
 def spacing_ratios(zeros):
     """Compute r = min(s_n, s_{n+1}) / max(s_n, s_{n+1})"""
-    spacings = [zeros[i+1] - zeros[i] for i in range(len(zeros)-1)]
-    ratios = []
-    for i in range(len(spacings)-1):
-        s1, s2 = spacings[i], spacings[i+1]
-        if max(s1,s2) > 0:
-            ratios.append(min(s1,s2) / max(s1,s2))
-    return ratios
+    return ratios(np.diff(zeros)).tolist()
 
 # For each L-function individually (should be GUE)
 print("Individual L-functions (should be GUE ≈ 0.531):")
@@ -9,7 +9,15 @@ Strike 16: Cross number variance (more sensitive than SFF)
 Strike 17: What if we weight by the character relationship?
 Strike 18: The bridge — does the explicit formula create cross-terms?
 """
-import math
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools'))
+from dirichlet_chars import twisted_amplitudes
+from dirichlet_poly import mangoldt_terms
+from zero_catalog import primitive_root
 
 def parse_file(fname):
     data = {}
@@ -47,65 +55,17 @@ print("=== STRIKE 15: Explicit formula cross-correlation ===")
 print("A_chi(t) = sum Lambda(n) chi(n) n^{-1/2 - it}")
 print()
 
-def sieve(n):
-    s=[True]*(n+1); s[0]=s[1]=False
-    for i in range(2,int(n**.5)+1):
-        if s[i]:
-            for j in range(i*i,n+1,i): s[j]=False
-    return s
-
 N = 5000
-is_p = sieve(N)
-
-def mangoldt(n):
-    """Lambda(n) = log(p) if n is a prime power p^k, else 0"""
-    if n < 2: return 0
-    if is_p[n]: return math.log(n)
-    # Check prime powers
-    for p in range(2, int(n**0.5)+1):
-        if not is_p[p]: continue
-        m = n
-        while m > 1:
-            if m % p != 0: break
-            m //= p
-        if m == 1: return math.log(p)
-    return 0
-
-# Characters mod 5
-# Generator 2, order 4. chi_a(2) = e^{2pi*i*a/4}
-# chi_a(n): need n mod 5's discrete log base 2.
-# 2^0=1, 2^1=2, 2^2=4, 2^3=3, 2^4=1 mod 5
-# So: 1->0, 2->1, 3->3, 4->2 (discrete logs mod 5)
-dlog5 = {1:0, 2:1, 3:3, 4:2}
-
-def chi5(a, n):
-    """Character chi_a mod 5: chi_a(n) = e^{2pi*i*a*dlog(n)/4}"""
-    r = n % 5
-    if r == 0: return 0
-    dl = dlog5[r]
-    theta = 2 * math.pi * a * dl / 4
-    return complex(math.cos(theta), math.sin(theta))
-
-# Precompute Lambda
-LAM = {}
-for n in range(2, N+1):
-    l = mangoldt(n)
-    if l > 0: LAM[n] = l
+NS, W = mangoldt_terms(N)
 
+# Characters mod q: chi_a(n) = e^{2pi*i*a*dlog(n)/phi(q)}, dlog base the least
+# primitive root (2 for q = 5) = Conrey character q.(g^a mod q)
 def A_chi(a, t, q=5):
-    """Amplitude: sum Lambda(n) chi_a(n) n^{-1/2-it}"""
-    ar = ai = 0.0
-    for n, lam in LAM.items():
-        c = chi5(a, n)
-        if c == 0: continue
-        phase = -t * math.log(n)
-        w = lam / math.sqrt(n)
-        # c * exp(i*phase) = (cr + i*ci) * (cos(phase) + i*sin(phase))
-        cr, ci = c.real, c.imag
-        cp, sp = math.cos(phase), math.sin(phase)
-        ar += w * (cr*cp - ci*sp)
-        ai += w * (cr*sp + ci*cp)
-    return complex(ar, ai)
+    """Amplitude: sum Lambda(n) chi_a(n) n^{-1/2-it}; a may be a list (one row each), t an array"""
+    g = primitive_root(q)
+    chars = [pow(g, int(b), q) for b in np.atleast_1d(a)]
+    A = twisted_amplitudes(t, q, NS, W, chars)
+    return A if np.ndim(a) else A[0]
 
 # Test: |A_chi(a, t)|^2 should peak at zeros of L(s, chi_a)
 print("Test: |A_chi_0(t)|^2 at first few zeta zeros:")
@@ -139,8 +99,8 @@ import random
 bg = {}
 for b in range(4):
     random_ts = [random.uniform(10, 60) for _ in range(20)]
-    bg_vals = [abs(A_chi(b, t))**2 for t in random_ts]
-    bg[b] = sum(bg_vals) / len(bg_vals)
+    bg_vals = np.abs(A_chi(b, random_ts))**2
+    bg[b] = bg_vals.sum() / len(bg_vals)
     print("  Background |A_%d|^2: %.2f" % (b, bg[b]))
 
 print()
@@ -151,9 +111,9 @@ for a in range(4):
     zeros = [g for g in all_zeros.get(label, []) if 10 <= g <= 60][:15]
     if len(zeros) < 3: continue
 
+    F = np.abs(A_chi(range(4), zeros))**2     # all 4 characters at once
     for b in range(4):
-        vals = [abs(A_chi(b, g))**2 for g in zeros]
-        mean_val = sum(vals) / len(vals)
+        mean_val = F[b].sum() / len(zeros)
         ratio = mean_val / bg[b] if bg[b] > 0 else 0
         tag = " <-- SELF" if a == b else ""
         if ratio > 2: tag += " HIGH!"
@@ -16,7 +16,13 @@ in the pair correlation come from the ARITHMETIC of the conductor.
 For same-conductor L-functions, there can be weak cross-terms
 of order 1/log(T) from the explicit formula.
 """
-import math
+import math, os, sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools'))
+import gue_reference
+from number_variance import window_moments
 
 def parse_file(fname):
     data = {}
@@ -80,8 +86,7 @@ for i in range(len(keys)):
 BINS = 20; MAX_S = 5.0; bw = MAX_S/BINS
 
 def gue_r2(s):
-    if s < 0.001: return 0
-    return 1 - (math.sin(math.pi*s)/(math.pi*s))**2
+    return float(gue_reference.r2(s))
 
 print("%6s %7s %7s %7s" % ("s", "GUE", "self", "cross"))
 print("-" * 32)
@@ -118,18 +123,11 @@ print()
 
 def number_variance(zeros, L_values, T_range):
     """Compute number variance for unfolded zeros"""
-    results = []
-    for L in L_values:
-        counts = []
-        for t0 in range(int(T_range[0]*10), int(T_range[1]*10), max(1, int(L*5))):
-            t0 = t0 / 10.0
-            n = sum(1 for g in zeros if t0 <= g < t0 + L)
-            counts.append(n)
-        if len(counts) > 5:
-            mean_n = sum(counts)/len(counts)
-            var_n = sum((c-mean_n)**2 for c in counts)/len(counts)
-            results.append((L, mean_n, var_n))
-    return results
+    starts = [np.arange(int(T_range[0]*10), int(T_range[1]*10), max(1, int(L*5))) / 10.0
+              for L in L_values]
+    nv = window_moments(zeros, L_values, starts)
+    keep = nv["n"] > 5
+    return list(zip(nv["L"][keep], nv["mean"][keep], nv["var"][keep]))
 
 # For individual L-function (should be ~GUE)
 # For mixed (should approach Poisson if independent)
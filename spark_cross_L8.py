@@ -6,7 +6,13 @@ For small N, <r> can be higher. Let's check with synthetic GUE.
 
 Also: check <r> for zeta zeros (we have many more).
 """
-import math, random
+import math, os, random, sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools'))
+
+import numpy as np
+import random_matrix
+import spacing_stats
 
 # Load zeta zeros from z.txt
 zeta_zeros = []
@@ -21,13 +27,7 @@ print("Loaded %d zeta zeros" % len(zeta_zeros))
 print()
 
 def spacing_ratios(zeros):
-    spacings = [zeros[i+1]-zeros[i] for i in range(len(zeros)-1)]
-    ratios = []
-    for i in range(len(spacings)-1):
-        s1, s2 = spacings[i], spacings[i+1]
-        if max(s1,s2) > 0:
-            ratios.append(min(s1,s2)/max(s1,s2))
-    return ratios
+    return spacing_stats.ratios(np.diff(zeros)).tolist()
 
 # <r> for zeta zeros at different sample sizes
 print("=== <r> for zeta zeros at different N ===")
@@ -45,26 +45,16 @@ print()
 # For small N, <r> has finite-size corrections
 print("=== Synthetic GUE <r> at different N ===")
 
-def gue_eigenvalues(N):
-    """Generate eigenvalues of N x N GUE matrix"""
-    # A = (M + M^*) / (2*sqrt(2N)) where M has iid complex Gaussian entries
-    M_real = [[random.gauss(0,1) for _ in range(N)] for _ in range(N)]
-    M_imag = [[random.gauss(0,1) for _ in range(N)] for _ in range(N)]
-    # Hermitian: H = (M + M^*) / 2
-    H = [[0.0]*N for _ in range(N)]
-    for i in range(N):
-        for j in range(i, N):
-            hr = (M_real[i][j] + M_real[j][i]) / 2
-            hi = (M_imag[i][j] - M_imag[j][i]) / 2
-            H[i][j] = hr  # just use real part for GOE (simpler)
-            H[j][i] = hr
-
-    # Use numpy-free eigenvalue computation? Too hard for large N.
-    # For small N, use power iteration or just report.
-    # Actually, let's just verify with a known N=3 case.
-    return None  # Can't do eigendecomposition without numpy
-
-# Instead: generate Poisson and semi-Poisson for comparison
+def gue_eigenvalues(N, count=100, seed=0):
+    """Unfolded eigenvalues of count N x N GUE matrices (tridiagonal model)"""
+    return random_matrix.spectra(2, N, count, seed=seed, cache=False)
+
+for N in [20, 50, 100, 200]:
+    r = [x for u in gue_eigenvalues(N, 100, seed=N) for x in spacing_ratios(u)]
+    print("  GUE N=%3d: <r> = %.4f" % (N, sum(r)/len(r)))
+print()
+
+# And Poisson for comparison
 print("=== Poisson test ===")
 for N in [20, 50, 100, 200]:
     # Poisson: independent exponential spacings
@@ -3,27 +3,16 @@
 Lambda(n) lives in multiplicative space. The critical strip is its home.
 Zeta zeros are its resonances. What happens when we probe with OVERTONES?
 """
-import math, sys
-
-def mangoldt(n):
-    if n<2: return 0
-    t=n
-    for p in [2,3,5,7,11,13,17,19,23,29,31,37,41,43,47,53,59,61,67,71,73,79,83,89,97]:
-        if t==1: break
-        k=0
-        while t%p==0: t//=p; k+=1
-        if k>0 and t==1: return math.log(p)
-    if t>1: return math.log(n)
-    return 0
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools'))
+from arith_tables import mangoldt_table
+from dirichlet_poly import amplitudes, mangoldt_terms, power
 
 N = 2000
-LAM = {}
-LN = {}
-for n in range(2, N+1):
-    l = mangoldt(n)
-    if l > 0:
-        LAM[n] = l
-        LN[n] = math.log(n)
+NS, W = mangoldt_terms(N)    # exact Λ(n)/√n
 
 # Load zeta zeros
 zeros = []
@@ -54,27 +43,17 @@ print("F(t) near each zeta zero")
 print()
 
 def F_mult(t):
-    ar = ai = 0.0
-    for n, l in LAM.items():
-        phase = -t * LN[n]
-        w = l / math.sqrt(n)
-        ar += w * math.cos(phase)
-        ai += w * math.sin(phase)
-    return ar**2 + ai**2
+    """|sum Lambda(n) n^{-1/2-it}|^2 for a scalar or array of t"""
+    return power(t, NS, W)
 
 # Measure F at and near each zero
 print("%5s %10s %10s %10s %10s" % ("k", "gamma_k", "F(gamma)", "F(gamma-1)", "Q_est"))
 print("-" * 50)
 for k in range(min(20, len(zeros))):
     g = zeros[k]
-    Fg = F_mult(g)
-    # Estimate width: find half-max
-    Fm1 = F_mult(g - 1.0)
-    Fp1 = F_mult(g + 1.0)
+    # Estimate width: find half-max at +/- 1, else +/- 0.5
     # Rough Q = gamma / delta_t where delta_t is half-width
-    # Use F at +/- 0.5 to estimate
-    Fhalf_m = F_mult(g - 0.5)
-    Fhalf_p = F_mult(g + 0.5)
+    Fg, Fm1, Fp1, Fhalf_m, Fhalf_p = F_mult([g, g - 1.0, g + 1.0, g - 0.5, g + 0.5])
     half_max = Fg / 2
     # Q ~ gamma / width
     if Fm1 < half_max and Fp1 < half_max:
@@ -105,10 +84,8 @@ for m in range(1, 8):
     Fh = F_mult(t_harm)
     # Scan nearby for actual peak
     best_F = 0; best_t = t_harm
-    for dt in range(-20, 21):
-        t_try = t_harm + dt * 0.1
-        if t_try < 1: continue
-        Ft = F_mult(t_try)
+    t_near = [t for t in (t_harm + dt * 0.1 for dt in range(-20, 21)) if t >= 1]
+    for t_try, Ft in zip(t_near, F_mult(t_near)):
         if Ft > best_F:
             best_F = Ft; best_t = t_try
     # Is the nearby peak a known zero?
@@ -135,18 +112,10 @@ print("cross(t1,t2) = Re(A(t1)*conj(A(t2))) / |A(t1)||A(t2)|")
 print()
 
 def amplitude_mult(t):
-    ar = ai = 0.0
-    for n, l in LAM.items():
-        phase = -t * LN[n]
-        w = l / math.sqrt(n)
-        ar += w * math.cos(phase)
-        ai += w * math.sin(phase)
-    return complex(ar, ai)
+    return amplitudes(t, NS, W)
 
 # Compute A at first 10 zeros
-A_zeros = []
-for k in range(min(10, len(zeros))):
-    A_zeros.append(amplitude_mult(zeros[k]))
+A_zeros = [complex(a) for a in amplitude_mult(zeros[:10])]
 
 print("Amplitudes at zeros:")
 for k in range(len(A_zeros)):
@@ -387,7 +356,7 @@ print("  log(x) = %.4f, sum_cos = %.4f" % (math.log(best_x), best_sc))
 lbx = math.log(best_x)
 print("  Nearest integer to x: %d" % round(best_x))
 near_n = round(best_x)
-l = mangoldt(near_n) if 2 <= near_n <= 10000 else 0
+l = float(mangoldt_table(near_n)[near_n]) if 2 <= near_n <= 10000 else 0
 print("  Lambda(%d) = %.4f %s" % (near_n, l, "(prime power!)" if l > 0 else "(composite)"))
 
 sys.stdout.flush()
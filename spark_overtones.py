@@ -11,6 +11,11 @@ Key ideas:
 5. The twin prime constant C₂ should appear as a resonance amplitude
 """
 import math
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools'))
+from coherence import laser
 
 def sieve(n):
     s=[True]*(n+1); s[0]=s[1]=False
@@ -19,13 +24,6 @@ def sieve(n):
             for j in range(i*i,n+1,i): s[j]=False
     return [i for i in range(2,n+1) if s[i]]
 
-def laser(values, lam):
-    ar=ai=0
-    for v in values:
-        ph=2*math.pi*v/lam; ar+=math.cos(ph); ai+=math.sin(ph)
-    n=len(values)
-    return (ar*ar+ai*ai)/(n*n) if n>0 else 0
-
 N=50000; P=sieve(N); Pset=set(P)
 
 # Extract prime subsets by gap type
@@ -18,8 +18,12 @@ SPRAY:
 6. Energy-momentum: if q = "momentum" and I(q) = "energy", what's the dispersion?
 7. Resonance width: at each glowing q, how SHARP is the peak?
 """
-import math
 from collections import Counter
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools'))
+from coherence import amplitude, laser, spectrum
 
 def sieve(n):
     s=[True]*(n+1); s[0]=s[1]=False
@@ -49,13 +53,6 @@ def euler_phi(n):
     if t>1: r-=r//t
     return r
 
-def laser(values, lam):
-    ar=ai=0
-    for v in values:
-        ph=2*math.pi*v/lam; ar+=math.cos(ph); ai+=math.sin(ph)
-    n=len(values)
-    return (ar*ar+ai*ai)/(n*n) if n>0 else 0
-
 N=10000; P=sieve(N); Pset=set(P)
 
 # ==========================================
@@ -68,10 +65,11 @@ print()
 
 bright = []  # squarefree
 dark = []    # non-squarefree
+I_all = spectrum(P, range(2, 201))   # whole spectrum in one batched call
 for q in range(2, 201):
     mu = mobius(q)
     phi = euler_phi(q)
-    i_actual = laser(P, q)
+    i_actual = I_all[q - 2]
     i_predicted = (mu**2) / (phi**2) if phi > 0 else 0
     
     if mu != 0:
@@ -146,12 +144,6 @@ print("=== STRIKE 4: Two-probe interference ===")
 print("Cross-coherence: Re(A(q1) * conj(A(q2))) / N^2")
 print()
 
-def amplitude(values, lam):
-    ar=ai=0
-    for v in values:
-        ph=2*math.pi*v/lam; ar+=math.cos(ph); ai+=math.sin(ph)
-    return complex(ar, ai) / len(values)
-
 print(f"{'q1':>3} {'q2':>3} {'I(q1)':>10} {'I(q2)':>10} {'cross':>10} {'|cross|':>10} {'note':>10}")
 print("-"*65)
 pairs_tested = []
@@ -246,12 +238,11 @@ for q in [2, 3, 5, 6, 7, 10, 30]:
     if mobius(q) == 0: continue
     peak = laser(P, q)
     # Measure half-max points
-    # Scan epsilon
+    # Scan epsilon (all 999 offsets in one batched call)
     half = peak / 2
     eps_half = None
-    for ei in range(1, 1000):
-        eps = ei * 0.001
-        i_plus = laser(P, q + eps)
+    eps_grid = [ei * 0.001 for ei in range(1, 1000)]
+    for eps, i_plus in zip(eps_grid, spectrum(P, [q + eps for eps in eps_grid])):
         if i_plus < half:
             eps_half = eps
             break
@@ -1,13 +1,11 @@
-import math, subprocess
+import math, os, sys
 
-def K(x):
-    return 1.0 if abs(x)<1e-14 else math.sin(math.pi*x)/(math.pi*x)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools'))
+import gue_reference
+from zero_catalog import zeta_zeros
 
 # Get more zeros for better statistics
-r = subprocess.run(['gp','-q'],
-    input='Z=lfunzeros(1,600);for(i=1,#Z,printf("%.10f\\n",Z[i]))\n',
-    capture_output=True, text=True, timeout=60)
-zeros = [float(x) for x in r.stdout.strip().split('\n') if x.strip()]
+zeros = zeta_zeros(600).tolist()
 nz = len(zeros)
 print(f"{nz} zeros up to T=600")
 
@@ -21,41 +19,9 @@ print(f"\n=== OVERLAPPING windows (step=0.5*L) ===")
 print(f"{'L':>5} {'nw':>6} {'var_z':>8} {'var_G':>8} {'excess':>8} | {'mu3_z':>10} {'mu3_G':>10} {'diff':>10}")
 
 for L in [0.5, 1.0, 1.5, 2.0, 3.0, 5.0, 8.0, 10.0, 15.0, 20.0]:
-    # GUE predictions
-    nn = min(40, max(15, int(8*L)))
-    dx = L/nn
-    p2 = 0.0
-    for a in range(nn):
-        xa = (a+0.5)*dx
-        for b in range(nn):
-            xb = (b+0.5)*dx
-            p2 += K(xa-xb)**2 * dx**2
-    k2g = L - p2
-
-    # kappa3 for small L only (triple integral expensive)
-    if L <= 5:
-        nn3 = min(20, max(10, int(5*L)))
-        dx3 = L/nn3
-        p3 = 0.0
-        for a in range(nn3):
-            xa = (a+0.5)*dx3
-            for b in range(nn3):
-                xb = (b+0.5)*dx3
-                kab = K(xa-xb)
-                for c in range(nn3):
-                    xc = (c+0.5)*dx3
-                    p3 += kab * K(xb-xc) * K(xc-xa) * dx3**3
-        k3g = L - 3*p2 + 2*p3  # Recompute p2 at same grid... actually use same p2
-        # Need p2 at grid nn3
-        p2_3 = 0.0
-        for a in range(nn3):
-            xa = (a+0.5)*dx3
-            for b in range(nn3):
-                xb = (b+0.5)*dx3
-                p2_3 += K(xa-xb)**2 * dx3**2
-        k3g = L - 3*p2_3 + 2*p3
-    else:
-        k3g = float('nan')
+    # GUE predictions (sine-kernel tables)
+    c = gue_reference.cumulants(L)
+    k2g, k3g = float(c["k2"]), float(c["k3"])
 
     # Zeta: overlapping windows with step = max(0.5, L/4)
     step = max(0.5, L/4)
@@ -1,8 +1,9 @@
-import math, subprocess
+import math, os, sys
 from collections import Counter
 
-def K(x):
-    return 1.0 if abs(x)<1e-14 else math.sin(math.pi*x)/(math.pi*x)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools'))
+import gue_reference
+from zero_catalog import zeta_zeros
 
 # Correct formula: kappa_3 = Tr(K_I^3) = int int int K(x-y)*K(y-z)*K(z-x) dx dy dz
 # (NO factor of 2)
@@ -65,31 +66,10 @@ print()
 
 # Now compute:
 for L in [0.5, 1.0, 2.0, 3.0, 5.0]:
-    nn = 30
-    dx = L/nn
-    # p1 = Tr(K) = integral of K(x,x) = integral of 1 = L
-    p1 = L
-
-    # p2 = Tr(K^2) = int int K(x,y)^2 dx dy
-    p2 = 0.0
-    for a in range(nn):
-        xa = (a+0.5)*dx
-        for b in range(nn):
-            xb = (b+0.5)*dx
-            p2 += K(xa-xb)**2 * dx**2
-
-    # p3 = Tr(K^3) = int int int K(x,y)*K(y,z)*K(z,x) dx dy dz
-    nn3 = min(25, nn)
-    dx3 = L/nn3
-    p3 = 0.0
-    for a in range(nn3):
-        xa = (a+0.5)*dx3
-        for b in range(nn3):
-            xb = (b+0.5)*dx3
-            kab = K(xa-xb)
-            for c in range(nn3):
-                xc = (c+0.5)*dx3
-                p3 += kab * K(xb-xc) * K(xc-xa) * dx3**3
+    # p_j = Tr(K^j) on [0, L] from the sine-kernel tables:
+    # p1 = L, p2 = int int K(x,y)^2, p3 = int int int K(x,y)*K(y,z)*K(z,x)
+    p = gue_reference.traces(L)
+    p1, p2, p3 = float(p["p1"]), float(p["p2"]), float(p["p3"])
 
     k1 = p1
     k2 = p1 - p2  # = Sigma2(L)
@@ -103,9 +83,7 @@ for L in [0.5, 1.0, 2.0, 3.0, 5.0]:
 
 # Get zeta zeros and compare
 print("\n=== Zeta zero comparison ===")
-r = subprocess.run(['gp','-q'], input='Z=lfunzeros(1,300);for(i=1,#Z,printf("%.10f\\n",Z[i]))\n',
-                    capture_output=True, text=True, timeout=30)
-zeros = [float(x) for x in r.stdout.strip().split('\n') if x.strip()]
+zeros = zeta_zeros(300).tolist()
 nz = len(zeros)
 def Ns(t): return t/(2*math.pi)*math.log(t/(2*math.pi*math.e))+7/8
 U = [Ns(z) for z in zeros]
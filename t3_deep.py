@@ -1,54 +1,31 @@
 import math
-import subprocess
+import os
 import re
+import sys
 
-# Sinc kernel for GUE
-def K(x):
-    if abs(x) < 1e-14:
-        return 1.0
-    return math.sin(math.pi * x) / (math.pi * x)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools'))
+import gue_reference
+from zero_catalog import zeta_zeros
 
-# GUE cumulants via numerical integration
-print("=== GUE cumulants (kernel integration, n=25 grid) ===")
+# GUE cumulants from the sine-kernel tables
+print("=== GUE cumulants (sine-kernel tables) ===")
 print(f"{'L':>5}  {'kappa2':>8}  {'kappa3':>10}")
 Lvals = [0.5, 1.0, 1.5, 2.0, 3.0, 5.0]
 gue_k2 = {}
 gue_k3 = {}
 for L in Lvals:
-    nn = 25
-    dx = L / nn
     # kappa2 = L - int int K(x-y)^2 dx dy
-    s2 = 0.0
-    for a in range(nn):
-        xa = (a + 0.5) * dx
-        for b in range(nn):
-            xb = (b + 0.5) * dx
-            s2 += K(xa - xb)**2 * dx**2
-    k2 = L - s2
-
+    k2 = float(gue_reference.sigma2(L))
     # kappa3 = 2 * triple integral of K(a-b)*K(b-c)*K(a-c)
-    s3 = 0.0
-    for a in range(nn):
-        xa = (a + 0.5) * dx
-        for b in range(nn):
-            xb = (b + 0.5) * dx
-            kab = K(xa - xb)
-            for c in range(nn):
-                xc = (c + 0.5) * dx
-                s3 += 2 * kab * K(xb - xc) * K(xa - xc) * dx**3
+    s3 = 2 * float(gue_reference.traces(L)["p3"])
 
     gue_k2[L] = k2
     gue_k3[L] = s3
     print(f"L={L:4.1f}  k2={k2:8.5f}  k3={s3:+10.5f}")
 
 # Now get zeta zeros from PARI/GP
-print("\nGetting zeta zeros from PARI/GP...")
-result = subprocess.run(
-    ['gp', '-q'],
-    input='Z=lfunzeros(1,300);for(i=1,#Z,printf("%.10f\\n",Z[i]))\n',
-    capture_output=True, text=True, timeout=30
-)
-zeros = [float(x) for x in result.stdout.strip().split('\n') if x.strip()]
+print("\nGetting zeta zeros from the zero catalog...")
+zeros = zeta_zeros(300).tolist()
 print(f"Got {len(zeros)} zeros")
 
 # Unfolding: N(T) ~ T/(2pi) * log(T/(2pi*e)) + 7/8
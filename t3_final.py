@@ -1,8 +1,8 @@
 #!/usr/bin/env python3
-import math, sys
+import math, os, sys
 
-def K(x):
-    return 1.0 if abs(x)<1e-14 else math.sin(math.pi*x)/(math.pi*x)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools'))
+import gue_reference
 
 # Read zeros from file
 with open('/data/data/com.termux/files/home/primes-research/z.txt') as f:
@@ -24,21 +24,9 @@ print()
 print("=== GUE kappa2, kappa3 ===")
 gue = {}
 for L in [0.5, 1.0, 2.0, 3.0, 5.0, 10.0]:
-    nn=min(35,max(15,int(8*L))); dx=L/nn
-    p2=sum(K((a-b)*dx)**2*dx**2 for a in range(nn) for b in range(nn))
-    k2 = L-p2
-    if L <= 5:
-        nn3=min(18,max(8,int(4*L))); dx3=L/nn3
-        p3=0; p2b=0
-        for a in range(nn3):
-            for b in range(nn3):
-                kab=K((a-b)*dx3)
-                p2b += kab**2*dx3**2
-                for c in range(nn3):
-                    p3 += kab*K((b-c)*dx3)*K((c-a)*dx3)*dx3**3
-        k3 = L-3*p2b+2*p3
-    else:
-        k3 = None
+    c = gue_reference.cumulants(L)
+    k2 = float(c["k2"])
+    k3 = float(c["k3"])
     gue[L] = (k2, k3)
     k3s = f"{k3:+.6f}" if k3 is not None else "N/A"
     print(f"  L={L:5.1f}  k2={k2:.5f}  k3={k3s}")
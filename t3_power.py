@@ -1,4 +1,4 @@
-import math, subprocess
+import math, os, subprocess, sys
 """
 Statistical power analysis for 3rd cumulant detection.
 
@@ -31,39 +31,17 @@ That can't be right. Let me recheck the GUE formula.
 """
 
 # Let's verify by direct simulation of GUE
-import random
-random.seed(42)
-
-def gue_eigenvalues(N):
-    """Sample eigenvalues of N×N GUE matrix using tridiagonal reduction"""
-    # GUE tridiagonal: diagonal ~ N(0,1), off-diag ~ chi_{n-1}/sqrt(2)
-    # But simplest: direct matrix
-    import cmath
-    # Actually let's just do 2x2 for simplicity
-    # For large N, eigenvalue density is semicircle on [-2sqrt(N), 2sqrt(N)]
-    # Local statistics at the bulk are GUE
-
-    # Simple: Box-Muller for Gaussian
-    def randn():
-        u1 = random.random()
-        u2 = random.random()
-        return math.sqrt(-2*math.log(u1+1e-15))*math.cos(2*math.pi*u2)
-
-    # Generate NxN Hermitian matrix H = (A + A^*)/2 where A has complex Gaussian entries
-    H = [[0.0]*N for _ in range(N)]
-    for i in range(N):
-        H[i][i] = randn()  # diagonal is real N(0,1)
-        for j in range(i+1, N):
-            re = randn() / math.sqrt(2)
-            im = randn() / math.sqrt(2)
-            H[i][j] = re  # for eigenvalue computation we'll use real symmetric
-            H[j][i] = re
-
-    # Eigenvalues via power iteration... too slow for large N
-    # Use numpy if available, else skip
-    return None  # placeholder
-
-# Actually let's not simulate GUE. Instead, let's check: is the formula right?
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools'))
+import gue_reference
+import numpy as np
+from number_variance import window_counts
+from random_matrix import bulk, spectra
+
+def gue_eigenvalues(N, count, seed=42):
+    """Unfolded bulk eigenvalues of count N×N GUE matrices (Dumitriu-Edelman tridiagonal model)"""
+    return bulk(spectra(2, N, count, seed=seed), 0.5)
+
+# First check: is the formula right?
 # For determinantal processes with kernel K:
 # kappa_n = integral of the n-th cluster function T_n
 # T_2(x,y) = -K(x,y)^2  => kappa_2 = -int K^2 < 0 ...
@@ -88,35 +66,25 @@ def gue_eigenvalues(N):
 # Can be positive or negative depending on signs
 
 # Let me just verify numerically what kappa3 should be for L=1
-def K(x):
-    return 1.0 if abs(x)<1e-14 else math.sin(math.pi*x)/(math.pi*x)
-
-# Very fine grid for L=1
+# 2 * int K*K*K and kappa2 over [0, 1] from the sine-kernel tables
 L = 1.0
-nn = 40
-dx = L/nn
-s3 = 0.0
-for a in range(nn):
-    xa = (a+0.5)*dx
-    for b in range(nn):
-        xb = (b+0.5)*dx
-        kab = K(xa-xb)
-        for c in range(nn):
-            xc = (c+0.5)*dx
-            s3 += 2*kab*K(xb-xc)*K(xa-xc)*dx**3
+s3 = 2 * float(gue_reference.traces(L)["p3"])
 print(f"kappa3(L=1) = {s3:.6f}")
 
 # And kappa2
-s2 = 0.0
-for a in range(nn):
-    xa = (a+0.5)*dx
-    for b in range(nn):
-        xb = (b+0.5)*dx
-        s2 += K(xa-xb)**2*dx**2
-k2 = L - s2
+k2 = float(gue_reference.sigma2(L))
 print(f"kappa2(L=1) = {k2:.6f}")
 print(f"sigma = {math.sqrt(k2):.4f}")
 print(f"skewness = kappa3/sigma^3 = {s3/k2**1.5:.4f}")
+print(f"cumulant kappa3 = p1 - 3*p2 + 2*p3 = {float(gue_reference.cumulants(L)['k3']):.6f}")
+
+# Simulated GUE: non-overlapping L=1 windows in the bulk of 2000 matrices of size 200
+c_sim = np.concatenate([window_counts(u, np.arange(u[0], u[-1] - 1.0, 1.0), 1.0)
+                        for u in gue_eigenvalues(200, 2000)])
+d_sim = c_sim - c_sim.mean()
+v_sim, m3_sim = (d_sim**2).mean(), (d_sim**3).mean()
+print(f"GUE simulation ({len(c_sim)} windows): var = {v_sim:.4f} mu3 = {m3_sim:+.5f} "
+      f"skewness = {m3_sim/v_sim**1.5:+.4f}")
 
 # The skewness is huge! This means the distribution is VERY non-Gaussian.
 # For integer-valued counts, this is plausible if the distribution is very peaked.
@@ -1,9 +1,9 @@
 #!/usr/bin/env python3
 """Rate of approach to GUE: how does variance excess depend on T?"""
-import math
+import math, os, sys
 
-def K(x):
-    return 1.0 if abs(x)<1e-14 else math.sin(math.pi*x)/(math.pi*x)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools'))
+import gue_reference
 
 with open('/data/data/com.termux/files/home/primes-research/z.txt') as f:
     zeros = sorted(set(float(line.strip()) for line in f if line.strip()))
@@ -13,9 +13,7 @@ U = [Ns(z) for z in zeros]
 nz = len(U)
 
 # GUE kappa2 at L=1
-nn=30; dx=1.0/nn
-p2=sum(K((a-b)*dx)**2*dx**2 for a in range(nn) for b in range(nn))
-k2_gue = 1.0-p2
+k2_gue = float(gue_reference.sigma2(1.0))
 print(f"GUE Sigma2(L=1) = {k2_gue:.5f}")
 print(f"Poisson var(L=1) = 1.0")
 print()
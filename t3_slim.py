@@ -1,7 +1,7 @@
-import math, subprocess, sys
+import math, os, subprocess, sys
 
-def K(x):
-    return 1.0 if abs(x)<1e-14 else math.sin(math.pi*x)/(math.pi*x)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools'))
+import gue_reference
 
 r = subprocess.run(['gp','-q'],
     input='Z=lfunzeros(1,600);for(i=1,#Z,printf("%.10f\\n",Z[i]))\n',
@@ -15,12 +15,7 @@ U = [Ns(z) for z in zeros]
 
 # Non-overlapping for independence
 for L in [1.0, 2.0, 3.0, 5.0, 10.0, 15.0, 20.0]:
-    nn=min(30,max(15,int(8*L))); dx=L/nn
-    p2=0
-    for a in range(nn):
-        for b in range(nn):
-            p2 += K((a-b)*dx)**2*dx**2
-    k2g = L-p2
+    k2g = float(gue_reference.sigma2(L))
 
     vals=[]
     x=U[0]
@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """Final summary: rate of approach to GUE and 3-point conclusion"""
-import math
+import math, os, sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools'))
+import gue_reference
 
 with open('/data/data/com.termux/files/home/primes-research/z.txt') as f:
     zeros = sorted(set(float(line.strip()) for line in f if line.strip()))
@@ -10,9 +13,7 @@ U = [Ns(z) for z in zeros]
 nz = len(U)
 
 # GUE predictions
-def K(x): return 1.0 if abs(x)<1e-14 else math.sin(math.pi*x)/(math.pi*x)
-nn=30; dx=1.0/nn
-k2_gue_L1 = 1.0-sum(K((a-b)*dx)**2*dx**2 for a in range(nn) for b in range(nn))
+k2_gue_L1 = float(gue_reference.sigma2(1.0))
 
 # Blocks of ~100 zeros for stability
 block=100; L=1.0
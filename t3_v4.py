@@ -1,10 +1,10 @@
 import math
+import os
 import subprocess
+import sys
 
-def K(x):
-    if abs(x) < 1e-14:
-        return 1.0
-    return math.sin(math.pi * x) / (math.pi * x)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools'))
+import gue_reference
 
 # Get zeta zeros
 result = subprocess.run(
@@ -27,7 +27,7 @@ spacings = [U[i+1] - U[i] for i in range(nz-1)]
 mean_sp = sum(spacings) / len(spacings)
 var_sp = sum((s - mean_sp)**2 for s in spacings) / len(spacings)
 print(f"Unfolded spacings: mean={mean_sp:.4f} var={var_sp:.4f}")
-print(f"GUE spacing var should be ~ 0.286")
+print(f"GUE spacing var should be ~ {gue_reference.spacing_moments()[1]:.3f}")
 print(f"Unfolded range: [{U[0]:.2f}, {U[-1]:.2f}]")
 print()
 
@@ -117,33 +117,9 @@ print()
 # NON-OVERLAPPING for better statistics
 print(f"{'L':>5} {'nwin':>5} {'mean':>7} {'var_z':>8} {'mu3_z':>10} {'skew_z':>7} | {'var_G':>8} {'k3_G':>10}")
 for L in [0.5, 1.0, 2.0, 3.0, 5.0, 10.0, 20.0]:
-    # GUE predictions
-    nn = min(30, max(10, int(5*L)))
-    dx = L / nn
-    s2g = 0.0
-    for a in range(nn):
-        xa = (a + 0.5) * dx
-        for b in range(nn):
-            xb = (b + 0.5) * dx
-            s2g += K(xa - xb)**2 * dx**2
-    k2g = L - s2g
-
-    # kappa3 only for small L (triple integral too expensive for large L)
-    if L <= 5:
-        nn3 = min(20, max(8, int(4*L)))
-        dx3 = L / nn3
-        s3g = 0.0
-        for a in range(nn3):
-            xa = (a + 0.5) * dx3
-            for b in range(nn3):
-                xb = (b + 0.5) * dx3
-                kab = K(xa - xb)
-                for c in range(nn3):
-                    xc = (c + 0.5) * dx3
-                    s3g += 2 * kab * K(xb - xc) * K(xa - xc) * dx3**3
-        k3g = s3g
-    else:
-        k3g = float('nan')
+    # GUE predictions: Sigma2 and 2 * int K K K from the sine-kernel tables
+    k2g = float(gue_reference.sigma2(L))
+    k3g = 2 * float(gue_reference.traces(L)["p3"])
 
     # Zeta: non-overlapping
     vals = []
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Arithmetic-function tables up to N (spf, Λ, μ, φ, Ω, ω)
+
+Replaces the trial-division mangoldt/mg, mobius, euler_phi, bigomega and
+distinct_prime_factors copies in the spark_*, inv_s*, ic*, kt* scripts
+with precomputed numpy arrays indexed by n (entries 0 and 1 follow the
+usual conventions: Λ=0, μ(1)=1, φ(1)=1, Ω=ω=0).
+
+Construction: smallest prime factors by a vectorized sieve over
+p <= sqrt(N), then every n is peeled one spf at a time, all n in
+parallel. Each round is one numpy pass and there are at most log2(N)
+rounds, so the whole build is a few dozen array operations instead of
+an O(N) interpreted loop.
+
+Usage:
+  from arith_tables import arith_tables
+  T = arith_tables(10**7, cache=True)     # cache: memory-mapped .npy files
+  T['mangoldt'][n], T['mobius'][n], T['euler_phi'][n], T['bigomega'][n]
+"""
+
+import os
+import sys
+import time
+from math import isqrt
+
+import numpy as np
+
+from prime_store import cache_dir
+from sieve import simple_sieve
+
+NAMES = ('spf', 'mangoldt', 'mobius', 'euler_phi', 'bigomega', 'omega')
+
+
+# =============================================================================
+# BUILD
+# =============================================================================
+
+def spf_table(N):
+    """Smallest prime factor of each n <= N (spf[0] = spf[1] = 0)."""
+    itype = np.uint32 if N < 2**32 else np.uint64
+    spf = np.zeros(N + 1, dtype=itype)
+    for p in simple_sieve(isqrt(N)):
+        p = int(p)
+        block = spf[p*p::p]
+        block[block == 0] = p
+    primes = np.flatnonzero(spf == 0)[2:]          # untouched n >= 2 are prime
+    spf[primes] = primes.astype(itype)
+    return spf
+
+
+def build_tables(N):
+    """All tables in NAMES as a dict of numpy arrays of length N+1."""
+    spf = spf_table(N)
+    itype = spf.dtype
+    mu = np.ones(N + 1, dtype=np.int8)
+    phi = np.ones(N + 1, dtype=itype)
+    big = np.zeros(N + 1, dtype=np.uint8)
+    small = np.zeros(N + 1, dtype=np.uint8)
+    mu[0] = 0
+    phi[0] = 0
+
+    # Peel one smallest prime factor per round from every active n
+    idx = np.arange(2, N + 1, dtype=np.int64)
+    rem = idx.copy()
+    last = np.zeros(len(idx), dtype=np.int64)
+    while len(idx):
+        p = spf[rem].astype(np.int64)
+        repeat = p == last
+        big[idx] += 1
+        small[idx] += (~repeat).astype(np.uint8)
+        mu[idx] = np.where(repeat, 0, -mu[idx])
+        phi[idx] *= np.where(repeat, p, p - 1).astype(itype)
+        rem //= p
+        last = p
+        alive = rem > 1
+        idx, rem, last = idx[alive], rem[alive], last[alive]
+
+    lam = np.zeros(N + 1, dtype=np.float64)
+    pp = np.flatnonzero(small == 1)
+    lam[pp] = np.log(spf[pp].astype(np.float64))
+
+    return {'spf': spf, 'mangoldt': lam, 'mobius': mu, 'euler_phi': phi,
+            'bigomega': big, 'omega': small}
+
+
+# =============================================================================
+# CACHE
+# =============================================================================
+
+def _cache_path(N):
+    return os.path.join(cache_dir(), f"arith_{N}")
+
+
+def arith_tables(N, cache=False):
+    """
+    Tables for 0..N. cache=True stores them as .npy files in the shared
+    cache directory and reopens them memory-mapped (read-only); any
+    cached build with a larger N is reused via slicing.
+    """
+    if not cache:
+        return build_tables(N)
+
+    best = None
+    for name in os.listdir(cache_dir()):
+        if name.startswith("arith_") and name[6:].isdigit():
+            have = int(name[6:])
+            if have >= N and (best is None or have < best):
+                best = have
+    if best is None:
+        # Build into a side directory and rename it: never a half-written cache
+        tmp = _cache_path(N) + ".tmp"
+        os.makedirs(tmp, exist_ok=True)
+        for key, arr in build_tables(N).items():
+            np.save(os.path.join(tmp, key + ".npy"), arr)
+        os.replace(tmp, _cache_path(N))
+        best = N
+    path = _cache_path(best)
+    return {key: np.load(os.path.join(path, key + ".npy"), mmap_mode='r')[:N + 1] for key in NAMES}
+
+
+def mangoldt_table(N, cache=False):
+    """Just Λ(n) for n <= N."""
+    return arith_tables(N, cache)['mangoldt']
+
+
+if __name__ == "__main__":
+    N = int(sys.argv[1]) if len(sys.argv) > 1 else 10**7
+    t0 = time.time()
+    T = arith_tables(N, cache=True)
+    print(f"Tables up to {N:,} in {time.time() - t0:.2f}s")
+    print(f"  Σ Λ(n) = ψ(N) = {T['mangoldt'].sum():.1f}  (N = {N})")
+    print(f"  Σ μ(n) = M(N) = {int(T['mobius'].astype(np.int64).sum())}")
+    print(f"  Σ φ(n) / N² = {T['euler_phi'].astype(np.float64).sum() / N**2:.6f}  (3/π² = {3 / np.pi**2:.6f})")
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Band algebra: C(N), Var and covariances for any subset of zeros
+
+E(x) is linear in the zeros, so on a fixed sample grid
+
+    E_S = Σ_{γ∈S} K[:, γ],   K[x, γ] = -2 Re x^{1/2+iγ}/(1/2+iγ)
+
+and the closed-form null variance (null_model) is a per-zero sum as
+well. BandAlgebra computes the contribution matrix K once; after that
+
+  - a subset costs one masked row sum, O(samples · |S|), or O(samples)
+    from cached band vectors;
+  - all 2^k - 1 unions of k bands come from the k × k band covariance
+    matrix: Var(S) = 1ᵀ Σ_S 1, null(S) = Σ_{b∈S} null_b;
+  - sliding windows of w consecutive zeros are differences of prefix
+    sums over the zero axis.
+
+C here always uses the closed-form null, which is exact in the
+trials → ∞ limit and additive over zeros; use null_model.cancellation
+for a sampled null with a confidence interval.
+
+Usage:
+  from band_algebra import BandAlgebra
+  ba = BandAlgebra(ZEROS, log_grid(10000, 200))
+  bands = ba.bands([0, 50, 100, 150, 200, np.inf])     # by γ edges
+  ba.C(bands[0]), ba.cov(bands[0], bands[2])
+  ba.subsets(bands)          # {(0,), (1,), ..., (0, 1, 2, 3, 4)}: C
+  starts, C = ba.windows(50)
+"""
+
+from itertools import combinations
+
+import numpy as np
+
+from explicit_formula import BLOCK, weights
+from null_model import null_var_terms
+
+
+class BandAlgebra:
+    """
+    Per-zero contribution vectors of E(x) on one sample grid.
+
+    per_point selects the null model of null_model (fresh phases at
+    every x, as in band_analysis) for C.
+    """
+
+    def __init__(self, zeros, xs, per_point=False, block=BLOCK):
+        self.gammas = np.asarray(zeros, dtype=np.float64)
+        self.xs = np.asarray(xs, dtype=np.float64)
+        self.per_point = per_point
+        a, b = weights(self.gammas)
+        L = np.log(self.xs)
+        rt = -2 * np.sqrt(self.xs)[:, None]
+        self.K = np.empty((len(self.xs), len(self.gammas)))
+        step = max(1, block // max(len(self.xs), 1))
+        for j in range(0, len(self.gammas), step):
+            th = np.outer(L, self.gammas[j:j + step])
+            self.K[:, j:j + step] = rt * (np.cos(th)*a[j:j + step] - np.sin(th)*b[j:j + step])
+        self.null_terms = null_var_terms(self.gammas, self.xs, per_point)
+        self._prefix = None
+
+    # -------------------------------------------------------------------------
+    # Subsets
+    # -------------------------------------------------------------------------
+
+    def mask(self, zeros):
+        """Boolean mask of the given γ values (must be among self.gammas)."""
+        return np.isin(self.gammas, zeros)
+
+    def bands(self, edges):
+        """Masks for lo <= γ < hi between consecutive edges."""
+        return [(self.gammas >= lo) & (self.gammas < hi) for lo, hi in zip(edges[:-1], edges[1:])]
+
+    def vector(self, sel=slice(None)):
+        """E over the sample grid from the zeros in sel (mask, index or slice)."""
+        return self.K[:, sel].sum(axis=1)
+
+    def var(self, sel=slice(None)):
+        return float(np.var(self.vector(sel)))
+
+    def null(self, sel=slice(None)):
+        """Closed-form null variance of the subset."""
+        return float(self.null_terms[sel].sum())
+
+    def cov(self, sel_i, sel_j):
+        """Population covariance over x of the two subsets' E."""
+        ei, ej = self.vector(sel_i), self.vector(sel_j)
+        return float(np.mean((ei - ei.mean()) * (ej - ej.mean())))
+
+    def C(self, sel=slice(None)):
+        n = self.null(sel)
+        return self.var(sel) / n if n > 0 else 0.0
+
+    # -------------------------------------------------------------------------
+    # Many subsets at once
+    # -------------------------------------------------------------------------
+
+    def band_stats(self, bands):
+        """(k × k covariance matrix, per-band null) for a list of k masks."""
+        V = np.stack([self.vector(b) for b in bands], axis=1)
+        V = V - V.mean(axis=0)
+        return V.T @ V / len(self.xs), np.array([self.null(b) for b in bands])
+
+    def subsets(self, bands, min_size=1):
+        """C for every union of at least min_size bands, keyed by band-index tuple."""
+        cov, null = self.band_stats(bands)
+        out = {}
+        for r in range(min_size, len(bands) + 1):
+            for S in combinations(range(len(bands)), r):
+                idx = list(S)
+                n = null[idx].sum()
+                out[S] = float(cov[np.ix_(idx, idx)].sum() / n) if n > 0 else 0.0
+        return out
+
+    def windows(self, width, step=1):
+        """
+        C for every window of `width` consecutive zeros.
+
+        Returns (start indices, C values).
+        """
+        if self._prefix is None:
+            P = np.zeros((len(self.xs), len(self.gammas) + 1))
+            np.cumsum(self.K, axis=1, out=P[:, 1:])
+            self._prefix = P, np.concatenate([[0.0], np.cumsum(self.null_terms)])
+        P, Pn = self._prefix
+        starts = np.arange(0, len(self.gammas) - width + 1, step)
+        E = P[:, starts + width] - P[:, starts]
+        n = Pn[starts + width] - Pn[starts]
+        return starts, np.where(n > 0, np.var(E, axis=0) / np.where(n > 0, n, 1), 0.0)
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+    import time
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from explicit_formula import explicit_sum, log_grid
+    from null_model import expected_null_var
+    from zeros_500 import ZEROS
+
+    xs = log_grid(10000, 200)
+    t0 = time.time()
+    ba = BandAlgebra(ZEROS, xs, per_point=True)
+    bands = ba.bands([0, 50, 100, 150, 200, np.inf])
+    t1 = time.time()
+    C = ba.subsets(bands)
+    t2 = time.time()
+    S = bands[0] | bands[2] | bands[4]
+    ref = np.var(explicit_sum(xs, ba.gammas[S])) / expected_null_var(ba.gammas[S], xs, True)
+    print(f"K {ba.K.shape} in {1000*(t1-t0):.0f} ms; all {len(C)} band unions in "
+          f"{1000*(t2-t1):.1f} ms; C(B1+B3+B5) = {C[(0, 2, 4)]:.4f} (direct {ref:.4f})")
+    t0 = time.time()
+    starts, Cw = ba.windows(50)
+    print(f"{len(starts)} sliding 50-zero windows in {1000*(time.time()-t0):.1f} ms, "
+          f"C range [{Cw.min():.3f}, {Cw.max():.3f}]")
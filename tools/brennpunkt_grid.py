@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Brennpunkt backscatter over a whole (t, λ) grid
+
+    B(t, λ) = |Σ_n exp(i·4πλ·x_n(t))|² / c²
+
+where x_n(t) is the focused position of n/N under one of the radial
+maps of exp12_fast.py (geo, arith, harm, quad, repulsive). Two phase
+geometries cover the existing scripts:
+
+  'z'   x = 1 - 2·r_t, n/N < cutoff skipped       (exp12_fast, nstable, fine_scan)
+  'rz'  x = r_t · clip(1 - 2n/N), nothing skipped  (investigate_brennpunkt)
+
+Rows (one t each) are computed as bounded outer products over λ and
+streamed by iter_rows(), optionally farmed out to a process pool, so a
+1000×1000 grid never holds more than BLOCK trig values per worker.
+
+Usage:
+  from brennpunkt_grid import ratio_surface
+  bp, bc, ratio = ratio_surface(P, C, N, ts, lams, mode='geo')
+"""
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+MODES = ('geo', 'arith', 'harm', 'quad', 'repulsive', 'none')
+BLOCK = 1 << 22         # trig values per block (~32 MB of float64)
+
+
+# =============================================================================
+# GEOMETRY
+# =============================================================================
+
+def radial(r, t, mode='geo', R=0.5):
+    """Focused radius r_t for an array of r = n/N (vectorized exp12_fast modes)."""
+    r = np.asarray(r, dtype=np.float64)
+    if mode == 'geo':
+        return r**(1 - 2*t) * R**(2*t)
+    if mode == 'arith':
+        return (1 - t)*r + t*R
+    if mode == 'harm':
+        with np.errstate(divide='ignore'):
+            return np.where(r > 1e-10, 1.0 / ((1 - t)/r + t/R), r)
+    if mode == 'quad':
+        return np.sqrt((1 - t)*r*r + t*R*R)
+    if mode == 'repulsive':
+        return np.clip(r**(1 + 2*t) * R**(-2*t), 0.001, 10)
+    if mode == 'none':
+        return r
+    raise ValueError(f"unknown mode {mode!r}; expected one of {MODES}")
+
+
+def positions(nums, N, t, mode='geo', R=0.5, geometry='z', cutoff=0.01):
+    """x_n(t) for every n that takes part (see module docstring)."""
+    n = np.asarray(nums, dtype=np.float64)
+    if geometry == 'z':
+        r = n / N
+        r = r[r >= cutoff]
+        return 1 - 2*radial(r, t, mode, R)
+    if geometry == 'rz':
+        r = np.maximum(n / N, 1e-10)
+        r = r[r >= cutoff] if cutoff > 0 else r
+        z = np.clip(1 - 2*r, -1, 1)
+        return radial(r, t, mode, R) * z
+    raise ValueError(f"unknown geometry {geometry!r}; expected 'z' or 'rz'")
+
+
+# =============================================================================
+# ROWS
+# =============================================================================
+
+def backscatter_row(nums, N, t, lams, mode='geo', R=0.5, geometry='z', cutoff=0.01,
+                    norm='used', block=BLOCK):
+    """
+    B(t, λ) for one t and every λ in lams.
+
+    norm='used' divides by the number of n that passed the cutoff
+    (exp12_fast, nstable); norm='all' by len(nums) (fine_scan,
+    investigate_brennpunkt).
+    """
+    x = positions(nums, N, t, mode, R, geometry, cutoff)
+    lams = np.asarray(lams, dtype=np.float64)
+    c = len(x) if norm == 'used' else len(nums)
+    if c == 0:
+        return np.zeros(len(lams))
+    ar = np.zeros(len(lams))
+    ai = np.zeros(len(lams))
+    step = max(1, block // max(len(lams), 1))
+    for i in range(0, len(x), step):
+        ph = 4 * math.pi * np.outer(lams, x[i:i + step])
+        ar += np.cos(ph).sum(axis=1)
+        ai += np.sin(ph).sum(axis=1)
+    return (ar*ar + ai*ai) / (c*c)
+
+
+def _row_task(args):
+    sets, N, t, lams, kw = args
+    return t, [backscatter_row(nums, N, t, lams, **kw) for nums in sets]
+
+
+def iter_rows(sets, N, ts, lams, workers=1, **kw):
+    """
+    Yield (t, [row for each number set]) in t order.
+
+    sets: list of number sets (e.g. [P, C]); kw as for backscatter_row.
+    workers > 1 spreads rows over a process pool.
+    """
+    sets = [np.asarray(s) for s in sets]
+    lams = np.asarray(lams, dtype=np.float64)
+    tasks = ((sets, N, float(t), lams, kw) for t in ts)
+    if workers == 1:
+        yield from map(_row_task, tasks)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_row_task, tasks, chunksize=8)
+
+
+def ratio_surface(P, C, N, ts, lams, workers=1, eps=1e-10, **kw):
+    """
+    Full P, C and P/C surfaces, shape (len(ts), len(lams)).
+
+    The ratio is 0 where C's backscatter is below eps, as in the
+    original scans.
+    """
+    bp = np.empty((len(ts), len(lams)))
+    bc = np.empty((len(ts), len(lams)))
+    for i, (_, (rp, rc)) in enumerate(iter_rows([P, C], N, ts, lams, workers, **kw)):
+        bp[i] = rp
+        bc[i] = rc
+    ratio = np.where(bc > eps, bp / np.where(bc > eps, bc, 1), 0.0)
+    return bp, bc, ratio
+
+
+def best_t(ts, surface, cap=1e6):
+    """Per-λ argmax over t (values >= cap ignored, as in the scalar scans)."""
+    s = np.where(surface < cap, surface, 0.0)
+    i = np.argmax(s, axis=0)
+    return np.asarray(ts)[i], s[i, np.arange(s.shape[1])]
+
+
+if __name__ == "__main__":
+    import time
+    from sieve import simple_sieve
+
+    N = 1000
+    P = simple_sieve(N)
+    pset = set(P.tolist())
+    C = np.array([n for n in range(4, N + 1) if n not in pset])
+    ts = np.linspace(0.01, 0.49, 400)
+    lams = np.arange(2, 60)
+    t0 = time.time()
+    bp, bc, ratio = ratio_surface(P, C, N, ts, lams)
+    print(f"{len(ts)}×{len(lams)} grid, P and C, in {time.time() - t0:.2f}s")
+    bt, br = best_t(ts, ratio)
+    for lam, t, r in zip(lams[:12], bt[:12], br[:12]):
+        print(f"  λ={lam:>3}: t={t:.3f} P/C={r:.1f}x")
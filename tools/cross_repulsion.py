@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 """Test: do zeros from different L-functions repel less than same-family zeros?"""
 
-from mpmath import mp, zetazero, dirichlet, fmul
+from mpmath import mp, dirichlet, fmul
+
+from zero_catalog import zeta_first
 mp.dps = 25
 
 def dirichlet_zeros_chi4(n):
@@ -26,7 +28,7 @@ def dirichlet_zeros_chi4(n):
 
 def zeta_zeros(n):
     """First n zeros of Riemann zeta"""
-    return [float(zetazero(k).imag) for k in range(1, n+1)]
+    return zeta_first(n).tolist()
 
 def within_family_spacings(zeros):
     """Consecutive spacings within one L-function, normalized"""
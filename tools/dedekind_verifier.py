@@ -8,11 +8,19 @@ compares to measured variance, flags anomalies.
 Usage:
   python3 dedekind_verifier.py          # Run built-in tests
   python3 dedekind_verifier.py check    # Interactive mode
+  python3 dedekind_verifier.py batch polys.txt A4 40   # file, group, height
+  python3 dedekind_verifier.py batch box 4 10 A4       # all quartics, |c_k| <= 10
 """
 
+import json
 import math
-import subprocess
+import os
 import sys
+import time
+from concurrent.futures import as_completed
+
+from gp_pool import GPError, gp_pool
+from zero_catalog import dedekind_label
 
 # =============================================================================
 # THEORETICAL PREDICTIONS
@@ -166,9 +174,14 @@ def euler_phi(n):
 # MEASUREMENT (via PARI/GP)
 # =============================================================================
 
+# Normalized spacing variance, defined once per pooled gp worker
+SVAR = ("svar(z)={my(s,m,n);if(#z<3,return(-1));s=vector(#z-1,i,z[i+1]-z[i]);"
+        "m=vecsum(s)/#s;n=vector(#s,i,s[i]/m);vecsum(vector(#n,i,(n[i]-1)^2))/#n}")
+
 def measure_variance_gp(field_poly, height=50):
     """
-    Compute Dedekind zeta zeros and measure spacing variance using PARI/GP.
+    Compute Dedekind zeta zeros and measure spacing variance using PARI/GP
+    (shared gp_pool: the field's L-function is created once per worker).
 
     field_poly: polynomial defining the field, e.g., "x^2-2" for Q(√2)
     height: compute zeros up to this height
@@ -176,39 +189,16 @@ def measure_variance_gp(field_poly, height=50):
     Returns: (variance, n_zeros, zeros_list) or (None, 0, []) on error
     """
 
-    gp_code = f'''
-    v(z)={{my(s,m,n);if(#z<3,return(-1));s=vector(#z-1,i,z[i+1]-z[i]);m=vecsum(s)/#s;n=vector(#s,i,s[i]/m);vecsum(vector(#n,i,(n[i]-1)^2))/#n}}
-    K=nfinit({field_poly});
-    z=lfunzeros(lfuncreate(K),{height});
-    print("NZEROS:",#z);
-    print("VAR:",precision(v(z),6));
-    for(i=1,min(10,#z),print("Z:",precision(z[i],6)));
-    '''
-
+    pool = gp_pool()
+    if SVAR not in pool.defs:
+        pool.define(SVAR)
     try:
-        result = subprocess.run(
-            ['gp', '-q', '-f'],
-            input=gp_code.encode(),
-            capture_output=True,
-            timeout=60
-        )
-        output = result.stdout.decode()
-
-        n_zeros = 0
-        variance = None
-        zeros = []
-
-        for line in output.strip().split('\n'):
-            if line.startswith('NZEROS:'):
-                n_zeros = int(line.split(':')[1])
-            elif line.startswith('VAR:'):
-                variance = float(line.split(':')[1])
-            elif line.startswith('Z:'):
-                zeros.append(float(line.split(':')[1]))
-
-        return variance, n_zeros, zeros
-
-    except Exception as e:
+        z = pool.run(f"z=lfunzeros(L,{height});[#z,svar(z),z[1..min(10,#z)]]",
+                     label=dedekind_label(field_poly), timeout=60)
+        n_zeros, variance, zeros = z
+        return float(variance), n_zeros, zeros
+
+    except GPError as e:
         print(f"  GP error: {e}")
         return None, 0, []
 
@@ -281,6 +271,197 @@ def verify_field(field_desc, field_poly, height=50, tolerance=0.15):
     }
 
 
+# =============================================================================
+# BATCH MODE
+# =============================================================================
+
+CLASSIFY_CHUNK = 200          # polynomials per polgalois job
+CACHE_FILE = "dedekind_var.jsonl"
+GALOIS_FILE = "dedekind_galois.jsonl"
+
+# Per polynomial: 0 if reducible or unclassifiable, else [polredabs, degree,
+# Galois order, group name, abelian]. polgalois needs galdata beyond degree 7;
+# Galois fields fall back to galoisinit (name = small-group id), which also
+# decides abelian-ness (order == degree alone admits S3 on 6 points, D4, Q8 ...)
+GCLASS = ("gclass(p)=my(g,G);if(!polisirreducible(p),return(0));"
+          "g=iferr(polgalois(p),E,0);G=iferr(galoisinit(p),E,0);if(!g&&!G,return(0));"
+          "[Str(polredabs(p)),poldegree(p),if(g,g[1],poldegree(p)),"
+          "if(g,g[4],Str(galoisidentify(G))),if(G,galoisisabelian(G)!=0,0)]")
+
+# Transitive groups whose permutation character is 1 + one irreducible
+DOUBLY_TRANSITIVE = {"S3", "S4", "A4", "S5", "A5", "S6", "A6", "S7", "A7"}
+
+
+def poly_box(degree, bound, terms=None):
+    """
+    Monic x^degree + Σ c_k x^k with |c_k| <= bound for k in terms
+    (default: all lower exponents), c_0 != 0, as GP strings.
+    """
+    from itertools import product
+
+    terms = sorted(terms if terms is not None else range(degree), reverse=True)
+    for cs in product(range(-bound, bound + 1), repeat=len(terms)):
+        if dict(zip(terms, cs)).get(0, 1) == 0:
+            continue
+        yield f"x^{degree}" + "".join(f"{c:+d}" + ("*x" if k else "") + (f"^{k}" if k > 1 else "")
+                                      for k, c in zip(terms, cs) if c)
+
+
+def polys_from_file(path):
+    """One GP polynomial per line; blank lines and #-comments skipped."""
+    with open(path) as f:
+        for line in f:
+            line = line.split("#")[0].strip()
+            if line:
+                yield line
+
+
+def classify(polys, pool, cache=None):
+    """
+    (canonical polredabs poly, degree, Galois order, group name, abelian) per
+    polynomial, or None if reducible / not classifiable. Chunked over the
+    pool; results are cached by input polynomial, so a rerun only sends
+    the new ones to GP.
+    """
+    cache = cache or GaloisCache()
+    if GCLASS not in pool.defs:
+        pool.define(GCLASS)
+    polys = list(polys)
+    todo = list(dict.fromkeys(p for p in polys if cache.get(p) is None))
+    futs = []
+    for i in range(0, len(todo), CLASSIFY_CHUNK):
+        chunk = todo[i:i + CLASSIFY_CHUNK]
+        futs.append((chunk, pool.submit(
+            f"my(P=[{','.join(chunk)}]);vector(#P,i,iferr(gclass(P[i]),E,0))")))
+    for chunk, f in futs:
+        cache.put_many([dict(poly=p, field=None if r == 0 else [r[0], r[1], r[2], r[3], bool(r[4])])
+                        for p, r in zip(chunk, f.result())])
+    return [None if cache.get(p)["field"] is None else tuple(cache.get(p)["field"]) for p in polys]
+
+
+def galois_prediction(degree, order, name, abelian):
+    """Predicted variance from the Galois group of a degree-n field (rough, as analyze_field)."""
+    if abelian:
+        return predict_variance("abelian", degree, False)[0], f"{name}: {degree} abelian factors"
+    if name in DOUBLY_TRANSITIVE:
+        return predict_variance("non-abelian", 2, True)[0], f"{name}: ζ × L(ρ), induction coupling"
+    return predict_variance("non-abelian", 3, True)[0], f"{name}: ≥ 3 factors, partial induction coupling"
+
+
+class _JsonlCache:
+    """Append-only JSON-lines cache in the shared cache directory, keyed by KEY fields."""
+
+    FILE, KEY = None, ()
+
+    def __init__(self, path=None):
+        from prime_store import cache_dir
+        self.path = path or os.path.join(cache_dir(), self.FILE)
+        self.entries = {}
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                for line in f:
+                    e = json.loads(line)
+                    self.entries[tuple(e[k] for k in self.KEY)] = e
+
+    def get(self, *key):
+        return self.entries.get(key)
+
+    def put(self, entry):
+        self.put_many([entry])
+
+    def put_many(self, entries):
+        for e in entries:
+            self.entries[tuple(e[k] for k in self.KEY)] = e
+        with open(self.path, "a") as f:
+            f.writelines(json.dumps(e) + "\n" for e in entries)
+
+
+class VarianceCache(_JsonlCache):
+    """Measured variances by (polredabs poly, height)."""
+
+    FILE, KEY = CACHE_FILE, ("poly", "height")
+
+
+class GaloisCache(_JsonlCache):
+    """classify() results by input polynomial (field None if not classifiable)."""
+
+    FILE, KEY = GALOIS_FILE, ("poly",)
+
+
+def verify_batch(polys, groups=None, height=40, tolerance=0.15, workers=None, cache=None,
+                 galois_cache=None, verbose=True):
+    """
+    Verify many fields: polgalois filter (groups: names or orders to keep,
+    None for all), dedupe by polredabs, then lfunzeros + svar for the
+    survivors on a worker pool. Classifications and measured variances
+    are cached, so an interrupted census resumes where it stopped.
+
+    Returns a list of result dicts (poly, galois, predicted, measured,
+    n_zeros, status).
+    """
+    cache = cache or VarianceCache()
+    pool = gp_pool(workers)
+    if SVAR not in pool.defs:
+        pool.define(SVAR)
+    polys = list(polys)
+    t0 = time.time()
+    fields = {}
+    for c in classify(polys, pool, galois_cache):
+        if c is not None and (groups is None or c[3] in groups or c[2] in groups):
+            fields.setdefault(c[0], c)
+    todo = [c for c in fields.values() if cache.get(c[0], height) is None]
+    if verbose:
+        print(f"{len(polys)} polynomials -> {len(fields)} fields after polgalois/polredabs "
+              f"({time.time() - t0:.1f}s); {len(fields) - len(todo)} cached, {len(todo)} to compute")
+
+    futs = {pool.submit(f"z=lfunzeros(L,{height});[#z,svar(z)]", label=dedekind_label(c[0])): c
+            for c in todo}
+    for k, f in enumerate(as_completed(futs), 1):
+        canon, _, order, name, _ = futs[f]
+        try:
+            n_zeros, var = f.result()
+            var = float(var)
+        except GPError as e:
+            n_zeros, var = 0, None
+            if verbose:
+                print(f"  {canon}: GP error: {e}")
+        cache.put(dict(poly=canon, height=height, order=order, galois=name, n_zeros=n_zeros, var=var))
+        if verbose and k % 50 == 0:
+            print(f"  {k}/{len(todo)} fields ({time.time() - t0:.0f}s)", flush=True)
+
+    results = []
+    for canon, degree, order, name, abelian in fields.values():
+        e = cache.get(canon, height)
+        predicted, reason = galois_prediction(degree, order, name, abelian)
+        measured = e["var"]
+        if measured is None or measured < 0:
+            status = "ERROR"
+        else:
+            status = "PASS" if abs(measured - predicted) / predicted <= tolerance else "FAIL"
+        results.append(dict(poly=canon, galois=name, predicted=predicted, reason=reason,
+                            measured=measured, n_zeros=e["n_zeros"], status=status))
+    return results
+
+
+def run_batch(args):
+    """batch <file | box DEG BOUND> [GROUP] [HEIGHT]"""
+    if args[0] == "box":
+        polys, rest = poly_box(int(args[1]), int(args[2])), args[3:]
+    else:
+        polys, rest = polys_from_file(args[0]), args[1:]
+    groups = {rest[0]} if rest else None
+    height = float(rest[1]) if len(rest) > 1 else 40
+
+    results = verify_batch(polys, groups, height)
+    print(f"\n{'Field':<28} {'Galois':>6} {'Zeros':>6} {'Predicted':>10} {'Measured':>10} {'Status':>8}")
+    print("-"*73)
+    for r in sorted(results, key=lambda r: (r['galois'], r['poly'])):
+        meas = f"{r['measured']:.3f}" if r['measured'] is not None else "?"
+        print(f"{r['poly']:<28} {r['galois']:>6} {r['n_zeros']:>6} {r['predicted']:>10.3f} {meas:>10} {r['status']:>8}")
+    by_status = {s: sum(1 for r in results if r['status'] == s) for s in ("PASS", "FAIL", "ERROR")}
+    print(f"\n{len(results)} fields: " + ", ".join(f"{v} {k}" for k, v in by_status.items()))
+
+
 # =============================================================================
 # MAIN
 # =============================================================================
@@ -351,5 +532,7 @@ def interactive_mode():
 if __name__ == "__main__":
     if len(sys.argv) > 1 and sys.argv[1] == "check":
         interactive_mode()
+    elif len(sys.argv) > 2 and sys.argv[1] == "batch":
+        run_batch(sys.argv[2:])
     else:
         run_builtin_tests()
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Streaming elliptic-curve anomaly scanner over coefficient boxes
+
+anomaly_scan.gp, ec_rank.gp and rank_detector.gp run full lfunzeros on
+every curve of a hand-written list and only print the results. Here a
+whole box of Weierstrass coefficients [a1, a2, a3, a4, a6] is scanned
+in three stages, cheapest first:
+
+  1. numpy: invariants c4, c6, Δ for the whole box; singular curves are
+     dropped and isomorphic curves collapse to one, keyed by (c4, c6)
+     with every d^4, d^6 divided out (the same classes as the minimal
+     model / j-invariant + twist, without calling GP);
+  2. gp_pool, chunked: conductor, root number and L(E, 1) -> a rank
+     proxy (1 if w = -1, else 0 or 2 by whether L(E, 1) vanishes);
+  3. gp_pool, per curve: lfunzeros up to `height` for the survivors of
+     max_conductor / min_rank, then spacing variance and skew.
+
+Every curve lands in an append-only columnar table (one raw file per
+column, committed row count in a JSON header), stage-2 columns NaN for
+curves that stopped at stage 1. Rows carry their isomorphism key
+(k4, k6); rerunning a scan, of the same or an overlapping box, skips
+classes already in the table, so a 10^5-curve box is one resumable
+command. The table lives in ec_scan/ in the shared cache directory
+unless --out names another one.
+
+Usage:
+  python3 ec_scan.py --a4 -30 30 --a6 -30 30 --max-conductor 2000 --workers 8
+  python3 ec_scan.py --report                   # anomalies in the default table
+
+  from ec_scan import ColumnFile, default_out, report
+  t = ColumnFile(default_out()).read()          # dict of numpy columns
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import as_completed
+from itertools import product
+
+import numpy as np
+
+from gp_pool import GPError, gp_pool
+
+CHUNK = 500             # curves per stage-1 GP job
+L1_EPS = 1e-8           # |L(E, 1)| below this counts as a zero
+ANOMALY_SIGMA = 1.5     # as anomaly_scan.gp
+
+COLUMNS = [("a1", "i8"), ("a2", "i8"), ("a3", "i8"), ("a4", "i8"), ("a6", "i8"),
+           ("k4", "i8"), ("k6", "i8"), ("conductor", "i8"), ("rootno", "i1"), ("L1", "f8"), ("rank", "i1"),
+           ("n_zeros", "i4"), ("z1", "f8"), ("var", "f8"), ("skew", "f8")]
+
+
+# =============================================================================
+# COLUMNAR OUTPUT
+# =============================================================================
+
+class ColumnFile:
+    """
+    Append-only columnar table: <path>/<column>.bin raw arrays plus
+    meta.json with dtypes and the committed row count. A torn append
+    (crash between column writes) is invisible: rows past the count
+    are overwritten by the next append.
+    """
+
+    def __init__(self, path, columns=COLUMNS):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.meta_path = os.path.join(path, "meta.json")
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path) as f:
+                self.meta = json.load(f)
+        else:
+            self.meta = {"columns": [list(c) for c in columns], "rows": 0}
+        self.dtypes = {name: np.dtype(dt) for name, dt in self.meta["columns"]}
+
+    @property
+    def rows(self):
+        return self.meta["rows"]
+
+    def _file(self, name):
+        return os.path.join(self.path, name + ".bin")
+
+    def append(self, cols):
+        n = len(next(iter(cols.values())))
+        if n == 0:
+            return
+        for name, dt in self.dtypes.items():
+            a = np.asarray(cols[name], dtype=dt)
+            with open(self._file(name), "ab" if os.path.exists(self._file(name)) else "wb") as f:
+                f.truncate(self.rows * dt.itemsize)
+                f.seek(self.rows * dt.itemsize)
+                f.write(a.tobytes())
+        self.meta["rows"] += n
+        tmp = self.meta_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.meta, f)
+        os.replace(tmp, self.meta_path)
+
+    def column(self, name):
+        if self.rows == 0:
+            return np.empty(0, self.dtypes[name])
+        return np.memmap(self._file(name), dtype=self.dtypes[name], mode="r", shape=(self.rows,))
+
+    def read(self):
+        return {name: np.array(self.column(name)) for name in self.dtypes}
+
+
+# =============================================================================
+# STAGE 0: BOX, INVARIANTS, ISOMORPHISM CLASSES
+# =============================================================================
+
+def curve_box(a4, a6, a1=(0, 1), a2=(-1, 0, 1), a3=(0, 1)):
+    """
+    (n, 5) int64 array of [a1, a2, a3, a4, a6]; a4, a6 are (lo, hi)
+    inclusive ranges, a1, a2, a3 value lists (default: the reduced
+    ranges every curve over Q has a model in).
+    """
+    rows = product(a1, a2, a3, range(a4[0], a4[1] + 1), range(a6[0], a6[1] + 1))
+    return np.array(list(rows), dtype=np.int64).reshape(-1, 5)
+
+
+def invariants(A):
+    """c4, c6, Δ for each row (int64: exact for |a4|, |a6| up to ~10^5)."""
+    a1, a2, a3, a4, a6 = A.T
+    b2 = a1*a1 + 4*a2
+    b4 = 2*a4 + a1*a3
+    b6 = a3*a3 + 4*a6
+    b8 = a1*a1*a6 + 4*a2*a6 - a1*a3*a4 + a2*a3*a3 - a4*a4
+    c4 = b2*b2 - 24*b4
+    c6 = -b2**3 + 36*b2*b4 - 216*b6
+    disc = -b2*b2*b8 - 8*b4**3 - 27*b6*b6 + 9*b2*b4*b6
+    return c4, c6, disc
+
+
+def iso_key(c4, c6):
+    """
+    (c4, c6) with the largest d, d^4 | c4 and d^6 | c6, divided out:
+    equal exactly for Q-isomorphic curves (c4' = u^4 c4, c6' = u^6 c6).
+    """
+    c4, c6 = c4.copy(), c6.copy()
+    if len(c4) == 0:
+        return c4, c6
+    bound = int(max(np.abs(c4).max() ** 0.25, np.abs(c6).max() ** (1/6))) + 1
+    for p in range(2, bound + 1):
+        if any(p % q == 0 for q in range(2, int(p**0.5) + 1)):
+            continue
+        p4, p6 = p**4, p**6
+        while True:
+            m = (c4 % p4 == 0) & (c6 % p6 == 0) & ((c4 != 0) | (c6 != 0))
+            if not m.any():
+                break
+            c4[m] //= p4
+            c6[m] //= p6
+    return c4, c6
+
+
+def class_keys(A):
+    """(n, 2) iso_key of each row of A."""
+    c4, c6, _ = invariants(A)
+    return np.stack(iso_key(c4, c6), axis=1)
+
+
+def distinct_curves(A):
+    """Nonsingular rows of A, one per isomorphism class (first in box order)."""
+    c4, c6, disc = invariants(A)
+    A = A[disc != 0]
+    k4, k6 = iso_key(c4[disc != 0], c6[disc != 0])
+    _, first = np.unique(np.stack([k4, k6], axis=1), axis=0, return_index=True)
+    return A[np.sort(first)]
+
+
+# =============================================================================
+# STAGES 1-2: GP
+# =============================================================================
+
+def _vec(c):
+    return "[" + ",".join(str(int(x)) for x in c) + "]"
+
+
+def cheap_stats(pool, curves):
+    """Futures of [[conductor, root number, L(E,1) or 0], ...] per CHUNK of curves."""
+    futs = []
+    for i in range(0, len(curves), CHUNK):
+        C = ",".join(_vec(c) for c in curves[i:i + CHUNK])
+        futs.append((i, pool.submit(
+            f"my(C=[{C}]);vector(#C,i,my(E=ellinit(C[i]),w=ellrootno(E));"
+            f"[ellglobalred(E)[1],w,if(w>0,ellL1(E),0.)])")))
+    return futs
+
+
+def rank_proxy(rootno, L1):
+    return np.where(rootno < 0, 1, np.where(np.abs(L1) > L1_EPS, 0, 2))
+
+
+def spacing_stats(z):
+    """Normalized spacing variance and skew, as svar / sskew in anomaly_scan.gp."""
+    if len(z) < 5:
+        return np.nan, np.nan
+    s = np.diff(z)
+    n = s / s.mean()
+    var = float(np.mean((n - 1)**2))
+    std = np.sqrt(var)
+    return var, (float(np.mean(((n - 1)/std)**3)) if std >= 0.001 else 0.0)
+
+
+def _rows(curves, cheap, zeros=None):
+    cond, w, L1 = (np.array(c, dtype=np.float64) for c in zip(*cheap)) if len(cheap) else ([], [], [])
+    cols = {k: curves[:, j] for j, k in enumerate(("a1", "a2", "a3", "a4", "a6"))}
+    cols.update(zip(("k4", "k6"), class_keys(curves).T))
+    cols.update(conductor=np.asarray(cond, dtype=np.int64), rootno=w, L1=L1,
+                rank=rank_proxy(np.asarray(w), np.asarray(L1)))
+    n = len(curves)
+    if zeros is None:
+        cols.update(n_zeros=np.full(n, -1), z1=np.full(n, np.nan), var=np.full(n, np.nan),
+                    skew=np.full(n, np.nan))
+    else:
+        stats = [spacing_stats(np.asarray(z)) for z in zeros]
+        cols.update(n_zeros=[len(z) for z in zeros], z1=[z[0] if len(z) else np.nan for z in zeros],
+                    var=[s[0] for s in stats], skew=[s[1] for s in stats])
+    return cols
+
+
+def default_out():
+    """The scan table in the shared cache directory (never the source tree)."""
+    from prime_store import cache_dir
+    return os.path.join(cache_dir(), "ec_scan")
+
+
+def scan(A, out=None, height=40, max_conductor=None, min_rank=0, workers=None,
+         verbose=True):
+    """
+    Run the staged scan of box A into the ColumnFile at out (default
+    default_out()); isomorphism classes already in it (by iso_key,
+    whatever representative the earlier run used) are skipped. Returns
+    the ColumnFile.
+    """
+    table = ColumnFile(out or default_out())
+    t0 = time.time()
+    curves = distinct_curves(A)
+    if table.rows:
+        done = np.stack([table.column(k) for k in ("a1", "a2", "a3", "a4", "a6")], axis=1)
+        seen = {tuple(r) for r in class_keys(done).tolist()}
+        curves = curves[[tuple(r) not in seen for r in class_keys(curves).tolist()]]
+    if verbose:
+        print(f"{len(A)} coefficient vectors -> {len(curves)} new isomorphism classes "
+              f"({time.time() - t0:.1f}s)")
+
+    pool = gp_pool(workers)
+    n_cheap = n_zeros = 0
+    expensive = {}
+    for i, fut in cheap_stats(pool, curves):
+        block = curves[i:i + CHUNK]
+        try:
+            cheap = fut.result()
+        except GPError as e:
+            print(f"  stage 1 chunk at {i}: {e}")
+            continue
+        cond = np.array([c[0] for c in cheap])
+        rank = rank_proxy(np.array([c[1] for c in cheap]), np.array([float(c[2]) for c in cheap]))
+        keep = rank >= min_rank
+        if max_conductor is not None:
+            keep &= cond <= max_conductor
+        rest = np.nonzero(~keep)[0]
+        table.append(_rows(block[rest], [cheap[j] for j in rest]))
+        n_cheap += len(rest)
+        for j in np.nonzero(keep)[0]:
+            f = pool.submit(f"lfunzeros(lfuncreate(ellinit({_vec(block[j])})),{height})")
+            expensive[f] = (block[j], cheap[j])
+
+    for k, f in enumerate(as_completed(expensive), 1):
+        curve, cheap = expensive[f]
+        try:
+            z = f.result()
+        except GPError:
+            table.append(_rows(curve[None], [cheap]))
+            continue
+        table.append(_rows(curve[None], [cheap], [z]))
+        n_zeros += 1
+        if verbose and k % 100 == 0:
+            print(f"  {k}/{len(expensive)} zero computations ({time.time() - t0:.0f}s)", flush=True)
+    if verbose:
+        print(f"stage 1 only: {n_cheap}, with zeros: {n_zeros}; table has {table.rows} curves "
+              f"({time.time() - t0:.0f}s)")
+    return table
+
+
+# =============================================================================
+# REPORT
+# =============================================================================
+
+def report(table, sigma=ANOMALY_SIGMA):
+    """Spacing statistics by rank proxy and the > sigma outliers, as anomaly_scan.gp."""
+    t = table.read()
+    ok = np.isfinite(t["var"])
+    print(f"{table.rows} curves, {ok.sum()} with zeros")
+    for r in np.unique(t["rank"][ok]):
+        m = ok & (t["rank"] == r)
+        print(f"  rank proxy {r}: {m.sum():>6} curves  var {t['var'][m].mean():.4f} ± "
+              f"{t['var'][m].std():.4f}  skew {t['skew'][m].mean():.4f} ± {t['skew'][m].std():.4f}")
+    out = []
+    for col in ("var", "skew"):
+        v = t[col][ok]
+        if len(v) < 2 or v.std() < 0.001:
+            continue
+        score = np.abs(v - v.mean()) / v.std()
+        idx = np.nonzero(ok)[0]
+        out.extend((idx[k], col, float(score[k])) for k in np.nonzero(score > sigma)[0])
+    print(f"\nAnomalies (> {sigma} std from mean): {len(out)}")
+    for i, col, s in sorted(out, key=lambda r: -r[2])[:30]:
+        a = [int(t[k][i]) for k in ("a1", "a2", "a3", "a4", "a6")]
+        print(f"  {a} cond={t['conductor'][i]} rank~{t['rank'][i]} {col}={s:.2f}σ")
+    return out
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--a4", type=int, nargs=2, default=(-10, 10))
+    ap.add_argument("--a6", type=int, nargs=2, default=(-10, 10))
+    ap.add_argument("--height", type=float, default=40)
+    ap.add_argument("--max-conductor", type=int)
+    ap.add_argument("--min-rank", type=int, default=0)
+    ap.add_argument("--workers", type=int)
+    ap.add_argument("--out", help="table directory (default: ec_scan in the cache directory)")
+    ap.add_argument("--report", action="store_true", help="only report on an existing table")
+    args = ap.parse_args()
+
+    if args.report:
+        report(ColumnFile(args.out or default_out()))
+    else:
+        table = scan(curve_box(args.a4, args.a6), args.out, args.height, args.max_conductor,
+                     args.min_rank, args.workers)
+        report(table)
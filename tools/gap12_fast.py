@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
-"""Fast search for length-12 gap arithmetic progressions using Miller-Rabin."""
+"""Fast search for length-12 gap arithmetic progressions (segmented sieve, see gap_engine.py)."""
+
+from gap_engine import scan
 
 def miller_rabin(n, witnesses=[2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37]):
     """Deterministic Miller-Rabin for n < 3,317,044,064,679,887,385,961,981."""
@@ -26,53 +28,24 @@ def miller_rabin(n, witnesses=[2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37]):
             return False
     return True
 
-def next_prime(n):
-    n += 1
-    if n <= 2: return 2
-    if n % 2 == 0: n += 1
-    while not miller_rabin(n):
-        n += 2
-    return n
-
-def check_gap_ap(p):
-    """Check if 12 consecutive primes starting at p form a gap AP."""
-    primes = [p]
-    for _ in range(11):
-        primes.append(next_prime(primes[-1]))
-
-    gaps = [primes[i+1] - primes[i] for i in range(11)]
-    d = gaps[1] - gaps[0]
-
-    for i in range(1, 10):
-        if gaps[i+1] - gaps[i] != d:
-            return False, None, None, None
-
-    return True, primes, gaps, d
-
-def search(start, count, report_every=500000):
-    p = next_prime(start - 1)
-    checked = 0
+def search(start, count, report_every=30.0):
+    """Scan `count` primes from `start` with the sieve engine; each hit is re-checked by Miller-Rabin."""
     found = 0
 
-    print(f"Searching from {start:,} for {count:,} primes...", flush=True)
-
-    while checked < count:
-        ok, primes, gaps, d = check_gap_ap(p)
-        if ok:
-            found += 1
-            print(f"\n*** FOUND #{found}: p={p} ***")
-            print(f"  Primes: {primes}")
-            print(f"  Gaps: {gaps}")
-            print(f"  Common diff: {d}\n")
+    def show(hit):
+        nonlocal found
+        found += 1
+        assert all(miller_rabin(q) for q in hit['primes'])
+        print(f"\n*** FOUND #{found}: p={hit['prime_start']} (length {hit['length']}) ***")
+        print(f"  Primes: {hit['primes']}")
+        print(f"  Gaps: {hit['gaps']}")
+        print(f"  Common diff: {hit['d']}\n", flush=True)
 
-        checked += 1
-        if checked % report_every == 0:
-            print(f"Checked {checked:,} at p={p:,}", flush=True)
-
-        p = next_prime(p)
+    print(f"Searching from {start:,} for {count:,} primes...", flush=True)
+    res = scan(start, min_length=12, max_primes=count, report_every=report_every, on_hit=show)
 
-    print(f"\nDone. Checked {checked:,}, found {found}.")
+    print(f"\nDone. Checked {res['n_primes']:,} ({res['rate']:,.0f} primes/s), found {found}.")
     return found
 
 if __name__ == "__main__":
-    search(10**12, 5_000_000, report_every=10_000)
+    search(10**12, 5_000_000)
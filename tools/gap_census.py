@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Single-pass gap-AP census by length, difference and direction
+
+One sieve pass over [start, end) tallies every maximal gap-AP run by
+(length, d); everything the count_direction*.gp scripts measured (one
+length per GP run, 7-8 nextprime calls per p) is derived from that one
+histogram for all lengths at once.
+
+Two views of the same data:
+  runs     maximal runs of exactly length L
+  windows  starting primes p whose next L primes form a gap AP, the
+           count_direction*.gp convention: a maximal run of length M
+           contains M-L+1 such windows
+
+Usage:
+  python3 gap_census.py 5 100000000                 # table for all lengths
+  python3 gap_census.py 5 500000000 --lengths 7 8 9 --workers 8
+"""
+
+import argparse
+import os
+from collections import Counter
+
+from gap_engine import GapAPStream, direction
+from sieve import DEFAULT_WINDOW, iter_segments
+
+
+# =============================================================================
+# CENSUS
+# =============================================================================
+
+def census(start, end, workers=1, shard_size=None, ckpt_dir=None,
+           window=DEFAULT_WINDOW):
+    """
+    Histogram {(length, d, direction): number of maximal runs} over [start, end).
+
+    workers > 1 (or a shard_size) runs through the sharded, stitched
+    driver in gap_shards.py; the result is identical to the serial pass.
+    Its checkpoints go to ckpt_dir, by default gap_census_ckpt in the
+    shared cache directory (never the source tree).
+    """
+    if workers == 1 and shard_size is None:
+        stream = GapAPStream(min_length=10**9)     # counts only, no hit records
+        for _, _, ps in iter_segments(start, end, window):
+            stream.feed(ps)
+        stream.finish()
+        counts = stream.state()['counts']
+    else:
+        from gap_shards import search
+        from prime_store import cache_dir
+        ckpt_dir = ckpt_dir or os.path.join(cache_dir(), "gap_census_ckpt")
+        shard_size = shard_size or max((end - start) // (4 * (workers or 1)), window)
+        counts = search(start, end, 10**9, shard_size, workers, ckpt_dir, window,
+                        verbose=False)['counts']
+    return {(length, d, sign): c for length, d, sign, c in counts}
+
+
+def window_counts(hist, length, nonzero=True):
+    """
+    count_direction*.gp numbers for one length: Counter by direction.
+
+    nonzero=True drops d=0 like the GP scripts' `if(d==0, next)`.
+    """
+    out = Counter()
+    for (m, d, sign), c in hist.items():
+        if m >= length and not (nonzero and d == 0):
+            out[sign] += c * (m - length + 1)
+    return out
+
+
+def by_direction(hist, min_length=3):
+    """{length: Counter(inc/dec/flat)} of maximal runs."""
+    out = {}
+    for (m, d, sign), c in hist.items():
+        if m >= min_length:
+            out.setdefault(m, Counter())[sign] += c
+    return out
+
+
+# =============================================================================
+# OUTPUT
+# =============================================================================
+
+def format_table(hist, lengths=None, max_d=12):
+    """
+    Compact text table: one row per length with window counts by
+    direction, dec/inc ratio, and maximal-run counts for |d| <= max_d.
+    """
+    if lengths is None:
+        lengths = sorted({m for m, _, _ in hist if m >= 5})
+    ds = sorted({d for m, d, _ in hist if m in lengths and d != 0 and abs(d) <= max_d})
+    lines = []
+    head = f"{'L':>3} {'inc':>8} {'dec':>8} {'flat':>8} {'dec/inc':>8} |"
+    head += "".join(f"{d:>7}" for d in ds)
+    lines.append(head + "   (maximal runs by d)")
+    lines.append("-" * len(head))
+    for m in lengths:
+        w = window_counts(hist, m, nonzero=False)
+        ratio = f"{w['dec'] / w['inc']:.3f}" if w['inc'] else "-"
+        row = f"{m:>3} {w['inc']:>8} {w['dec']:>8} {w['flat']:>8} {ratio:>8} |"
+        row += "".join(f"{hist.get((m, d, direction(d)), 0):>7}" for d in ds)
+        lines.append(row)
+    return "\n".join(lines)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Gap-AP census by (length, d, direction)")
+    ap.add_argument("start", type=int)
+    ap.add_argument("end", type=int)
+    ap.add_argument("--lengths", type=int, nargs="*", default=None)
+    ap.add_argument("--workers", type=int, default=1)
+    ap.add_argument("--max-d", type=int, default=12)
+    args = ap.parse_args()
+
+    hist = census(args.start, args.end, args.workers)
+    print(f"Gap-AP census over [{args.start:,}, {args.end:,})")
+    print("(inc/dec/flat = windows, as count_direction*.gp; columns = maximal runs)")
+    print()
+    print(format_table(hist, args.lengths, args.max_d))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Gap-AP search engine (segmented sieve + streaming run detector)
+
+A gap AP of length L is L consecutive primes whose L-1 gaps form an
+arithmetic progression with common difference d (the convention of
+count_direction*.gp and search*.gp: "length-12" = 12 primes).
+
+Instead of calling next_prime 11 times per starting prime, the engine
+sieves windows of the range once, streams the gaps through a small
+carry buffer and finds every *maximal* run of equal second differences
+in one vectorized pass, for all d at once.
+
+Usage:
+  python3 gap_engine.py 1000000000000 1000100000000 9   # start end min_length
+"""
+
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+
+from sieve import DEFAULT_WINDOW, iter_segments
+
+_KEY = 1 << 24      # packs (length, d) into one int64 for counting; |d| < 2^23
+
+
+# =============================================================================
+# RUN DETECTION
+# =============================================================================
+
+def find_runs(primes):
+    """
+    Maximal gap-AP runs in a sorted prime array.
+
+    Returns (starts, lengths, ds) as arrays: run i begins at
+    primes[starts[i]], spans lengths[i] primes and has common gap
+    difference ds[i]. Every run has length >= 3; adjacent runs share
+    their boundary gap.
+    """
+    if len(primes) < 3:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty
+    dd = np.diff(primes, n=2)
+    change = np.flatnonzero(dd[1:] != dd[:-1]) + 1
+    starts = np.concatenate(([0], change))
+    ends = np.concatenate((change, [len(dd)]))
+    return starts, ends - starts + 2, dd[starts]
+
+
+def direction(d):
+    """'inc', 'dec' or 'flat' for a common gap difference d."""
+    return 'inc' if d > 0 else 'dec' if d < 0 else 'flat'
+
+
+def make_hit(primes, start, length, d):
+    """Hit record for the run primes[start:start+length]."""
+    ps = [int(p) for p in primes[start:start + length]]
+    return {
+        'length': int(length),
+        'd': int(d),
+        'prime_start': ps[0],
+        'gaps': [ps[i+1] - ps[i] for i in range(len(ps) - 1)],
+        'primes': ps,
+    }
+
+
+class GapAPStream:
+    """
+    Streaming maximal-run detector over consecutive primes.
+
+    Feed prime arrays in increasing order with feed(); call finish()
+    after the last one. The run still open at the end of each chunk is
+    carried over (only the primes from its first element onward), so
+    runs crossing window boundaries are found exactly once.
+
+    counts tallies every closed maximal run by (length, d); hits keeps
+    the full records of runs with length >= min_length.
+
+    With defer_first=True (one shard of a larger range) the first run is
+    not counted, since it may extend back into the previous shard: its
+    primes are kept in head instead, and finish(flush=False) likewise
+    keeps the last run in tail. stitch() joins such shards exactly.
+    """
+
+    def __init__(self, min_length=3, on_hit=None, defer_first=False):
+        self.min_length = min_length
+        self.on_hit = on_hit
+        self.defer_first = defer_first
+        self.head = None
+        self.tail = np.zeros(0, dtype=np.int64)
+        self.hits = []
+        self.counts = Counter()
+        self.n_primes = 0
+        self.last_prime = None
+
+    def _emit(self, primes, starts, lengths, ds):
+        if len(lengths):
+            keys, n = np.unique(lengths * _KEY + ds + _KEY // 2, return_counts=True)
+            for key, c in zip(keys.tolist(), n.tolist()):
+                self.counts[(key // _KEY, key % _KEY - _KEY // 2)] += c
+        keep = np.flatnonzero(lengths >= self.min_length)
+        for i in keep:
+            hit = make_hit(primes, starts[i], lengths[i], ds[i])
+            self.hits.append(hit)
+            if self.on_hit:
+                self.on_hit(hit)
+
+    def absorb(self, primes):
+        """Count/record every run of primes as closed (both ends maximal)."""
+        if len(primes) >= 3:
+            self._emit(primes, *find_runs(primes))
+
+    def feed(self, primes):
+        """Consume the next block of consecutive primes."""
+        if len(primes) == 0:
+            return
+        self.n_primes += len(primes)
+        self.last_prime = int(primes[-1])
+        arr = np.concatenate((self.tail, primes)) if len(self.tail) else np.asarray(primes, dtype=np.int64)
+        if len(arr) < 3:
+            self.tail = arr
+            return
+        starts, lengths, ds = find_runs(arr)
+        first = 0
+        if self.defer_first and self.head is None:
+            if len(starts) == 1:
+                self.tail = arr
+                return
+            # First run has closed: keep it (and only it) for stitching
+            self.head = arr[:starts[1] + 2]
+            first = 1
+        # Last run may continue into the next block: hold it back
+        self._emit(arr, starts[first:-1], lengths[first:-1], ds[first:-1])
+        self.tail = arr[starts[-1]:]
+
+    def finish(self, flush=True):
+        """Flush the run still open at the end of the stream (unless flush=False)."""
+        if flush:
+            if self.defer_first and self.head is None:
+                self.head = self.tail
+            else:
+                self.absorb(self.tail)
+            self.tail = np.zeros(0, dtype=np.int64)
+        return self.hits
+
+    def state(self):
+        """JSON-serializable snapshot, enough to resume with from_state()."""
+        return {
+            'min_length': self.min_length,
+            'defer_first': self.defer_first,
+            'head': None if self.head is None else [int(p) for p in self.head],
+            'tail': [int(p) for p in self.tail],
+            'hits': self.hits,
+            'counts': [[length, d, direction(d), c] for (length, d), c in sorted(self.counts.items())],
+            'n_primes': self.n_primes,
+            'last_prime': self.last_prime,
+        }
+
+    @classmethod
+    def from_state(cls, state, on_hit=None):
+        stream = cls(state['min_length'], on_hit, state.get('defer_first', False))
+        if state.get('head') is not None:
+            stream.head = np.array(state['head'], dtype=np.int64)
+        stream.tail = np.array(state['tail'], dtype=np.int64)
+        stream.hits = list(state['hits'])
+        stream.counts = Counter({(length, d): c for length, d, _, c in state['counts']})
+        stream.n_primes = state['n_primes']
+        stream.last_prime = state['last_prime']
+        return stream
+
+
+def stitch(states, min_length=None):
+    """
+    Exact merge of consecutive shard states (defer_first, finish(flush=False)).
+
+    Each shard boundary is re-scanned as previous tail + next head, so
+    runs straddling shards are counted once at their true length. The
+    result is a flushed stream whose hits/counts equal a serial scan
+    of the concatenated range.
+    """
+    if min_length is None:
+        min_length = states[0]['min_length'] if states else 3
+    merged = GapAPStream(min_length)
+    carry = np.zeros(0, dtype=np.int64)
+    for st in states:
+        for length, d, _, c in st['counts']:
+            merged.counts[(length, d)] += c
+        merged.hits.extend(h for h in st['hits'] if h['length'] >= min_length)
+        merged.n_primes += st['n_primes']
+        if st['last_prime'] is not None:
+            merged.last_prime = st['last_prime']
+        head = np.array(st['head'] if st['head'] is not None else st['tail'], dtype=np.int64)
+        tail = np.array(st['tail'], dtype=np.int64)
+        if st['head'] is None:
+            # Whole shard is still one open run: it all carries through
+            carry = np.concatenate((carry, tail))
+            continue
+        merged.absorb(np.concatenate((carry, head)))
+        carry = tail
+    merged.absorb(carry)
+    merged.hits.sort(key=lambda h: h['prime_start'])
+    return merged
+
+
+# =============================================================================
+# SEARCH DRIVER
+# =============================================================================
+
+def scan(start, end=None, min_length=6, max_primes=None, max_hits=None,
+         window=DEFAULT_WINDOW, report_every=10.0, on_hit=None):
+    """
+    Find every gap AP of length >= min_length among the primes in [start, end).
+
+    end=None scans upward until max_primes primes or max_hits hits.
+    Runs are confined to the primes actually scanned. Progress with a
+    primes/second rate is printed every report_every seconds
+    (None to silence).
+
+    Returns dict with hits, n_primes, last_prime, elapsed, rate.
+    """
+    if end is None and max_primes is None and max_hits is None:
+        raise ValueError("unbounded scan: give end, max_primes or max_hits")
+
+    if on_hit is not None and max_hits is not None:
+        # Hits past max_hits in the last segment are kept, then trimmed: don't report them
+        user_hit = on_hit
+        on_hit = lambda h: user_hit(h) if len(stream.hits) <= max_hits else None
+    stream = GapAPStream(min_length, on_hit)
+    t0 = time.time()
+    t_report = t0
+    bound = end if end is not None else sys.maxsize
+
+    lo = start
+    while lo < bound:
+        hi = min(lo + 64 * window, bound)    # extend the base table in steps
+        for _, seg_hi, ps in iter_segments(lo, hi, window):
+            if max_primes is not None and stream.n_primes + len(ps) >= max_primes:
+                ps = ps[:max_primes - stream.n_primes]
+                stream.feed(ps)
+                lo = bound
+                break
+            stream.feed(ps)
+            if max_hits is not None and len(stream.hits) >= max_hits:
+                lo = bound
+                break
+            now = time.time()
+            if report_every is not None and now - t_report >= report_every:
+                t_report = now
+                print(f"  at p={stream.last_prime:,}  {stream.n_primes:,} primes  "
+                      f"{stream.n_primes / (now - t0):,.0f} primes/s", flush=True)
+        else:
+            lo = hi
+    stream.finish()
+
+    elapsed = time.time() - t0
+    return {
+        'hits': stream.hits[:max_hits] if max_hits is not None else stream.hits,
+        'n_primes': stream.n_primes,
+        'last_prime': stream.last_prime,
+        'elapsed': elapsed,
+        'rate': stream.n_primes / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def main():
+    start = int(sys.argv[1]) if len(sys.argv) > 1 else 10**12
+    end = int(sys.argv[2]) if len(sys.argv) > 2 else start + 10**8
+    k = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+
+    print(f"Gap-AP scan [{start:,}, {end:,}), length >= {k}")
+    print("=" * 55)
+    res = scan(start, end, min_length=k,
+               on_hit=lambda h: print(f"  L{h['length']}: p={h['prime_start']:,}, d={h['d']}, gaps={h['gaps']}", flush=True))
+    print()
+    print(f"{len(res['hits'])} hits, {res['n_primes']:,} primes in {res['elapsed']:.1f}s "
+          f"({res['rate']:,.0f} primes/s)")
+
+
+if __name__ == "__main__":
+    main()
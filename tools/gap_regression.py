@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Regression benchmark: sharded gap-AP search == serial scan
+
+Runs the serial engine and the sharded driver over the same range and
+checks that hit lists and (length, d) counts are identical. Shard and
+window sizes are deliberately awkward so many runs straddle boundaries;
+a second pass with tiny shards stresses shards shorter than one run.
+
+Usage:
+  python3 gap_regression.py              # 10^8, default
+  python3 gap_regression.py 1000000000
+"""
+
+import shutil
+import sys
+import tempfile
+import time
+
+from gap_engine import GapAPStream, scan
+from gap_shards import search
+from sieve import iter_segments
+
+
+def compare(label, serial, sharded):
+    key = lambda h: (h['prime_start'], h['length'], h['d'])
+    same_hits = [key(h) for h in serial['hits']] == [key(h) for h in sharded['hits']]
+    same_counts = serial['counts'] == sharded['counts']
+    same_n = serial['n_primes'] == sharded['n_primes']
+    ok = same_hits and same_counts and same_n
+    print(f"  {label}: hits {len(serial['hits'])} vs {len(sharded['hits'])}, "
+          f"counts {'=' if same_counts else '!='}, primes {'=' if same_n else '!='}  "
+          f"{'PASS' if ok else 'FAIL'}")
+    return ok
+
+
+def run(n, min_length, shard_size, window, workers=None):
+    t0 = time.time()
+    stream = GapAPStream(min_length)
+    res = scan(0, n, min_length=min_length, window=window, report_every=None, on_hit=None)
+    t_serial = time.time() - t0
+    # scan() keeps only hits; recount (length, d) with a plain stream for the reference
+    for _, _, ps in iter_segments(0, n, window):
+        stream.feed(ps)
+    stream.finish()
+    serial = {'hits': res['hits'], 'counts': stream.state()['counts'], 'n_primes': res['n_primes']}
+
+    ckpt_dir = tempfile.mkdtemp(prefix="gap_reg_")
+    try:
+        t0 = time.time()
+        sharded = search(0, n, min_length, shard_size, workers, ckpt_dir, window, verbose=False)
+        t_sharded = time.time() - t0
+    finally:
+        shutil.rmtree(ckpt_dir)
+    print(f"  serial {t_serial:.1f}s ({res['rate']:,.0f} primes/s), sharded {t_sharded:.1f}s")
+    return compare(f"N={n:,} shard={shard_size:,} window={window:,}", serial, sharded)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10**8
+    print(f"Gap-AP serial vs sharded regression, N = {n:,}")
+    print("=" * 55)
+    ok = run(n, 7, shard_size=n // 7 + 12345, window=(1 << 20) + 2)
+    ok &= run(10**6, 4, shard_size=997, window=211)
+    ok &= run(20000, 3, shard_size=5, window=3)
+    print()
+    print("ALL PASS" if ok else "MISMATCH")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Sharded, resumable gap-AP search on a process pool
+
+Splits [start, end) into fixed shards and runs each one through the
+gap_engine stream in a worker process. Every worker keeps a small JSON
+checkpoint (last prime reached, open-run tail, counts by
+(length, d, direction), hits) in the checkpoint directory and rewrites
+it atomically as it goes. Re-running the same command skips finished
+shards, resumes partial ones from their last prime and merges everything.
+Each shard holds back its first and last run (which may straddle a
+boundary) and merge() re-joins them, so the hit list and counts are
+identical to a serial scan.
+
+Replaces the single-core, start-over-on-kill hunts in search12_100b.gp,
+gap12_fast.py and gap_ap_d30.py.
+
+Usage:
+  python3 gap_shards.py 0 100000000000 --min-length 10 --workers 8
+  python3 gap_shards.py 0 100000000000 --min-length 10     # after a kill: resumes
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from gap_engine import GapAPStream, stitch
+from sieve import DEFAULT_WINDOW, iter_segments
+
+DEFAULT_SHARD = 10**9
+CHECKPOINT_EVERY = 60.0     # seconds between checkpoint rewrites
+
+
+# =============================================================================
+# SHARDS AND CHECKPOINTS
+# =============================================================================
+
+def make_shards(start, end, shard_size=DEFAULT_SHARD):
+    """Fixed [lo, hi) shards covering [start, end)."""
+    return [(lo, min(lo + shard_size, end)) for lo in range(start, end, shard_size)]
+
+
+def checkpoint_path(ckpt_dir, lo, hi):
+    return os.path.join(ckpt_dir, f"shard_{lo}_{hi}.json")
+
+
+def load_checkpoint(path):
+    """Checkpoint dict, or None if missing/unreadable."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def usable(ckpt, min_length):
+    """True if a checkpoint was written by a compatible run."""
+    st = ckpt['stream']
+    return st['min_length'] == min_length and st.get('defer_first', False)
+
+
+def save_checkpoint(path, ckpt):
+    """Write via a temp file + rename so a kill never leaves a torn file."""
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(ckpt, f)
+    os.replace(tmp, path)
+
+
+# =============================================================================
+# WORKER
+# =============================================================================
+
+def run_shard(lo, hi, min_length, ckpt_dir, window=DEFAULT_WINDOW,
+              checkpoint_every=CHECKPOINT_EVERY):
+    """
+    Scan one shard, resuming from its checkpoint if there is one.
+
+    Returns the final checkpoint dict (done=True).
+    """
+    path = checkpoint_path(ckpt_dir, lo, hi)
+    ckpt = load_checkpoint(path)
+    if ckpt and not usable(ckpt, min_length):
+        ckpt = None
+    if ckpt and ckpt['done']:
+        return ckpt
+
+    if ckpt:
+        stream = GapAPStream.from_state(ckpt['stream'])
+        last = ckpt['stream']['last_prime']
+        resume = lo if last is None else last + 1
+        elapsed = ckpt['elapsed']
+    else:
+        stream = GapAPStream(min_length, defer_first=True)
+        resume = lo
+        elapsed = 0.0
+
+    def snapshot(done):
+        return {'lo': lo, 'hi': hi, 'done': done,
+                'elapsed': elapsed + time.time() - t0,
+                'stream': stream.state()}
+
+    t0 = time.time()
+    t_save = t0
+    for _, _, ps in iter_segments(resume, hi, window):
+        stream.feed(ps)
+        if time.time() - t_save >= checkpoint_every:
+            save_checkpoint(path, snapshot(False))
+            t_save = time.time()
+    stream.finish(flush=False)      # tail is stitched to the next shard's head in merge()
+
+    ckpt = snapshot(True)
+    save_checkpoint(path, ckpt)
+    return ckpt
+
+
+# =============================================================================
+# DRIVER
+# =============================================================================
+
+def merge(ckpts):
+    """
+    Combine shard checkpoints into one result dict (hits sorted by prime).
+
+    Shards are stitched in order (gap_engine.stitch), so runs crossing a
+    shard boundary come out exactly as in a serial scan.
+    """
+    ckpts = sorted(ckpts, key=lambda ck: ck['lo'])
+    merged = stitch([ck['stream'] for ck in ckpts])
+    return {
+        'hits': merged.hits,
+        'counts': merged.state()['counts'],
+        'n_primes': merged.n_primes,
+        'cpu_seconds': sum(ck['elapsed'] for ck in ckpts),
+    }
+
+
+def search(start, end, min_length=8, shard_size=DEFAULT_SHARD, workers=None,
+           ckpt_dir="gap_ckpt", window=DEFAULT_WINDOW, verbose=True):
+    """
+    Run (or resume) the sharded search and return the merged result.
+
+    workers=None uses every core (os.cpu_count()).
+    """
+    os.makedirs(ckpt_dir, exist_ok=True)
+    shards = make_shards(start, end, shard_size)
+    done = []
+    todo = []
+    for lo, hi in shards:
+        ck = load_checkpoint(checkpoint_path(ckpt_dir, lo, hi))
+        if ck and ck['done'] and usable(ck, min_length):
+            done.append(ck)
+        else:
+            todo.append((lo, hi))
+
+    print(f"{len(shards)} shards: {len(done)} already done, {len(todo)} to run", flush=True)
+    t0 = time.time()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_shard, lo, hi, min_length, ckpt_dir, window) for lo, hi in todo]
+        for fut in as_completed(futures):
+            ck = fut.result()
+            done.append(ck)
+            st = ck['stream']
+            if verbose:
+                print(f"  shard [{ck['lo']:,}, {ck['hi']:,}): {st['n_primes']:,} primes, "
+                      f"{len(st['hits'])} hits, {st['n_primes'] / max(ck['elapsed'], 1e-9):,.0f} primes/s "
+                      f"({len(done)}/{len(shards)})", flush=True)
+
+    res = merge(done)
+    wall = time.time() - t0
+    res['wall_seconds'] = wall
+    print(f"Done: {res['n_primes']:,} primes, {len(res['hits'])} hits, {wall:.1f}s wall", flush=True)
+    return res
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Sharded resumable gap-AP search")
+    ap.add_argument("start", type=int)
+    ap.add_argument("end", type=int)
+    ap.add_argument("--min-length", type=int, default=8)
+    ap.add_argument("--shard-size", type=int, default=DEFAULT_SHARD)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--dir", default="gap_ckpt", help="checkpoint directory")
+    args = ap.parse_args()
+
+    res = search(args.start, args.end, args.min_length, args.shard_size, args.workers, args.dir)
+    print()
+    for h in res['hits']:
+        print(f"  L{h['length']}: p={h['prime_start']:,}, d={h['d']}, gaps={h['gaps']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Pool of long-lived PARI/GP workers
+
+Every GP request used to be a fresh `gp -q` subprocess: interpreter
+startup plus nfinit / lfuncreate on every call, then ad-hoc parsing of
+printed text. GPPool keeps N gp processes alive and feeds them from one
+job queue:
+
+  - results are framed: each job's value is written by a GP-side
+    serializer as tagged lines (V n / I / R / S / X), terminated by a
+    record-separator line, and rebuilt as Python lists / ints / floats;
+  - errors come back as GPError on the job's future; the worker lives on;
+  - each job runs under GP's alarm(); if gp still does not answer a
+    grace period later, only that worker is killed and restarted;
+  - L-functions are created once per worker and label (zero_catalog
+    labels) and bound to L for jobs that name one;
+  - define() sends GP function definitions to every worker, including
+    ones restarted later.
+
+Usage:
+  from gp_pool import GPPool, gp_pool, lfun_zeros
+  with GPPool(4) as pool:
+      futs = [pool.submit("lfunzeros(L, 50)", label=dedekind_label(p)) for p in polys]
+      zs = [f.result() for f in futs]
+  gp_pool().run("nfdisc(x^3-2)")       # shared pool, created on first use
+  lfun_zeros("dirichlet:7.6", 300)     # list of floats
+
+  python3 gp_pool.py                   # smoke test (needs gp on PATH)
+"""
+
+import hashlib
+import os
+import queue
+import select
+import subprocess
+import threading
+import time
+from concurrent.futures import Future
+
+from zero_catalog import ZETA
+
+GP = "gp"
+TIMEOUT = 120           # default per-job limit (seconds, GP alarm)
+GRACE = 10              # extra seconds before a silent worker is restarted
+STACK = "2G"            # parisizemax per worker
+END = "\x1e"            # record separator closing each job's output
+
+# GP-side serializer: one tagged line per atom, vectors prefixed by length
+EMIT = ('gpq_emit(x)=my(t=type(x));if(t=="t_VEC"||t=="t_COL",print("V ",#x);'
+        'for(i=1,#x,gpq_emit(x[i])),if(t=="t_INT",print("I ",x),'
+        'if(t=="t_REAL"||t=="t_FRAC",printf("R %.17g\\n",x),'
+        'if(t=="t_STR",print("S ",x),print("X ",x)))));')
+
+
+class GPError(RuntimeError):
+    pass
+
+
+def gp_lfun(label):
+    """GP expression creating the L-function of a zero_catalog label."""
+    if label == ZETA:
+        return "lfuncreate(1)"
+    kind, _, arg = label.partition(":")
+    if kind == "dirichlet":
+        q, n = arg.split(".")
+        return f"lfuncreate(Mod({n},{q}))"
+    if kind == "dedekind":
+        return f"lfuncreate(nfinit({arg}))"
+    if kind == "ec":
+        return f"lfuncreate(ellinit({arg}))"
+    raise ValueError(f"no GP constructor for label {label!r}")
+
+
+def _parse(lines):
+    """Rebuild a value from the serializer's tagged lines (consumed from the front)."""
+    tag, _, val = lines.pop(0).partition(" ")
+    if tag == "V":
+        return [_parse(lines) for _ in range(int(val))]
+    if tag == "I":
+        return int(val)
+    if tag == "R":
+        return float(val.replace(" ", ""))      # GP writes 1.5 e-5
+    return val
+
+
+def _check(out):
+    """Drop GP warnings from a job's output lines; raise GPError on errors."""
+    out = [l for l in out if "*** Warning" not in l]
+    errors = [l[2:] for l in out if l.startswith("! ")] + [l.strip() for l in out if "***" in l]
+    if errors:
+        raise GPError("\n".join(errors))
+    return out
+
+
+class _Worker:
+    """One gp process and the state it holds (definitions applied, L-functions created)."""
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.proc = None
+        self.start()
+
+    def start(self):
+        self.proc = subprocess.Popen([GP, "-q", "-f", "-D", f"parisizemax={self.pool.stack}"],
+                                     stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                     stderr=subprocess.STDOUT, text=True, bufsize=1)
+        self.buf = ""
+        self.n_defs = 0
+        self.lfuns = set()
+        self.seq = 0
+        self._exec(EMIT, TIMEOUT)
+
+    def stop(self):
+        if self.proc and self.proc.poll() is None:
+            self.proc.kill()
+            self.proc.wait()
+
+    def _readline(self, deadline):
+        fd = self.proc.stdout.fileno()
+        while "\n" not in self.buf:
+            left = deadline - time.monotonic()
+            if left <= 0 or not select.select([fd], [], [], left)[0]:
+                raise TimeoutError
+            chunk = os.read(fd, 1 << 16).decode(errors="replace")
+            if not chunk:
+                raise GPError("gp exited")
+            self.buf += chunk
+        line, self.buf = self.buf.split("\n", 1)
+        return line
+
+    def _exec(self, code, timeout):
+        """Send one line of code, return its output lines up to the end marker."""
+        self.seq += 1
+        mark = f"{END}{self.seq}"
+        self.proc.stdin.write(f"{code}\nprint(\"{mark}\");\n")
+        self.proc.stdin.flush()
+        deadline = time.monotonic() + timeout + GRACE
+        out = []
+        while (line := self._readline(deadline)) != mark:
+            out.append(line)
+        return out
+
+    def run(self, code, label, timeout):
+        while self.n_defs < len(self.pool.defs):
+            self._exec(self.pool.defs[self.n_defs], TIMEOUT)
+            self.n_defs += 1
+        bind = ""
+        if label is not None:
+            var = "gpq_L" + hashlib.sha1(label.encode()).hexdigest()[:12]
+            if label not in self.lfuns:
+                _check(self._exec(f"{var}={gp_lfun(label)};", timeout))
+                self.lfuns.add(label)
+            bind = f"L={var};"
+        code = " ".join(code.split("\n"))
+        out = self._exec(f"{bind}gpq_r=iferr(alarm({int(timeout)},{code}),gpq_E,gpq_E);"
+                         f"if(type(gpq_r)==\"t_ERROR\",print(\"! \",gpq_r),gpq_emit(gpq_r));", timeout)
+        out = _check(out)
+        return _parse(out) if out else None
+
+
+class GPPool:
+    """
+    N persistent gp workers behind a job queue.
+
+    submit() returns a concurrent.futures.Future; run() and map() wait.
+    A job that times out or crashes its worker fails alone: the worker
+    is restarted (losing its cached L-functions) and takes the next job.
+    """
+
+    def __init__(self, workers=None, timeout=TIMEOUT, stack=STACK):
+        self.n = workers or os.cpu_count()
+        self.timeout = timeout
+        self.stack = stack
+        self.defs = []
+        self.jobs = queue.Queue()
+        self.threads = [threading.Thread(target=self._loop, daemon=True) for _ in range(self.n)]
+        for t in self.threads:
+            t.start()
+
+    def _loop(self):
+        worker = None
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+            fut, code, label, timeout = job
+            if not fut.set_running_or_notify_cancel():
+                continue
+            try:
+                worker = worker or _Worker(self)
+                fut.set_result(worker.run(code, label, timeout))
+            except (TimeoutError, GPError, OSError) as e:
+                dead = not isinstance(e, GPError) or str(e) == "gp exited"
+                if worker is not None and (dead or worker.proc.poll() is not None):
+                    worker.stop()
+                    worker = None
+                fut.set_exception(e if isinstance(e, GPError) else GPError(f"gp job failed: {e!r}"))
+            except Exception as e:
+                fut.set_exception(e)
+        if worker is not None:
+            worker.stop()
+
+    def define(self, code):
+        """GP definitions (functions, globals) every worker runs before its next job."""
+        self.defs.append(" ".join(code.split("\n")))
+
+    def submit(self, code, label=None, timeout=None):
+        """
+        Queue a GP job; its value (last expression) comes back parsed.
+
+        label: zero_catalog label whose L-function is bound to L.
+        """
+        fut = Future()
+        self.jobs.put((fut, code, label, timeout or self.timeout))
+        return fut
+
+    def run(self, code, label=None, timeout=None):
+        return self.submit(code, label, timeout).result()
+
+    def map(self, codes, labels=None, timeout=None):
+        labels = labels or [None] * len(codes)
+        futs = [self.submit(c, l, timeout) for c, l in zip(codes, labels)]
+        return [f.result() for f in futs]
+
+    def close(self):
+        for _ in self.threads:
+            self.jobs.put(None)
+        for t in self.threads:
+            t.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def gp_pool(workers=None):
+    """Process-wide shared pool, started on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = GPPool(workers)
+        return _pool
+
+
+def lfun_zeros(label, T, lo=0, timeout=None):
+    """Ordinates in (lo, T] of the label's L-function, from the shared pool."""
+    z = gp_pool().run(f"lfunzeros(L,[{lo},{T}])" if lo else f"lfunzeros(L,{T})", label, timeout)
+    return sorted(z)
+
+
+if __name__ == "__main__":
+    import time
+
+    from zero_catalog import dedekind_label
+
+    polys = ["x^2-2", "x^2-5", "x^3-2", "x^3-x^2-1", "x^4-2", "x^4-x-1"]
+    with GPPool() as pool:
+        t0 = time.time()
+        zs = pool.map(["lfunzeros(L,30)"] * len(polys), [dedekind_label(p) for p in polys])
+        t1 = time.time()
+        for p, z in zip(polys, zs):
+            print(f"  {p:<10} {len(z):>3} zeros up to 30, first {z[0]:.6f}")
+        print(f"{len(polys)} fields on {pool.n} workers in {t1 - t0:.1f}s")
+        try:
+            pool.run("1/0")
+        except GPError as e:
+            print(f"error surfaced, pool alive: {e} -> {pool.run('2^64')}")
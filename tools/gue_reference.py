@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+GUE reference statistics as table lookups
+
+The t3 scripts rebuild the sine-kernel integrals on 20×20 (or 40³) grids
+every run and spark_cross_L3 / L7 carry their own R2. Everything here is
+the bulk limit (unit density, kernel K(x) = sin πx / πx), built once
+into interpolation tables and cached in prime_store.cache_dir():
+
+  Σ²(L)        L - 2 L Si(2πL)/π + 2 sin²(πL)/π² + Cin(2πL)/π²
+               (closed form of L - ∫∫ K²; Si, Cin by cellwise
+               Gauss-Legendre), asymptotic Si/Ci expansions past LMAX
+  N([0, L])    Nyström (Gauss-Legendre) eigenvalues λ_i of K on [0, L]:
+               N is a sum of independent Bernoulli(λ_i), so traces
+               p_j = Tr K^j, cumulants κ1..κ4 and P(N = k) are exact
+               to the quadrature (~1e-14)
+  Gaudin p(s)  E(0; s) = det(I - K_s) on Chebyshev nodes, p = E''
+               (Chebyshev series differentiated twice), CDF = 1 + E'
+  ⟨r̃⟩          large-N values of min/max spacing ratios, β = 1, 2, 4
+               (Atas et al. 2013) and their 3×3 surmise values
+
+Usage:
+  from gue_reference import r2, sigma2, cumulants, traces, gaudin, R_MEAN
+  sigma2([0.5, 1, 2])          # Σ²(L), vectorized
+  cumulants(1.0)               # dict k1..k4 of N([0, 1])
+  traces(1.0)["p3"]            # Tr K³ = ∫∫∫ K K K over [0, 1]³
+  gaudin(s), gaudin_cdf(s)     # nearest-neighbour spacing density / CDF
+"""
+
+import math
+import os
+
+import numpy as np
+
+LMAX = 50.0             # Σ² table range (asymptotic form beyond)
+L_STEP = 0.002
+KMAX = 20.0             # Nyström tables (traces, cumulants, P(N = k))
+K_STEP = 0.01
+KCOUNT = 12             # P(N = k) for k < KCOUNT
+SMAX = 6.0              # Gaudin table range (p(s) < 1e-40 beyond)
+S_STEP = 0.001
+VERSION = 1
+
+EULER = 0.5772156649015329
+R_MEAN = {1: 0.5307, 2: 0.5996, 4: 0.6744}
+R_MEAN_SURMISE = {1: 4 - 2*math.sqrt(3), 2: 2*math.sqrt(3)/math.pi - 0.5,
+                  4: 32/15*math.sqrt(3)/math.pi - 0.5}
+
+
+# =============================================================================
+# CLOSED FORMS
+# =============================================================================
+
+def sine_kernel(x):
+    """K(x) = sin πx / πx."""
+    return np.sinc(np.asarray(x, dtype=np.float64))
+
+
+def r2(s):
+    """GUE pair correlation 1 - K(s)²."""
+    return 1 - sine_kernel(s)**2
+
+
+def wigner(s):
+    """GUE Wigner surmise (32/π²) s² exp(-4s²/π)."""
+    s = np.asarray(s, dtype=np.float64)
+    return 32/math.pi**2 * s*s * np.exp(-4*s*s/math.pi)
+
+
+def _si_cin(x):
+    """Si(x) and Cin(x) = γ + log x - Ci(x) on an increasing grid from 0 (cellwise 10-point Gauss)."""
+    t, w = np.polynomial.legendre.leggauss(10)
+    a, b = x[:-1, None], x[1:, None]
+    u = (a + b)/2 + (b - a)/2 * t
+    h = (b - a)[:, 0] / 2
+    si = np.concatenate([[0.0], np.cumsum(h * (np.sinc(u/math.pi) @ w))])
+    cin = np.concatenate([[0.0], np.cumsum(h * ((0.5*u*np.sinc(u/(2*math.pi))**2) @ w))])
+    return si, cin
+
+
+def _sigma2_closed(L, si, cin):
+    return L - 2*L*si/math.pi + 2*np.sin(math.pi*L)**2/math.pi**2 + cin/math.pi**2
+
+
+def _sigma2_asymptotic(L):
+    x = 2*math.pi*L
+    f = (1 - 2/x**2 + 24/x**4) / x
+    g = (1 - 6/x**2 + 120/x**4) / x**2
+    si = math.pi/2 - f*np.cos(x) - g*np.sin(x)
+    cin = EULER + np.log(x) - (f*np.sin(x) - g*np.cos(x))
+    return _sigma2_closed(L, si, cin)
+
+
+# =============================================================================
+# FREDHOLM (NYSTRÖM)
+# =============================================================================
+
+def kernel_eigs(L, m=None):
+    """Eigenvalues of the sine kernel on [0, L] (Gauss-Legendre Nyström, m nodes)."""
+    m = m or 24 + int(4*L)
+    t, w = np.polynomial.legendre.leggauss(m)
+    x, w = L*(t + 1)/2, L*w/2
+    sw = np.sqrt(w)
+    return np.clip(np.linalg.eigvalsh(sw[:, None] * np.sinc(x[:, None] - x[None, :]) * sw[None, :]), 0, 1)
+
+
+def _count_tables(Ls):
+    P = np.zeros((len(Ls), 4))
+    C = np.zeros((len(Ls), 4))
+    E = np.zeros((len(Ls), KCOUNT))
+    for i, L in enumerate(Ls):
+        lam = kernel_eigs(L)
+        P[i] = [np.sum(lam**j) for j in range(1, 5)]
+        q = lam * (1 - lam)
+        C[i] = [lam.sum(), q.sum(), (q*(1 - 2*lam)).sum(), (q*(1 - 6*q)).sum()]
+        poly = np.array([1.0])
+        for l in lam[lam > 1e-18]:                  # Π (1 - λ + λ z)
+            poly = np.convolve(poly, [1 - l, l])[:KCOUNT]
+        E[i, :len(poly)] = poly
+    return P, C, E
+
+
+def _gaudin_table(s):
+    deg = 120
+    nodes = SMAX/2 * (1 - np.cos(np.pi*(np.arange(deg + 1) + 0.5)/(deg + 1)))
+    E0 = np.array([np.prod(1 - kernel_eigs(x, 40)) for x in nodes])
+    c = np.polynomial.chebyshev.Chebyshev.fit(nodes, E0, deg, domain=[0, SMAX])
+    d1 = c.deriv()
+    return np.maximum(d1.deriv()(s), 0.0), np.clip(1 + d1(s), 0.0, 1.0)
+
+
+# =============================================================================
+# TABLES
+# =============================================================================
+
+def _build():
+    L = np.arange(0, LMAX + L_STEP/2, L_STEP)
+    si, cin = _si_cin(2*math.pi*L)
+    K = np.arange(0, KMAX + K_STEP/2, K_STEP)
+    P, C, E = _count_tables(K)
+    s = np.arange(0, SMAX + S_STEP/2, S_STEP)
+    p, F = _gaudin_table(s)
+    return dict(L=L, sigma2=_sigma2_closed(L, si, cin), K=K, traces=P, cumulants=C,
+                counts=E, s=s, gaudin=p, gaudin_cdf=F)
+
+
+def _load():
+    from prime_store import cache_dir
+    path = os.path.join(cache_dir(), f"gue_reference_v{VERSION}.npz")
+    if os.path.exists(path):
+        with np.load(path) as f:
+            return {k: f[k] for k in f.files}
+    T = _build()
+    with open(path + ".tmp", "wb") as f:
+        np.savez(f, **T)
+    os.replace(path + ".tmp", path)
+    return T
+
+
+_T = _load()
+
+
+def _lookup(x, grid, values, name, top):
+    x = np.asarray(x, dtype=np.float64)
+    if np.any(x < 0) or np.any(x > top):
+        raise ValueError(f"{name}: argument outside [0, {top}]")
+    if values.ndim == 1:
+        return np.interp(x, grid, values)
+    return np.stack([np.interp(x, grid, v) for v in values.T], axis=-1)
+
+
+# =============================================================================
+# LOOKUPS
+# =============================================================================
+
+def sigma2(L):
+    """GUE number variance Σ²(L) (table up to LMAX, asymptotic closed form beyond)."""
+    L = np.asarray(L, dtype=np.float64)
+    big = L > LMAX
+    out = np.interp(np.minimum(L, LMAX), _T["L"], _T["sigma2"])
+    if np.any(big):
+        out = np.where(big, _sigma2_asymptotic(np.maximum(L, LMAX)), out)
+    return out
+
+
+def traces(L):
+    """p_j = Tr K^j on [0, L], j = 1..4 (p1 = L, p2 = ∫∫ K², p3 = ∫∫∫ KKK, ...)."""
+    v = _lookup(L, _T["K"], _T["traces"], "traces", KMAX)
+    return {f"p{j + 1}": v[..., j] for j in range(4)}
+
+
+def cumulants(L):
+    """Cumulants κ1..κ4 of N([0, L]): κ2 = Σ², κ3 = p1 - 3p2 + 2p3, ..."""
+    v = _lookup(L, _T["K"], _T["cumulants"], "cumulants", KMAX)
+    return {f"k{j + 1}": v[..., j] for j in range(4)}
+
+
+def count_prob(k, L):
+    """P(N([0, L]) = k), k < KCOUNT."""
+    return _lookup(L, _T["K"], _T["counts"][:, k], "count_prob", KMAX)
+
+
+def gaudin(s):
+    """Nearest-neighbour spacing density p(s) (Gaudin), 0 beyond SMAX."""
+    s = np.asarray(s, dtype=np.float64)
+    return np.interp(s, _T["s"], _T["gaudin"], right=0.0)
+
+
+def gaudin_cdf(s):
+    s = np.asarray(s, dtype=np.float64)
+    return np.interp(s, _T["s"], _T["gaudin_cdf"], right=1.0)
+
+
+def spacing_moments():
+    """Mean and variance of the Gaudin distribution (1, ~0.1800)."""
+    s, p = _T["s"], _T["gaudin"]
+    trapezoid = getattr(np, "trapezoid", None) or np.trapz     # numpy < 2.0 has only trapz
+    m = trapezoid(s*p, s)
+    return float(m), float(trapezoid((s - m)**2 * p, s))
+
+
+if __name__ == "__main__":
+    import time
+
+    import mpmath
+
+    t0 = time.time()
+    _build()
+    print(f"tables rebuilt in {time.time() - t0:.1f}s")
+    for L in (0.5, 1.0, 3.7, 10.0, 49.0, 80.0):
+        x = 2*math.pi*L
+        ref = (L - 2*L*float(mpmath.si(x))/math.pi + 2*math.sin(math.pi*L)**2/math.pi**2
+               + float(EULER + mpmath.log(x) - mpmath.ci(x))/math.pi**2)
+        c = cumulants(min(L, KMAX))
+        print(f"L={L:5.1f}  Σ² {float(sigma2(L)):.8f} (mpmath {ref:.8f})"
+              + (f"  κ2 {float(c['k2']):.8f} κ3 {float(c['k3']):+.6f} κ4 {float(c['k4']):+.6f}"
+                 if L <= KMAX else ""))
+    m, v = spacing_moments()
+    print(f"Gaudin: ∫p = {float(gaudin_cdf(SMAX)):.8f}, mean {m:.6f}, var {v:.6f} (0.1800); "
+          f"P(N([0,1]) = 0) = {float(count_prob(0, 1.0)):.6f} (E(0;1) = 0.17)")
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Batched phase-randomization null for the cancellation functional
+
+    C(N) = Var_x[E(x)] / E_φ Var_x[E_φ(x)]
+
+E_φ is the explicit-formula sum with every zero's phase shifted by an
+independent uniform φ_γ. All trials are drawn as one (trials × zeros)
+phase matrix and evaluated in one pass over a shared trig table
+(explicit_formula), and the null comes with a confidence interval.
+
+Two nulls are in use in the scripts:
+  per-trial  one φ_γ per zero per trial     (gue_band_test, inverse_spectral)
+  per-point  fresh φ_γ at every x           (band_analysis, run_scaling)
+
+Both have a closed-form expectation. With n sample points and
+1/|ρ|² = 1/(1/4 + γ²):
+
+  per-trial  E Var = Σ_γ 2/|ρ|² · (mean(x) - |mean(√x e^{iγ log x})|²)
+  per-point  E Var = (1 - 1/n) · Σ_γ 2/|ρ|² · mean(x)
+
+which is the trials → ∞ limit, at O(samples · zeros) cost.
+
+Usage:
+  from null_model import cancellation
+  r = cancellation(ZEROS, log_grid(10000, 200), trials=15)
+  r['C'], r['ci']                       # C(N) and its 95% interval
+  cancellation(ZEROS, xs, exact=True)   # closed-form null, no sampling
+"""
+
+import math
+from statistics import NormalDist
+
+import numpy as np
+
+from explicit_formula import BLOCK, ExplicitFormula
+
+
+def _engine(zeros):
+    return zeros if isinstance(zeros, ExplicitFormula) else ExplicitFormula(zeros)
+
+
+def _gammas(ef, select):
+    return ef.gammas if select is None else ef.gammas[select]
+
+
+def null_var_terms(zeros, xs, per_point=False, select=None):
+    """
+    Per-zero terms of the closed-form E_φ Var_x[E_φ(x)], shape (n_zeros,).
+
+    The null variance is additive over zeros (cross terms average out),
+    so the expectation for any subset is the sum of its terms.
+    """
+    ef = _engine(zeros)
+    g = _gammas(ef, select)
+    xs = np.asarray(xs, dtype=np.float64)
+    w = 2.0 / (0.25 + g*g)
+    mx = xs.mean()
+    if per_point:
+        return (1 - 1/len(xs)) * mx * w
+    # |mean_x √x e^{iγ log x}|² from the cached trig table when there is one
+    tab = ef.table(xs)
+    s = np.sqrt(xs) / len(xs)
+    if tab is not None:
+        cos, sin = tab
+        if select is not None:
+            cos, sin = cos[:, select], sin[:, select]
+        re, im = s @ cos, s @ sin
+    else:
+        re = np.empty(len(g))
+        im = np.empty(len(g))
+        L = np.log(xs)
+        step = max(1, BLOCK // len(xs))
+        for j in range(0, len(g), step):
+            th = np.outer(L, g[j:j + step])
+            re[j:j + step] = s @ np.cos(th)
+            im[j:j + step] = s @ np.sin(th)
+    return w * (mx - (re*re + im*im))
+
+
+def expected_null_var(zeros, xs, per_point=False, select=None):
+    """Closed-form E_φ Var_x[E_φ(x)] (the trials → ∞ limit)."""
+    return float(null_var_terms(zeros, xs, per_point, select).sum())
+
+
+def null_variances(zeros, xs, trials=15, per_point=False, select=None, rng=None):
+    """
+    Var_x[E_φ(x)] for each of `trials` phase draws, shape (trials,).
+
+    Per-point draws are batched so no more than BLOCK phases are held
+    at once.
+    """
+    ef = _engine(zeros)
+    nz = len(_gammas(ef, select))
+    xs = np.asarray(xs, dtype=np.float64)
+    rng = np.random.default_rng() if rng is None else rng
+    if not per_point:
+        phases = rng.uniform(0, 2*math.pi, (trials, nz))
+        return np.var(ef.E(xs, phases, select=select), axis=1)
+    out = np.empty(trials)
+    step = max(1, BLOCK // max(len(xs) * nz, 1))
+    for i in range(0, trials, step):
+        k = min(step, trials - i)
+        phases = rng.uniform(0, 2*math.pi, (k, len(xs), nz))
+        out[i:i + k] = np.var(ef.E(xs, phases, select=select), axis=1)
+    return out
+
+
+def cancellation(zeros, xs, trials=15, per_point=False, exact=False, select=None,
+                 rng=None, level=0.95):
+    """
+    C(N) on the sample points xs.
+
+    zeros: array of γ or an ExplicitFormula (reuses its trig tables);
+    select restricts to a subset of its zeros. exact=True uses the
+    closed-form null instead of sampling.
+
+    Returns a dict with C, var_actual, var_null, var_null_std, ci (the
+    `level` interval for C from the normal interval of the mean null
+    variance) and var_null_exact.
+    """
+    ef = _engine(zeros)
+    var_actual = float(np.var(ef.E(xs, select=select)))
+    var_exact = expected_null_var(ef, xs, per_point, select)
+    if exact:
+        C = var_actual / var_exact if var_exact > 0 else 0.0
+        return dict(C=C, var_actual=var_actual, var_null=var_exact, var_null_std=0.0,
+                    ci=(C, C), var_null_exact=var_exact)
+    v = null_variances(ef, xs, trials, per_point, select, rng)
+    var_null = float(v.mean())
+    std = float(v.std())
+    h = NormalDist().inv_cdf(0.5 + level/2) * std / math.sqrt(len(v))
+    C = var_actual / var_null if var_null > 0 else 0.0
+    lo = var_actual / (var_null + h) if var_null + h > 0 else 0.0
+    hi = var_actual / (var_null - h) if var_null - h > 0 else math.inf
+    return dict(C=C, var_actual=var_actual, var_null=var_null, var_null_std=std,
+                ci=(lo, hi), var_null_exact=var_exact)
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+    import time
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from explicit_formula import log_grid
+    from zeros_500 import ZEROS
+
+    rng = np.random.default_rng(1)
+    ef = ExplicitFormula(ZEROS)
+    for per_point, samples in [(False, 200), (True, 100)]:
+        xs = log_grid(10000, samples)
+        t0 = time.time()
+        r = cancellation(ef, xs, trials=15, per_point=per_point, rng=rng)
+        t1 = time.time()
+        big = null_variances(ef, xs, 2000 if not per_point else 200, per_point, rng=rng)
+        print(f"{'per-point' if per_point else 'per-trial'}: C={r['C']:.4f} "
+              f"CI=[{r['ci'][0]:.4f}, {r['ci'][1]:.4f}] in {1000*(t1-t0):.0f} ms | "
+              f"null: 15 trials {r['var_null']:.1f}, {len(big)} trials {big.mean():.1f}, "
+              f"closed form {r['var_null_exact']:.1f}")
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Number variance Σ²(L) from prefix counts
+
+spark_cross_L7.number_variance and the t3 window loops count zeros per
+window with sum(1 for g in zeros if t0 <= g < t0 + L): O(N) per window,
+O(N²/L) per curve. On the sorted unfolded zeros the counting function
+N(x) = #{u < x} is one searchsorted, so a window [x, x + L) costs
+N(x + L) - N(x) and a whole Σ²(L) curve is a few vectorized passes.
+
+Estimators (windows [x, x + L) inside [lo, hi]):
+  disjoint   x = lo + k·L, non-overlapping (the t3 scripts); the window
+             ends are the next starts, so one searchsorted per L
+  smoothed   every offset x: N(x + L) - N(x) is piecewise constant,
+             stepping +1 at u - L and -1 at u, so merging the two
+             sorted runs gives the exact length-weighted average over
+             all offsets in O(N) per L, whatever the window count
+
+Σ² is the plain variance of the window counts; mean, third central
+moment and skew come along. Poisson: Σ² = L; GUE: (1/π²)(log 2πL + γ + 1)
+asymptotically.
+
+Usage:
+  from number_variance import sigma2, window_moments
+  nv = sigma2(unfold(zeros), [0.5, 1, 2, 5, 10])          # disjoint
+  nv = sigma2(u, Ls, "smoothed")                           # all offsets
+  nv["var"], nv["mean"], nv["skew"], nv["n"]
+  window_moments(z, Ls, [starts_1, starts_2, ...])        # explicit offsets
+"""
+
+import numpy as np
+
+
+def _sorted(u):
+    u = np.asarray(u, dtype=np.float64)
+    return u if np.all(u[:-1] <= u[1:]) else np.sort(u)
+
+
+def window_counts(u, starts, L):
+    """#{u in [x, x + L)} for each start x (u sorted)."""
+    starts = np.asarray(starts, dtype=np.float64)
+    return np.searchsorted(u, starts + L) - np.searchsorted(u, starts)
+
+
+def _moments(c):
+    """n, mean, var, third central moment and skew of one count array."""
+    n = len(c)
+    if not n:
+        return 0, np.nan, np.nan, np.nan, np.nan
+    c = c.astype(np.float64)
+    m = c.mean()
+    d = c - m
+    v2, v3 = float((d*d).mean()), float((d**3).mean())
+    return n, float(m), v2, v3, v3 / v2**1.5 if v2 > 1e-6 else 0.0
+
+
+def _table(Ls, rows):
+    n, m, v2, v3, sk = zip(*rows) if rows else ((),) * 5
+    return dict(L=np.asarray(Ls, dtype=np.float64), n=np.array(n, dtype=np.int64),
+                mean=np.array(m), var=np.array(v2), mu3=np.array(v3), skew=np.array(sk))
+
+
+def window_moments(u, Ls, starts):
+    """
+    Count moments for each L over explicit window starts: starts is one
+    array shared by every L or a sequence of arrays, one per L.
+    Returns dict of arrays L, n, mean, var (Σ²), mu3, skew.
+    """
+    u = _sorted(u)
+    Ls = np.atleast_1d(np.asarray(Ls, dtype=np.float64))
+    shared = isinstance(starts, np.ndarray) and starts.ndim == 1
+    return _table(Ls, [_moments(window_counts(u, starts if shared else starts[i], L))
+                       for i, L in enumerate(Ls)])
+
+
+def _disjoint(u, L, lo, hi):
+    k = int(np.floor((hi - lo) / L + 1e-9)) + 1         # grid points lo, lo + L, ... <= hi
+    N = np.searchsorted(u, lo + L * np.arange(k))
+    return _moments(np.diff(N))
+
+
+def _smoothed(u, L, lo, hi):
+    """Exact average over every offset x in [lo, hi - L], weighted by length."""
+    a, b = lo, hi - L
+    if b <= a:
+        return _moments(np.zeros(0))
+    e = u - L                                      # u enters after u - L, leaves after u
+    n = len(u)
+    at_e = np.arange(n) + np.searchsorted(u, e, "right")      # merge two sorted runs
+    at_u = np.arange(n) + np.searchsorted(e, u, "left")
+    pos = np.empty(2*n)
+    step = np.empty(2*n, dtype=np.int64)
+    pos[at_e], pos[at_u], step[at_e], step[at_u] = e, u, 1, -1
+    keep = (pos > a) & (pos < b)
+    c0 = np.searchsorted(u, a + L, "right") - np.searchsorted(u, a, "right")
+    c = c0 + np.concatenate([[0], np.cumsum(step[keep])])
+    w = np.bincount(c, weights=np.diff(np.concatenate([[a], pos[keep], [b]])))
+    k = np.arange(len(w))                          # length of offsets with count k
+    m = float((w * k).sum() / w.sum())
+    d = k - m
+    v2, v3 = float((w * d*d).sum() / w.sum()), float((w * d*d*d).sum() / w.sum())
+    return int((b - a) / L), m, v2, v3, v3 / v2**1.5 if v2 > 1e-6 else 0.0
+
+
+def sigma2(u, Ls, estimator="disjoint", lo=None, hi=None):
+    """
+    Σ²(L) for each L over windows [x, x + L) inside [lo, hi] (default:
+    first and last point). estimator="disjoint": x = lo + k·L;
+    "smoothed": every x, so n is the number of disjoint-equivalent windows.
+    """
+    u = _sorted(u)
+    Ls = np.atleast_1d(np.asarray(Ls, dtype=np.float64))
+    lo = u[0] if lo is None else lo
+    hi = u[-1] if hi is None else hi
+    one = {"disjoint": _disjoint, "smoothed": _smoothed}[estimator]
+    return _table(Ls, [one(u, L, lo, hi) for L in Ls])
+
+
+if __name__ == "__main__":
+    import time
+
+    from spacing_stats import ZETA_LAW, unfold
+    from zero_catalog import zeta_first
+
+    u = unfold(zeta_first(1000), ZETA_LAW)
+    Ls = [0.5, 1.0, 2.0, 5.0]
+    nv = sigma2(u, Ls)
+    ref = []
+    for L in Ls:
+        x, c = u[0], []
+        while x + L <= u[-1]:
+            c.append(sum(1 for g in u if x <= g < x + L))
+            x += L
+        ref.append(np.var(c))
+    print("disjoint Σ²:", np.round(nv["var"], 4), "loop:", np.round(ref, 4))
+    print("smoothed Σ²:", np.round(sigma2(u, Ls, "smoothed")["var"], 4))
+
+    g = np.cumsum(np.random.default_rng(0).exponential(size=10**6))
+    Ls = np.geomspace(0.1, 100, 30)
+    t0 = time.time()
+    nv = sigma2(g, Ls, "smoothed")
+    print(f"10^6 Poisson points, 30 L, smoothed: {time.time() - t0:.1f}s, "
+          f"max |Σ²/L - 1| = {np.abs(nv['var'] / Ls - 1).max():.3f}")
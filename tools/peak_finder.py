@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Adaptive optimal-t search (coarse scan + Brent refinement, cached)
+
+The Brennpunkt scripts locate the best t by brute force: 100-400 evenly
+spaced evaluations per wavelength and number set. Here a coarse scan
+(a couple of dozen points) brackets every local optimum, and Brent's
+method (parabolic steps with golden-section fallback) refines each
+bracket to xtol in ~10 more evaluations.
+
+find_brennpunkt() wraps this for the backscatter objective of
+brennpunkt_grid and caches results by (set hash, N, λ, mode, ...) in
+memory and in brennpunkt_peaks.json in the shared cache directory, so
+repeated sweeps are free. cached_extremum() is the same cache for any
+other objective (spread, clustering), keyed by the caller.
+
+Usage:
+  from peak_finder import maximize, minimize, find_brennpunkt, cached_extremum, set_hash
+  t, val, n_evals = minimize(lambda t: spread(P, N, t), 0.0, 0.5)
+  t, ratio = find_brennpunkt(P, C, N, 21, mode='geo')
+  t, val = cached_extremum(('spread', set_hash(P), N), lambda t: spread(P, N, t), 0.0, 0.5, sense='min')
+"""
+
+import hashlib
+import json
+import math
+import os
+
+import numpy as np
+
+from brennpunkt_grid import backscatter_row
+from prime_store import cache_dir
+
+GOLDEN = 0.5 * (3 - math.sqrt(5))
+
+
+# =============================================================================
+# 1-D OPTIMIZATION
+# =============================================================================
+
+def brent_min(f, a, b, xtol=1e-5, maxiter=60):
+    """
+    Minimize f on [a, b] with Brent's method.
+
+    Returns (x, f(x), n_evals).
+    """
+    x = w = v = a + GOLDEN * (b - a)
+    fx = fw = fv = f(x)
+    n = 1
+    d = e = 0.0
+    for _ in range(maxiter):
+        m = 0.5 * (a + b)
+        tol1 = 1e-10 * abs(x) + xtol / 3
+        tol2 = 2 * tol1
+        if abs(x - m) <= tol2 - 0.5 * (b - a):
+            break
+        golden_step = True
+        if abs(e) > tol1:
+            # Try a parabolic step through x, w, v
+            r = (x - w) * (fx - fv)
+            q = (x - v) * (fx - fw)
+            p = (x - v) * q - (x - w) * r
+            q = 2 * (q - r)
+            if q > 0:
+                p = -p
+            q = abs(q)
+            if abs(p) < abs(0.5 * q * e) and q * (a - x) < p < q * (b - x):
+                e, d = d, p / q
+                u = x + d
+                if u - a < tol2 or b - u < tol2:
+                    d = math.copysign(tol1, m - x)
+                golden_step = False
+        if golden_step:
+            e = (a - x) if x >= m else (b - x)
+            d = GOLDEN * e
+        u = x + d if abs(d) >= tol1 else x + math.copysign(tol1, d)
+        fu = f(u)
+        n += 1
+        if fu <= fx:
+            if u >= x:
+                a = x
+            else:
+                b = x
+            v, w, x = w, x, u
+            fv, fw, fx = fw, fx, fu
+        else:
+            if u < x:
+                a = u
+            else:
+                b = u
+            if fu <= fw or w == x:
+                v, w = w, u
+                fv, fw = fw, fu
+            elif fu <= fv or v == x or v == w:
+                v, fv = u, fu
+    return x, fx, n
+
+
+def find_peaks(f, lo, hi, n_coarse=24, xtol=1e-5, f_vec=None, top=3):
+    """
+    Local maxima of f on [lo, hi]: coarse scan, then Brent on the `top`
+    best brackets.
+
+    f_vec, if given, evaluates a whole array of t at once for the coarse
+    scan. Returns ([(t, value), ...] best first, n_evals).
+    """
+    ts = np.linspace(lo, hi, n_coarse)
+    vals = np.asarray(f_vec(ts) if f_vec else [f(t) for t in ts], dtype=np.float64)
+    n = len(ts)
+    n_evals = n
+
+    cand = [i for i in range(n)
+            if (i == 0 or vals[i] >= vals[i - 1]) and (i == n - 1 or vals[i] >= vals[i + 1])]
+    cand.sort(key=lambda i: -vals[i])
+    peaks = []
+    for i in cand[:top]:
+        a, b = ts[max(i - 1, 0)], ts[min(i + 1, n - 1)]
+        t, neg, k = brent_min(lambda t: -f(t), a, b, xtol)
+        n_evals += k
+        # Brent may stop short of an endpoint optimum: keep the coarse point if better
+        peaks.append((float(t), float(-neg)) if -neg >= vals[i] else (float(ts[i]), float(vals[i])))
+    peaks.sort(key=lambda p: -p[1])
+    return peaks, n_evals
+
+
+def maximize(f, lo, hi, n_coarse=24, xtol=1e-5, f_vec=None, top=3):
+    """Global max over [lo, hi] as (t, value, n_evals)."""
+    peaks, n = find_peaks(f, lo, hi, n_coarse, xtol, f_vec, top)
+    return peaks[0][0], peaks[0][1], n
+
+
+def minimize(f, lo, hi, n_coarse=24, xtol=1e-5, f_vec=None, top=3):
+    """Global min over [lo, hi] as (t, value, n_evals)."""
+    g_vec = (lambda ts: -np.asarray(f_vec(ts))) if f_vec else None
+    t, neg, n = maximize(lambda t: -f(t), lo, hi, n_coarse, xtol, g_vec, top)
+    return t, -neg, n
+
+
+# =============================================================================
+# CACHED BRENNPUNKT SEARCH
+# =============================================================================
+
+_cache = None
+
+
+def _cache_file():
+    return os.path.join(cache_dir(), "brennpunkt_peaks.json")
+
+
+def _load_cache():
+    global _cache
+    if _cache is None:
+        try:
+            with open(_cache_file()) as f:
+                _cache = json.load(f)
+        except (OSError, ValueError):
+            _cache = {}
+    return _cache
+
+
+def _save_cache():
+    # Keep entries other processes saved meanwhile; a per-process temp file
+    # means concurrent scans never os.replace a half-written one
+    try:
+        with open(_cache_file()) as f:
+            _cache.update({k: v for k, v in json.load(f).items() if k not in _cache})
+    except (OSError, ValueError):
+        pass
+    tmp = f"{_cache_file()}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(_cache, f)
+    os.replace(tmp, _cache_file())
+
+
+def set_hash(nums):
+    """Stable short hash of a number set (order-sensitive, as int64)."""
+    return hashlib.sha1(np.asarray(nums, dtype=np.int64).tobytes()).hexdigest()[:16]
+
+
+def cached_extremum(key, f, lo, hi, n_coarse=24, xtol=1e-5, top=3, sense='max', cache=True):
+    """
+    (t, value) of maximize() (sense='max') or minimize() of f on [lo, hi],
+    cached under key, a tuple that must name the objective and its data
+    (e.g. a tag, set_hash(nums), N); the search parameters are added.
+    """
+    key = "|".join(map(str, tuple(key) + (lo, hi, n_coarse, xtol, top, sense)))
+    if cache:
+        hit = _load_cache().get(key)
+        if hit is not None:
+            return tuple(hit)
+    search = maximize if sense == 'max' else minimize
+    t, val, _ = search(f, lo, hi, n_coarse, xtol, top=top)
+    if cache:
+        _load_cache()[key] = [t, val]
+        _save_cache()
+    return t, val
+
+
+def find_brennpunkt(P, C, N, lam, mode='geo', lo=0.01, hi=0.49, cap=1e6, eps=1e-10,
+                    n_coarse=None, xtol=1e-5, cache=True, **kw):
+    """
+    Optimal t for one wavelength: maximizes the P/C backscatter ratio,
+    or P's backscatter alone when C is None. kw (R, geometry, cutoff,
+    norm) is passed to brennpunkt_grid.backscatter_row.
+
+    The backscatter oscillates in t roughly λ times faster as λ grows,
+    so the coarse scan defaults to max(32, 6λ) points to bracket every
+    lobe.
+
+    Returns (t, value). Ratios >= cap count as 0, like the scalar scans.
+    """
+    if n_coarse is None:
+        n_coarse = int(max(32, 6 * lam))
+
+    def f(t):
+        bp = backscatter_row(P, N, t, [lam], mode=mode, **kw)[0]
+        if C is None:
+            return bp
+        bc = backscatter_row(C, N, t, [lam], mode=mode, **kw)[0]
+        r = bp / bc if bc > eps else 0.0
+        return r if r < cap else 0.0
+
+    key = ('backscatter', set_hash(P), None if C is None else set_hash(C), N, float(lam), mode, cap,
+           sorted(kw.items()))
+    return cached_extremum(key, f, lo, hi, n_coarse, xtol, top=5, cache=cache)
+
+
+if __name__ == "__main__":
+    import time
+    from brennpunkt_grid import ratio_surface, best_t
+    from sieve import simple_sieve
+
+    N = 500
+    P = simple_sieve(N)
+    pset = set(P.tolist())
+    C = np.array([n for n in range(4, N + 1) if n not in pset])
+    kw = dict(geometry='rz', cutoff=0, norm='all')
+    ts = np.linspace(0.01, 0.49, 400)
+    for lam in [3, 8, 13, 21]:
+        _, _, ratio = ratio_surface(P, C, N, ts, [lam], **kw)
+        (bt,), (br,) = best_t(ts, ratio)
+        t0 = time.time()
+        t, r = find_brennpunkt(P, C, N, lam, cache=False, **kw)
+        print(f"λ={lam:>3}: 400-point scan t={bt:.4f} ({br:.1f}x)   adaptive t={t:.5f} ({r:.1f}x) "
+              f"in {1000*(time.time()-t0):.0f} ms")
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Persistent prime table, memory-mapped
+
+Sieve once, then every script opens the same file in milliseconds
+instead of re-sieving into a Python list or set. One file holds:
+
+  header   64 bytes: magic, limit, prime count, prime dtype
+  bitmap   odd-only, bit-packed: bit i <-> n = 2i+1 is prime
+  primes   all primes <= limit as uint32 (uint64 past 2^32)
+
+Both sections are np.memmap views, so primes_in() and friends return
+zero-copy slices of the file. Files live in the cache directory
+($PRIMES_CACHE, default ~/.cache/primes-research).
+
+Usage:
+  from prime_store import open_store
+  ps = open_store(10**8)           # builds on first use, then just maps
+  ps.is_prime(97), ps.pi(10**6), ps.nth_prime(10**5), ps.primes_in(100, 200)
+
+  python3 prime_store.py 1000000000    # pre-build a table
+"""
+
+import os
+import struct
+import sys
+import time
+
+import numpy as np
+
+from sieve import iter_segments
+
+MAGIC = b"PRMSTOR1"
+HEADER = struct.Struct("<8sQQQ32x")      # magic, limit, n_primes, itemsize
+BUILD_WINDOW = 1 << 24                   # multiple of 16: whole bitmap bytes
+
+
+def cache_dir():
+    """Shared on-disk cache directory (created on demand)."""
+    path = os.environ.get("PRIMES_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "primes-research"))
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def store_path(limit):
+    return os.path.join(cache_dir(), f"primes_{limit}.bin")
+
+
+# =============================================================================
+# BUILD
+# =============================================================================
+
+def build(limit, path=None, verbose=True):
+    """
+    Sieve [0, limit] segment by segment and write the store file.
+
+    Memory stays at one window; the prime array is staged in a side
+    file and appended after the bitmap.
+    """
+    path = path or store_path(limit)
+    dtype = np.uint32 if limit < 2**32 else np.uint64
+    t0 = time.time()
+    n_primes = 0
+    tmp, staged = path + ".tmp", path + ".primes.tmp"
+    with open(tmp, "wb") as out, open(staged, "wb") as side:
+        out.write(HEADER.pack(MAGIC, limit, 0, np.dtype(dtype).itemsize))
+        for lo, hi, ps in iter_segments(0, limit + 1, BUILD_WINDOW):
+            # Bitmap of odd numbers lo+1, lo+3, ... < lo+window (padded to whole bytes)
+            flags = np.zeros(BUILD_WINDOW // 2, dtype=bool)
+            odd = ps[ps % 2 == 1]
+            flags[(odd - lo - 1) // 2] = True
+            nbytes = (hi - lo + 15) // 16
+            out.write(np.packbits(flags, bitorder="little")[:nbytes].tobytes())
+            ps.astype(dtype).tofile(side)
+            n_primes += len(ps)
+    with open(tmp, "r+b") as out, open(staged, "rb") as side:
+        out.seek(0, os.SEEK_END)
+        while True:
+            chunk = side.read(1 << 24)
+            if not chunk:
+                break
+            out.write(chunk)
+        out.seek(0)
+        out.write(HEADER.pack(MAGIC, limit, n_primes, np.dtype(dtype).itemsize))
+    os.remove(staged)
+    os.replace(tmp, path)
+    if verbose:
+        print(f"Built {path}: {n_primes:,} primes <= {limit:,} in {time.time() - t0:.1f}s")
+    return path
+
+
+# =============================================================================
+# ACCESS
+# =============================================================================
+
+class PrimeStore:
+    """Read-only, memory-mapped view of a store file."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            magic, limit, n_primes, itemsize = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not a prime store file")
+        self.path = path
+        self.limit = limit
+        self.n_bits_bytes = (limit + 16) // 16
+        self.bits = np.memmap(path, dtype=np.uint8, mode="r", offset=HEADER.size,
+                              shape=(self.n_bits_bytes,))
+        dtype = np.uint32 if itemsize == 4 else np.uint64
+        self.primes = np.memmap(path, dtype=dtype, mode="r",
+                                offset=HEADER.size + self.n_bits_bytes, shape=(n_primes,))
+
+    def __len__(self):
+        return len(self.primes)
+
+    def _check(self, n):
+        if np.any(np.asarray(n) > self.limit):
+            raise ValueError(f"beyond store limit {self.limit:,}; open a larger store")
+
+    def is_prime(self, n):
+        """Primality by bitmap lookup; n may be an int or an integer array."""
+        self._check(n)
+        if np.ndim(n) == 0:
+            n = int(n)
+            if n < 3:
+                return n == 2
+            return n % 2 == 1 and bool(self.bits[n >> 4] >> ((n >> 1) & 7) & 1)
+        n = np.asarray(n, dtype=np.int64)
+        half = np.maximum(n, 0) >> 1
+        odd = (n % 2 == 1) & (n > 2)
+        res = odd & ((self.bits[half >> 3] >> (half & 7)) & 1).astype(bool)
+        return res | (n == 2)
+
+    def pi(self, x):
+        """Number of primes <= x."""
+        self._check(x)
+        return int(np.searchsorted(self.primes, x, side="right"))
+
+    def nth_prime(self, k):
+        """k-th prime, 1-indexed (nth_prime(1) == 2)."""
+        if not 1 <= k <= len(self.primes):
+            raise ValueError(f"nth_prime({k}) outside store (1..{len(self.primes):,})")
+        return int(self.primes[k - 1])
+
+    def primes_in(self, a, b):
+        """Zero-copy view of the primes p with a <= p < b."""
+        self._check(b - 1)
+        i, j = np.searchsorted(self.primes, [a, b])
+        return self.primes[i:j]
+
+
+def open_store(limit, path=None):
+    """
+    Store covering [0, limit]: reuse any cached file at least that large,
+    otherwise build one.
+    """
+    if path is None:
+        best = None
+        for name in os.listdir(cache_dir()):
+            if name.startswith("primes_") and name.endswith(".bin"):
+                have = int(name[len("primes_"):-len(".bin")])
+                if have >= limit and (best is None or have < best):
+                    best = have
+        path = store_path(best if best is not None else limit)
+    if not os.path.exists(path):
+        build(limit, path)
+    return PrimeStore(path)
+
+
+if __name__ == "__main__":
+    limit = int(sys.argv[1]) if len(sys.argv) > 1 else 10**8
+    t0 = time.time()
+    ps = open_store(limit)
+    print(f"Opened {ps.path} in {1000 * (time.time() - t0):.1f} ms")
+    print(f"  pi({limit:,}) = {ps.pi(limit):,}")
+    print(f"  largest prime <= limit: {ps.nth_prime(len(ps)):,}")
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Random-matrix ensembles: β-Hermite (GOE / GUE / GSE / any β) and CUE
+
+The null models in the scripts are home-made: t3_gue_sim runs a Python
+QL iteration on a tridiagonal model, spark_cross_L8 and t3_power stop at
+"can't do eigendecomposition", lfunction_test* and gue_band_test chain
+i.i.d. Wigner-surmise spacings (no long-range rigidity at all). Here:
+
+  β-Hermite  Dumitriu-Edelman tridiagonal model
+               diag N(0, 1), off-diag χ_{β(N-1)}, ..., χ_β / √2
+             joint density ∝ Π|λi - λj|^β exp(-Σλ²/2), semicircle on
+             [-√(2βN), √(2βN)]; eigenvalues by LAPACK sterf (O(N²),
+             scipy) or stacked dense eigvalsh without scipy
+  CUE        Haar unitaries: QR of a complex Ginibre matrix with the
+             phases of diag(R) divided out (Mezzadri); eigenphases from
+             the Hermitian Cayley transform i(I + U)⁻¹(I - U), whose
+             eigenvalues are tan(θ/2) (5x faster than a unitary eig)
+
+Spectra come unfolded to unit mean spacing (integrated semicircle /
+Nθ/2π). Batches are cut into chunks of CHUNK // N matrices, chunk j
+drawn from its own stream seeded by (ensemble, N, seed, j), so a batch
+is the same for any worker count and a cached batch extends without
+redrawing. Unfolded batches are cached as .npy in
+prime_store.cache_dir() keyed by (β, N, seed).
+
+Usage:
+  from random_matrix import spectra, bulk, sequence
+  u = spectra(2, 100, 5000, seed=1, workers=8)   # (5000, 100) unfolded GUE
+  u = bulk(u, 0.5)                                # central half, density ~1
+  u = spectra("cue", 64, 1000)                     # CUE eigenphases, unfolded
+  z = sequence(500, beta=1)                       # one GOE bulk run of 500 points
+"""
+
+import math
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+try:
+    from scipy.linalg import eigvalsh_tridiagonal
+except ImportError:
+    eigvalsh_tridiagonal = None
+
+CHUNK = 1 << 12         # eigenvalues per stream / pool task
+NAMES = {"goe": 1.0, "gue": 2.0, "gse": 4.0, "cue": "cue"}
+
+
+def _beta(beta):
+    if isinstance(beta, str):
+        if beta not in NAMES:
+            raise ValueError(f"unknown ensemble {beta!r}, expected one of {sorted(NAMES)} or beta > 0")
+        return NAMES[beta]
+    beta = float(beta)
+    if not beta > 0:
+        raise ValueError(f"beta must be > 0 or 'cue', got {beta!r}")
+    return beta
+
+
+def _key(beta):
+    return "cue" if beta == "cue" else f"b{beta:g}"
+
+
+def tridiag_eigvals(d, e):
+    """Sorted eigenvalues of symmetric tridiagonal matrices: d (B, N), e (B, N-1)."""
+    d, e = np.atleast_2d(d), np.atleast_2d(e)
+    if eigvalsh_tridiagonal is not None:
+        return np.array([eigvalsh_tridiagonal(a, b, lapack_driver="sterf") for a, b in zip(d, e)])
+    B, N = d.shape
+    M = np.zeros((B, N, N))
+    i = np.arange(N)
+    M[:, i, i] = d
+    M[:, i[:-1], i[1:]] = e
+    M[:, i[1:], i[:-1]] = e
+    return np.linalg.eigvalsh(M)
+
+
+def hermite(beta, N, count=1, rng=None):
+    """Eigenvalues of count β-Hermite matrices of size N, shape (count, N)."""
+    rng = rng or np.random.default_rng()
+    d = rng.standard_normal((count, N))
+    e = np.sqrt(rng.chisquare(beta * np.arange(N - 1, 0, -1), size=(count, N - 1)) / 2)
+    return tridiag_eigvals(d, e)
+
+
+def cue(N, count=1, rng=None):
+    """Eigenphases in [0, 2π) of count Haar unitaries of size N, sorted, shape (count, N)."""
+    rng = rng or np.random.default_rng()
+    Z = (rng.standard_normal((count, N, N)) + 1j*rng.standard_normal((count, N, N))) / math.sqrt(2)
+    Q, R = np.linalg.qr(Z)
+    r = np.diagonal(R, axis1=1, axis2=2)
+    Q = Q * (r / np.abs(r))[:, None, :]
+    I = np.eye(N)
+    H = 1j * np.linalg.solve(I + Q, I - Q)                  # Cayley: eigenvalues tan(θ/2)
+    H = (H + H.conj().transpose(0, 2, 1)) / 2
+    return np.sort(np.mod(2*np.arctan(np.linalg.eigvalsh(H)), 2*math.pi), axis=1)
+
+
+def unfold(eigs, beta):
+    """Unit mean spacing: N·F(λ/√(2βN)) with F the semicircle CDF, or Nθ/2π for CUE."""
+    eigs = np.asarray(eigs, dtype=np.float64)
+    N = eigs.shape[-1]
+    if beta == "cue":
+        return eigs * N / (2*math.pi)
+    y = np.clip(eigs / math.sqrt(2 * beta * N), -1.0, 1.0)
+    return N * (0.5 + (y*np.sqrt(1 - y*y) + np.arcsin(y)) / math.pi)
+
+
+def _per_chunk(N):
+    return max(1, CHUNK // N)
+
+
+def _chunk(beta, N, seed, j):
+    rng = np.random.default_rng([seed, j, N, zlib.crc32(_key(beta).encode())])
+    m = _per_chunk(N)
+    raw = cue(N, m, rng) if beta == "cue" else hermite(beta, N, m, rng)
+    return unfold(raw, beta)
+
+
+def _task(args):
+    return _chunk(*args)
+
+
+def _cache_path(beta, N, seed):
+    from prime_store import cache_dir
+    return os.path.join(cache_dir(), f"rmt_{_key(beta)}_N{N}_s{seed}.npy")
+
+
+def spectra(beta, N, count, seed=0, workers=1, cache=True):
+    """
+    count unfolded spectra of size N, shape (count, N): beta a number,
+    'goe' / 'gue' / 'gse' or 'cue'. Deterministic in (beta, N, seed);
+    with cache the batch is kept on disk and only missing chunks drawn.
+    """
+    beta = _beta(beta)
+    path = _cache_path(beta, N, seed) if cache else None
+    have = np.load(path) if path and os.path.exists(path) else np.zeros((0, N))
+    m = _per_chunk(N)
+    todo = [(beta, N, seed, j) for j in range(len(have) // m, -(-count // m))]
+    if todo:
+        if workers == 1 or len(todo) == 1:
+            new = [_task(t) for t in todo]
+        else:
+            with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+                new = list(pool.map(_task, todo))
+        have = np.concatenate([have] + new)
+        if path:
+            with open(path + ".tmp", "wb") as f:
+                np.save(f, have)
+            os.replace(path + ".tmp", path)
+    return have[:count]
+
+
+def bulk(u, frac=0.5):
+    """Central fraction of each spectrum (columns), where the unfolding is cleanest."""
+    u = np.asarray(u)
+    N = u.shape[-1]
+    k = max(2, int(round(N * frac)))
+    lo = (N - k) // 2
+    return u[..., lo:lo + k]
+
+
+def sequence(n, beta=2, seed=0):
+    """One unfolded bulk run of n points (unit mean spacing, starting at 0)."""
+    beta = _beta(beta)
+    N = n if beta == "cue" else 2 * n
+    u = bulk(spectra(beta, N, 1, seed, cache=False)[0], n / N)
+    return u - u[0]
+
+
+if __name__ == "__main__":
+    import time
+
+    from gue_reference import R_MEAN
+    from spacing_stats import ratios
+
+    for name, b in (("goe", 1), ("gue", 2), ("gse", 4), ("cue", 2)):
+        t0 = time.time()
+        u = bulk(spectra(name, 200, 512, seed=7, cache=False))
+        s = np.diff(u, axis=1)
+        r = np.concatenate([ratios(x) for x in s])
+        print(f"{name}: 512 × N=200 in {time.time() - t0:.2f}s, mean spacing {s.mean():.4f}, "
+              f"var {s.var():.4f}, <r̃> {r.mean():.4f} (large N {R_MEAN[b]})")
+
+    t0 = time.time()
+    u = spectra(2, 1000, 1, seed=1, cache=False)
+    print(f"GUE N=1000: {1000*(time.time() - t0):.0f} ms, unfolded range [{u.min():.2f}, {u.max():.2f}]")
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Segmented sieve of Eratosthenes (numpy, odd-only segments)
+
+Sieves [lo, hi) one window at a time against a cached table of base
+primes up to sqrt(hi), so memory stays bounded by the window size no
+matter how far above 10^12 the search starts.
+
+Usage:
+  from sieve import base_primes, segment_primes, iter_segments
+  for lo, hi, ps in iter_segments(10**12, 10**12 + 10**8):
+      ...
+"""
+
+from math import isqrt
+
+import numpy as np
+
+DEFAULT_WINDOW = 1 << 24   # numbers per segment (~8 MB of flags)
+
+_base_cache = np.zeros(0, dtype=np.int64)
+_base_limit = 1
+
+
+# =============================================================================
+# BASE PRIMES
+# =============================================================================
+
+def simple_sieve(limit):
+    """Primes <= limit as an int64 array (plain Eratosthenes)."""
+    if limit < 2:
+        return np.zeros(0, dtype=np.int64)
+    is_prime = np.ones(limit + 1, dtype=bool)
+    is_prime[0:2] = False
+    is_prime[4::2] = False
+    for i in range(3, isqrt(limit) + 1, 2):
+        if is_prime[i]:
+            is_prime[i*i::2*i] = False
+    return np.flatnonzero(is_prime).astype(np.int64)
+
+
+def base_primes(limit):
+    """
+    Primes <= limit, served from a module-level cache.
+
+    The cache only ever grows (doubling), so a sweep that creeps upward
+    re-sieves the base table O(log) times instead of once per window.
+    """
+    global _base_cache, _base_limit
+    if limit > _base_limit:
+        new_limit = max(limit, 2 * _base_limit, 1 << 16)
+        _base_cache = simple_sieve(new_limit)
+        _base_limit = new_limit
+    return _base_cache[:np.searchsorted(_base_cache, limit, side='right')]
+
+
+# =============================================================================
+# SEGMENTS
+# =============================================================================
+
+def segment_primes(lo, hi, base=None):
+    """
+    Primes p with lo <= p < hi as an int64 array.
+
+    base: optional array of primes covering sqrt(hi); fetched from the
+    cache when omitted.
+    """
+    lo = max(lo, 0)
+    if hi <= lo:
+        return np.zeros(0, dtype=np.int64)
+    if base is None:
+        base = base_primes(isqrt(hi - 1) + 1)
+
+    first = lo | 1                      # first odd number >= lo
+    n = (hi - first + 1) // 2           # odd numbers first, first+2, ..., < hi
+    if n <= 0:
+        return np.array([2], dtype=np.int64) if lo <= 2 < hi else np.zeros(0, dtype=np.int64)
+    flags = np.ones(n, dtype=bool)
+    if first == 1:
+        flags[0] = False
+
+    for p in base:
+        p = int(p)
+        if p == 2:
+            continue
+        pp = p * p
+        if pp >= hi:
+            break
+        start = max(pp, ((first + p - 1) // p) * p)
+        if start % 2 == 0:
+            start += p
+        flags[(start - first) // 2::p] = False
+
+    primes = first + 2 * np.flatnonzero(flags).astype(np.int64)
+    if lo <= 2 < hi:
+        primes = np.concatenate(([2], primes)).astype(np.int64)
+    return primes
+
+
+def iter_segments(start, end, window=DEFAULT_WINDOW):
+    """
+    Yield (lo, hi, primes) for consecutive windows covering [start, end).
+
+    The base table is sized once for the whole range up front.
+    """
+    base = base_primes(isqrt(max(end - 1, 1)) + 1)
+    lo = start
+    while lo < end:
+        hi = min(lo + window, end)
+        yield lo, hi, segment_primes(lo, hi, base)
+        lo = hi
+
+
+if __name__ == "__main__":
+    # Sanity check against the plain sieve
+    ref = simple_sieve(10**6)
+    seg = np.concatenate([ps for _, _, ps in iter_segments(0, 10**6 + 1, window=65536)])
+    print(f"pi(10^6) = {len(seg)} (expected {len(ref)}), match={np.array_equal(ref, seg)}")
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Zero catalog: every L-function zero list in one indexed, mmapped store
+
+Zeros are scattered over zeros_500.py, zeros600.txt, z.txt, the
+chi*_zeros.py / beta_zeros.py modules and the GP dumps (cross_L_zeros.txt,
+clz*_out.txt), or recomputed at startup through gp / mpmath. The catalog
+keeps them in one directory in the cache ($PRIMES_CACHE/zeros):
+
+  zeros.f64    float64 ordinates, one sorted run per L-function
+  index.json   label -> offset, count, lo, hi, complete_to, sources
+
+Runs are append-only: merging new zeros into a label writes a new run
+and repoints the index (atomic rename); compact() reclaims dead runs.
+Zeros that only extend the last run in the file past its top are
+appended to it in place, so chunked generation does not leave dead runs.
+complete_to is the height up to which a label's list has no gaps, so
+get(label, hi, compute) only calls compute when the stored list does
+not reach hi, then persists the result.
+
+Labels:
+  zeta                    Riemann zeta
+  dirichlet:q.n           Dirichlet L(s, χ) for Conrey label q.n
+                          (GP's znstar(q,1) coordinate [a] for prime q
+                          is n = g^a mod q, g the least primitive root)
+  dedekind:<poly>         Dedekind zeta of the field, e.g. dedekind:x^3-x^2-1
+  ec:[a1,a2,a3,a4,a6]     elliptic curve L-function
+
+Usage:
+  from zero_catalog import open_catalog, dirichlet_label
+  cat = open_catalog()               # ingests the repo files on first use
+  cat.zeros('zeta', hi=300)          # zero-copy memmap slice
+  cat.zeros(dirichlet_label(5, 2))   # GP's Q5_CHAR_1
+  cat.get('zeta', 1000, compute=lambda T: gp_zeros(T))
+
+  python3 zero_catalog.py            # ingest the repo files (merging) and list the catalog
+  python3 zero_catalog.py --rebuild  # delete the catalog first (computed zeros are lost)
+"""
+
+import ast
+import json
+import os
+import re
+
+import numpy as np
+
+from prime_store import cache_dir
+
+ZETA = "zeta"
+TOL = 1e-6              # zeros closer than this are one zero (sources differ in precision)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# =============================================================================
+# LABELS
+# =============================================================================
+
+def primitive_root(q):
+    """Least primitive root mod prime q."""
+    phi = q - 1
+    factors = {p for p in range(2, phi + 1) if phi % p == 0 and all(p % d for d in range(2, p))}
+    return next(g for g in range(2, q) if all(pow(g, phi // p, q) != 1 for p in factors))
+
+
+def dirichlet_label(q, n):
+    """Label of L(s, χ_q(n, ·)); the principal character's zeros are zeta's."""
+    n %= q
+    if n == 1 or q == 1:
+        return ZETA
+    return f"dirichlet:{q}.{n}"
+
+
+def gp_char_label(q, a):
+    """Label for GP's lfuncreate([znstar(q,1), [a]]) with q prime."""
+    return dirichlet_label(q, pow(primitive_root(q), a, q))
+
+
+def dedekind_label(pol):
+    return "dedekind:" + re.sub(r"\s+", "", str(pol))
+
+
+def ec_label(coeffs):
+    return "ec:[" + ",".join(str(int(c)) for c in coeffs) + "]"
+
+
+def gp_zeros(lfun, T, timeout=120):
+    """
+    Ordinates in (0, T] from GP's lfunzeros(lfun, T), for use as a
+    get() compute function. lfun is GP source, e.g. 1 or
+    'lfuncreate([znstar(7,1),[2]])'; runs on the shared gp_pool.
+    """
+    from gp_pool import gp_pool
+    return sorted(gp_pool().run(f"lfunzeros({lfun},{T})", timeout=timeout))
+
+
+# =============================================================================
+# STORE
+# =============================================================================
+
+def catalog_dir():
+    path = os.path.join(cache_dir(), "zeros")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+class ZeroCatalog:
+    """Index + append-only float64 run file; see module docstring."""
+
+    def __init__(self, path=None):
+        self.path = path or catalog_dir()
+        os.makedirs(self.path, exist_ok=True)
+        self.data_path = os.path.join(self.path, "zeros.f64")
+        self.index_path = os.path.join(self.path, "index.json")
+        try:
+            with open(self.index_path) as f:
+                self.index = json.load(f)
+        except (OSError, ValueError):
+            self.index = {}
+        self._map = None
+        self._map_size = -1
+
+    def _data(self):
+        size = os.path.getsize(self.data_path) if os.path.exists(self.data_path) else 0
+        if size != self._map_size:
+            self._map = np.memmap(self.data_path, dtype=np.float64, mode="r") if size else np.empty(0)
+            self._map_size = size
+        return self._map
+
+    def _save_index(self):
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.index, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.index_path)
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    def __contains__(self, label):
+        return label in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def labels(self, prefix=""):
+        return sorted(k for k in self.index if k.startswith(prefix))
+
+    def info(self, label):
+        return dict(self.index[label])
+
+    def complete_to(self, label):
+        """Height up to which the stored list has no gaps (0 if unknown label)."""
+        return self.index[label]["complete_to"] if label in self.index else 0.0
+
+    def zeros(self, label, lo=None, hi=None):
+        """Ordinates of label in [lo, hi] (memmap view, ascending)."""
+        e = self.index[label]
+        run = self._data()[e["offset"]:e["offset"] + e["count"]]
+        i = 0 if lo is None else np.searchsorted(run, lo, side="left")
+        j = len(run) if hi is None else np.searchsorted(run, hi, side="right")
+        return run[i:j]
+
+    def count(self, label, lo=None, hi=None):
+        return len(self.zeros(label, lo, hi))
+
+    def first(self, label, n):
+        """The first n zeros; ValueError if fewer are stored."""
+        z = self.zeros(label)
+        if len(z) < n:
+            raise ValueError(f"{label}: {len(z)} zeros stored, {n} requested")
+        return z[:n]
+
+    def get(self, label, hi, compute=None, lo=None):
+        """
+        Zeros of label in [lo, hi], calling compute(hi) -> ordinates only
+        when the stored list is not complete up to hi (the result is
+        added to the catalog).
+        """
+        if self.complete_to(label) < hi:
+            if compute is None:
+                have = self.complete_to(label)
+                raise KeyError(f"{label}: complete to {have}, {hi} requested and no compute given")
+            self.add(label, compute(hi), complete_to=hi, source="computed")
+        return self.zeros(label, lo, hi)
+
+    # -------------------------------------------------------------------------
+    # Updates
+    # -------------------------------------------------------------------------
+
+    def add(self, label, zeros, complete_to=None, source=None):
+        """
+        Merge zeros into label. Existing values win within TOL, so add the
+        most precise source first. complete_to defaults to max(zeros)
+        (lists are assumed to start at the lowest zero).
+        """
+        new = np.sort(np.asarray(zeros, dtype=np.float64))
+        new = new[new > 0]
+        e = self.index.get(label)
+        old = None
+        if e is not None:
+            old = np.array(self.zeros(label))
+            if len(old):
+                k = np.clip(np.searchsorted(old, new), 1, len(old) - 1) if len(old) > 1 else np.zeros(len(new), int)
+                near = np.minimum(np.abs(old[k] - new), np.abs(old[np.maximum(k - 1, 0)] - new))
+                new = np.sort(np.concatenate([old, new[near > TOL]]))
+        if len(new) > 1:
+            # Collapse duplicates inside one source (e.g. overlapping dumps)
+            new = new[np.concatenate([[True], np.diff(new) > TOL])]
+        offset, tail = self._data_map_len(), new
+        if (old is not None and e["offset"] + e["count"] == offset and len(new) >= len(old)
+                and np.array_equal(new[:len(old)], old)):
+            # Pure extension of the file's last run: append the delta only
+            offset, tail = e["offset"], new[len(old):]
+        with open(self.data_path, "ab") as f:
+            tail.tofile(f)
+        sources = list(e["sources"]) if e else []
+        if source and source not in sources:
+            sources.append(source)
+        reach = float(complete_to if complete_to is not None else (new[-1] if len(new) else 0.0))
+        self.index[label] = dict(
+            offset=offset, count=len(new),
+            lo=float(new[0]) if len(new) else 0.0, hi=float(new[-1]) if len(new) else 0.0,
+            complete_to=max(reach, e["complete_to"] if e else 0.0), sources=sources)
+        self._save_index()
+
+    def _data_map_len(self):
+        return os.path.getsize(self.data_path) // 8 if os.path.exists(self.data_path) else 0
+
+    def compact(self):
+        """Rewrite the run file without superseded runs."""
+        tmp = self.data_path + ".tmp"
+        offset = 0
+        with open(tmp, "wb") as f:
+            for label in sorted(self.index):
+                z = np.array(self.zeros(label))
+                z.tofile(f)
+                self.index[label]["offset"] = offset
+                offset += len(z)
+        self._map = None
+        self._map_size = -1
+        os.replace(tmp, self.data_path)
+        self._save_index()
+
+
+# =============================================================================
+# INGEST
+# =============================================================================
+
+def _py_list(path):
+    """The first list literal assigned in a zeros module (without importing it)."""
+    for node in ast.parse(open(path).read()).body:
+        if isinstance(node, ast.Assign) and isinstance(node.value, ast.List):
+            return ast.literal_eval(node.value)
+    raise ValueError(f"no list literal in {path}")
+
+
+def _column(path):
+    return np.loadtxt(path)
+
+
+def _gp_lines(path):
+    """'Q5_CHAR_1: ...' / 'Q5_1: ...' lines of the cross-L GP dumps -> {label: zeros}."""
+    out = {}
+    for line in open(path):
+        m = re.match(r"\s*Q(\d+)_(?:CHAR_)?(\d+):(.*)", line)
+        if m:
+            out[gp_char_label(int(m.group(1)), int(m.group(2)))] = [float(x) for x in m.group(3).split()]
+    return out
+
+
+# Most precise first: on merge, existing values win within TOL.
+# The chi*.py characters were identified by evaluating L(1/2 + iγ, χ) at
+# their first zeros; chi5_zeros.py ("order-4") is the quadratic 5.4.
+# zeros_500.py is left out: its entries past γ ≈ 500.3 (the last 240)
+# are not zeros of zeta; zeros600.txt and z.txt cover the same range.
+SOURCES = [
+    ("chi3_zeros.py", _py_list, "dirichlet:3.2"),
+    ("beta_zeros.py", _py_list, "dirichlet:4.3"),
+    ("chi5_zeros.py", _py_list, "dirichlet:5.4"),
+    ("chi7_zeros.py", _py_list, "dirichlet:7.2"),
+    ("chi7_ord6_zeros.py", _py_list, "dirichlet:7.5"),
+    ("chi8_zeros.py", _py_list, "dirichlet:8.3"),
+    ("chi13_zeros.py", _py_list, "dirichlet:13.8"),
+    ("zeros600.txt", _column, ZETA),
+    ("cross_L_zeros.txt", _gp_lines, None),
+    ("clz4_out.txt", _gp_lines, None),
+    ("clz5_all.txt", _gp_lines, None),
+    ("clz3_out.txt", _gp_lines, None),
+    ("clz2_out.txt", _gp_lines, None),
+    ("z.txt", _column, ZETA),
+]
+
+
+def ingest_repo(cat, root=ROOT, verbose=False):
+    """Load every known zero file under root into cat."""
+    for fname, parse, label in SOURCES:
+        path = os.path.join(root, fname)
+        if not os.path.exists(path):
+            continue
+        data = parse(path)
+        for lab, z in (data.items() if isinstance(data, dict) else [(label, data)]):
+            cat.add(lab, z, source=fname)
+            if verbose:
+                print(f"  {fname:<20} -> {lab:<16} {len(z):>5} zeros")
+    cat.compact()
+    return cat
+
+
+_default = None
+
+
+def open_catalog(path=None):
+    """The catalog at path (default: cache dir), ingesting the repo files if empty."""
+    global _default
+    if path is None and _default is not None:
+        return _default
+    cat = ZeroCatalog(path)
+    if not len(cat):
+        ingest_repo(cat)
+    if path is None:
+        _default = cat
+    return cat
+
+
+def zeros(label, lo=None, hi=None):
+    """Shortcut: open_catalog().zeros(label, lo, hi)."""
+    return open_catalog().zeros(label, lo, hi)
+
+
+def zeta_zeros(T):
+    """Zeta zeros up to height T, from the catalog (GP fills any gap once)."""
+    return open_catalog().get(ZETA, T, compute=lambda T: gp_zeros(1, T))
+
+
+def zeta_first(n, workers=None):
+    """The first n zeta zeros; any not yet stored are generated once (zeta_gen)."""
+    from zeta_gen import extend
+    extend(n, workers)
+    return open_catalog().first(ZETA, n)
+
+
+if __name__ == "__main__":
+    import shutil
+    import sys
+    import time
+
+    path = catalog_dir()
+    if "--rebuild" in sys.argv[1:]:
+        shutil.rmtree(path)
+    t0 = time.time()
+    cat = ingest_repo(ZeroCatalog(path), verbose=True)
+    print(f"ingested in {1000*(time.time()-t0):.0f} ms -> {path}")
+    for label in cat.labels():
+        e = cat.info(label)
+        print(f"  {label:<16} {e['count']:>5} zeros  [{e['lo']:.3f}, {e['hi']:.3f}]  "
+              f"complete to {e['complete_to']:.1f}")
+    t0 = time.time()
+    z = ZeroCatalog(path).zeros(ZETA, 100, 300)
+    print(f"reopen + zeta in [100, 300]: {len(z)} zeros in {1000*(time.time()-t0):.2f} ms")
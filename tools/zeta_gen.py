@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Parallel zeta-zero generation into the zero catalog
+
+mpmath.zetazero(n) locates every zero from scratch at 30 digits (about
+1.7 s per zero near n = 10^4). Here a whole index range [n1, n2) is
+done at once:
+
+  1. Gram points g_m (θ(g_m) = mπ) from the asymptotic θ, by Newton.
+     The n-th zero normally lies in (g_{n-2}, g_{n-1}].
+  2. The range is widened to good Gram points ((-1)^m Z(g_m) > 0); by
+     Rosser's rule (true far beyond 10^6 zeros) a block between good
+     points g_a < g_b holds exactly b - a zeros, numbered a+2 .. b+1.
+  3. Sign changes of Z are found on the Gram grid, halving the grid
+     inside any block that comes up short (Gram's law failures).
+  4. Each bracket is solved with the Riemann-Siegel formula in float64
+     (vectorized over all brackets), then polished by Newton with
+     mpmath siegelz at 15 digits: float64 precision, no more, and
+     usually a single mpmath evaluation per zero.
+
+Ranges are split into chunks over a process pool and appended to the
+catalog in order, so a long run that is interrupted keeps its progress,
+and getting 10^4 zeros is a one-time batch job.
+
+Usage:
+  from zeta_gen import zeta_range, extend
+  zeta_range(1000, 1100)      # γ_1000 .. γ_1099 (no catalog)
+  extend(10000)               # catalog holds the first 10^4 zeros afterwards
+
+  python3 zeta_gen.py 10000 [workers]
+"""
+
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from zero_catalog import ZETA, open_catalog
+
+CHUNK = 250             # zeros per pool task
+RS_MIN = 200.0          # below this height Z comes from mpmath only
+MAX_SPLIT = 12          # grid halvings before a Gram block is given up on
+PSI_DEG = 36            # Chebyshev degree for the Riemann-Siegel remainder
+DERIV_REL = 1e-3        # trusted relative accuracy of the RS Z'
+
+_PSI = None
+
+
+# =============================================================================
+# θ, GRAM POINTS, Z
+# =============================================================================
+
+def theta(t):
+    """Riemann-Siegel θ(t), asymptotic series (float64, t > ~5)."""
+    t = np.asarray(t, dtype=np.float64)
+    return (t/2*np.log(t/(2*math.pi)) - t/2 - math.pi/8
+            + 1/(48*t) + 7/(5760*t**3) + 31/(80640*t**5))
+
+
+def gram(m):
+    """Gram points g_m for an array of m >= -1."""
+    m = np.asarray(m, dtype=np.float64)
+    target = m * math.pi
+    # Start from θ(t) ≈ t/2 log(t/2πe), i.e. t ≈ 2π(m + 1/8)/W((m + 1/8)/e)
+    x = (m + 1/8) / math.e
+    w = np.log1p(x)
+    for _ in range(8):
+        w -= (w*np.exp(w) - x) / (np.exp(w)*(1 + w))
+    t = 2*math.pi*math.e*np.exp(w)
+    for _ in range(6):
+        t -= (theta(t) - target) / (0.5*np.log(t/(2*math.pi)))
+    return t
+
+
+def _psi_derivs():
+    """Chebyshev series (in y = 2p - 1) of Ψ(p) = cos 2π(p² - p - 1/16) / cos 2πp and its derivatives."""
+    global _PSI
+    if _PSI is None:
+        from mpmath import mp, mpf, cos, pi
+        from numpy.polynomial import chebyshev
+
+        def psi(y):
+            with mp.workdps(30):
+                p = [(mpf(float(v)) + 1) / 2 for v in y]
+                return np.array([float(cos(2*pi*(q*q - q - mpf(1)/16)) / cos(2*pi*q)) for q in p])
+
+        c = chebyshev.chebinterpolate(psi, PSI_DEG)
+        _PSI = [c] + [chebyshev.chebder(c, k) * 2**k for k in range(1, 7)]
+    return _PSI
+
+
+def _rs(t):
+    """
+    Riemann-Siegel Z(t) and Z'(t) in float64 arrays.
+
+    Main sum plus the remainder terms C0, C1, C2 (Edwards §7.4), with
+    the derivatives of Ψ from a Chebyshev fit. Error is ~1e-6 at
+    t = 200, ~1e-9 beyond 10^4 (where float64 phases take over).
+    """
+    from numpy.polynomial.chebyshev import chebval
+    t = np.atleast_1d(np.asarray(t, dtype=np.float64))
+    u = t / (2*math.pi)
+    a = np.sqrt(u)
+    N = np.floor(a).astype(np.int64)
+    n = np.arange(1, N.max() + 1)
+    logn = np.log(n)
+    th = theta(t)
+    dth = 0.5*np.log(u)
+    Z = np.empty(len(t))
+    dZ = np.empty(len(t))
+    step = max(1, (1 << 20) // len(n))
+    for i in range(0, len(t), step):
+        s = slice(i, i + step)
+        ph = th[s, None] - np.outer(t[s], logn)
+        live = n[None, :] <= N[s, None]
+        w = np.where(live, 1/np.sqrt(n), 0.0)
+        Z[s] = 2*(w*np.cos(ph)).sum(axis=1)
+        dZ[s] = -2*(w*np.sin(ph)*(dth[s, None] - logn)).sum(axis=1)
+    d = _psi_derivs()
+    y = 2*(a - N) - 1
+    P = {k: chebval(y, d[k]) for k in (0, 1, 2, 3, 6)}
+    c1 = -P[3] / (96*math.pi**2)
+    c2 = P[2] / (64*math.pi**2) + P[6] / (18432*math.pi**4)
+    sign = np.where(N % 2 == 1, 1.0, -1.0)
+    Z += sign * u**-0.25 * (P[0] + c1/a + c2/u)
+    # dp/dt = 1/(4π√u); C1, C2 are too small to matter in Z'
+    dZ += sign * (-0.25*u**-1.25*P[0]/(2*math.pi) + u**-0.25*P[1]/(4*math.pi*a))
+    return Z, dZ
+
+
+def _mp_Z(t):
+    from mpmath import mp, siegelz
+    with mp.workdps(15):
+        return np.array([float(siegelz(x)) for x in np.atleast_1d(t)])
+
+
+def Z(t):
+    """Hardy Z(t): Riemann-Siegel above RS_MIN (mpmath near zero values), mpmath below."""
+    t = np.atleast_1d(np.asarray(t, dtype=np.float64))
+    out = np.empty(len(t))
+    hi = t >= RS_MIN
+    if hi.any():
+        out[hi] = _rs(t[hi])[0]
+        # RS is good to ~1e-6 here: confirm signs of smaller values
+        risky = hi & (np.abs(out) < 1e-4)
+        if risky.any():
+            out[risky] = _mp_Z(t[risky])
+    if (~hi).any():
+        out[~hi] = _mp_Z(t[~hi])
+    return out
+
+
+# =============================================================================
+# ONE RANGE
+# =============================================================================
+
+def _good(m, zg):
+    return (zg > 0) if m % 2 == 0 else (zg < 0)
+
+
+def _brackets(a, b):
+    """Sign-change brackets of Z in (g_a, g_b], exactly b - a of them."""
+    ms = np.arange(a, b + 1)
+    g = gram(ms)
+    zg = Z(g)
+    good = [i for i, m in enumerate(ms) if _good(m, zg[i])]
+    lo, hi = [], []
+    for i, j in zip(good[:-1], good[1:]):
+        # One Gram block: expect j - i zeros between g[i] and g[j]
+        ts, zs = g[i:j + 1], zg[i:j + 1]
+        for _ in range(MAX_SPLIT):
+            ch = np.nonzero(np.signbit(zs[:-1]) != np.signbit(zs[1:]))[0]
+            if len(ch) >= j - i:
+                break
+            mid = (ts[:-1] + ts[1:]) / 2
+            zm = Z(mid)
+            ts = np.insert(ts, np.arange(1, len(ts)), mid)
+            zs = np.insert(zs, np.arange(1, len(zs)), zm)
+        else:
+            raise RuntimeError(f"Gram block ({g[i]:.3f}, {g[j]:.3f}]: found {len(ch)} of {j - i} zeros")
+        lo.extend(ts[ch])
+        hi.extend(ts[ch + 1])
+    return np.array(lo), np.array(hi)
+
+
+def _solve(lo, hi):
+    """Roots of Z in each bracket: Illinois on the RS formula, then mpmath Newton."""
+    lo, hi = lo.copy(), hi.copy()
+    flo, fhi = Z(lo), Z(hi)
+    x = (lo + hi) / 2
+    rs = lo >= RS_MIN
+    if rs.any():
+        a, b, fa, fb = lo[rs], hi[rs], flo[rs], fhi[rs]
+        side = np.zeros(len(a))
+        for _ in range(60):
+            c = (a*fb - b*fa) / (fb - fa)
+            fc = _rs(c)[0]
+            left = np.signbit(fc) == np.signbit(fa)
+            # Illinois: halve the stale end's value when the same side moves twice
+            fb = np.where(left & (side == 1), fb/2, fb)
+            fa = np.where(~left & (side == -1), fa/2, fa)
+            a, fa = np.where(left, c, a), np.where(left, fc, fa)
+            b, fb = np.where(left, b, c), np.where(left, fb, fc)
+            side = np.where(left, 1, -1)
+            if np.all(b - a < 1e-11 * b) or np.all(np.abs(fc) < 1e-14):
+                break
+        x[rs] = c
+    if (~rs).any():
+        from mpmath import mp, findroot, siegelz
+        with mp.workdps(15):
+            x[~rs] = [float(findroot(siegelz, (l, h), solver='illinois'))
+                      for l, h in zip(lo[~rs], hi[~rs])]
+    if rs.any():
+        x[rs] = _polish(x[rs])
+    return x
+
+
+def _polish(x):
+    """
+    Newton on mpmath's Z with the RS derivative, until the step is a few ulp.
+
+    The RS root is already within ~1e-9 beyond t ~ 10^4, so a step
+    below 2 ulp / DERIV_REL leaves an error under 2 ulp and is the last:
+    one mpmath evaluation per zero there, two or three lower down.
+    """
+    x = x.copy()
+    todo = np.arange(len(x))
+    for _ in range(8):
+        step = _mp_Z(x[todo]) / _rs(x[todo])[1]
+        x[todo] -= step
+        todo = todo[np.abs(step) * DERIV_REL > 2 * np.spacing(x[todo])]
+        if not len(todo):
+            break
+    return x
+
+
+def zeta_range(n1, n2):
+    """γ_n for n1 <= n < n2 (1-indexed), as float64."""
+    a = max(n1 - 2, -1)
+    while a > -1 and not _good(a, Z(gram([a]))[0]):
+        a -= 1
+    b = n2 - 1
+    while not _good(b, Z(gram([b]))[0]):
+        b += 1
+    lo, hi = _brackets(a, b)
+    zeros = _solve(lo, hi)
+    # zeros[k] is γ_{a+2+k}
+    return zeros[n1 - (a + 2):n2 - (a + 2)]
+
+
+def _task(args):
+    return zeta_range(*args)
+
+
+# =============================================================================
+# CATALOG
+# =============================================================================
+
+def extend(n, workers=None, chunk=CHUNK, verbose=False):
+    """Make the catalog hold the first n zeta zeros; returns how many were computed."""
+    cat = open_catalog()
+    have = cat.count(ZETA, hi=cat.complete_to(ZETA)) if ZETA in cat else 0
+    if have >= n:
+        return 0
+    tasks = [(i, min(i + chunk, n + 1)) for i in range(have + 1, n + 1, chunk)]
+    workers = workers or os.cpu_count()
+    t0 = time.time()
+    done = 0
+
+    def store(z):
+        nonlocal done
+        cat.add(ZETA, z, complete_to=float(z[-1]), source="zeta_gen")
+        done += len(z)
+        if verbose:
+            print(f"  γ_{have + done}: {z[-1]:.6f}  ({done}/{n - have}, {time.time() - t0:.0f}s)", flush=True)
+
+    if workers == 1 or len(tasks) == 1:
+        for t in tasks:
+            store(_task(t))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for z in pool.map(_task, tasks):
+                store(z)
+    return done
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        from mpmath import zetazero
+        for n1, n2 in [(1, 40), (1000, 1010), (9990, 10000)]:
+            t0 = time.time()
+            z = zeta_range(n1, n2)
+            t1 = time.time()
+            ref = np.array([float(zetazero(k).imag) for k in range(n1, n2)])
+            t2 = time.time()
+            print(f"γ_{n1}..γ_{n2 - 1}: {1000*(t1-t0)/len(z):.0f} ms/zero vs zetazero "
+                  f"{1000*(t2-t1)/len(z):.0f} ms/zero, max |diff| = {np.max(np.abs(z - ref)):.2e}")
+    else:
+        n = int(sys.argv[1])
+        workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+        print(f"computed {extend(n, workers, verbose=True)} new zeros; catalog has the first {n}")
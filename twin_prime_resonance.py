@@ -5,6 +5,11 @@ Do twin primes have their own Brennpunkt and resonance wavelength?
 """
 
 import math
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools'))
+from peak_finder import cached_extremum, set_hash
 
 PHI = (1 + math.sqrt(5)) / 2
 GOLDEN_ANGLE = 2 * math.pi / (PHI * PHI)
@@ -75,19 +80,10 @@ def measure_clustering(positions):
 def find_brennpunkt(numbers, N, t_range=(0.0, 0.5), steps=100):
     """Find optimal t for minimum clustering"""
     positions_orig = [golden_sphere_position(n, N) for n in numbers if n <= N]
-
-    best_t = 0
-    best_clustering = float('inf')
-
-    for i in range(steps + 1):
-        t = t_range[0] + (t_range[1] - t_range[0]) * i / steps
-        positions_focused = [apply_brennpunkt(p, t) for p in positions_orig]
-        clustering = measure_clustering(positions_focused)
-        if clustering < best_clustering:
-            best_clustering = clustering
-            best_t = t
-
-    return best_t, best_clustering
+    clustering = lambda t: measure_clustering([apply_brennpunkt(p, t) for p in positions_orig])
+    # Coarse scan of <= 24 points + Brent refinement instead of steps+1 evaluations, cached
+    return cached_extremum(('twin-clustering', set_hash(numbers), N), clustering, t_range[0], t_range[1],
+                           n_coarse=min(steps + 1, 24), sense='min')
 
 def wave_scatter(numbers, N, wavelength, t_brennpunkt):
     """Compute backscatter amplitude at given wavelength"""